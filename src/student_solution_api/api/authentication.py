@@ -0,0 +1,15 @@
+"""
+Authentication of batch sub-requests.
+
+The batch endpoint (api.v1.batch) runs its operations in-process as the user
+it authenticated, marking each sub-request with that user and token.
+BatchAuthentication, first in DEFAULT_AUTHENTICATION_CLASSES, accepts the
+mark; requests without one fall through to the other classes. The mark is
+an attribute set in Python, so no HTTP request can carry it.
+"""
+from rest_framework.authentication import BaseAuthentication
+
+
+class BatchAuthentication(BaseAuthentication):
+    def authenticate(self, request):
+        return getattr(request._request, 'batch_auth', None)
@@ -0,0 +1,44 @@
+"""
+Optimistic concurrency for single-row writes.
+
+ExamChapter and Homework rows carry a version column that every write
+increments. A client sends back the version it last read, and the write is
+a single UPDATE ... WHERE id = ... AND version = ...: if another write got
+there first no row matches, and the client gets 409 with the current state
+instead of silently overwriting it. No row is locked or read beforehand.
+
+Model.save() increments the version too, as version = version + 1 in SQL
+(see the pre_save signals), so the admin and other read-modify-save paths
+keep versions moving even when their instance is stale.
+"""
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class VersionConflict(Exception):
+    """The row was written since the client read it; current is its state now."""
+
+    def __init__(self, current):
+        super().__init__('The record was changed by another request.')
+        self.current = current
+
+
+def versioned_update(queryset, version=None, **values):
+    """
+    UPDATE the queryset's rows with values in one statement, incrementing
+    version and setting updated_at. With a version, only rows still at it
+    are written. Returns the number of rows updated.
+    """
+    if version is not None:
+        queryset = queryset.filter(version=version)
+    return queryset.update(version=F('version') + 1, updated_at=timezone.now(), **values)
+
+
+def conflict_response(current):
+    return Response({
+        'status': 409,
+        'message': 'The record was changed by another request. Reapply the change to the current version.',
+        'data': current
+    }, status=status.HTTP_409_CONFLICT)
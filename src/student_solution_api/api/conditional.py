@@ -0,0 +1,56 @@
+from functools import wraps
+
+from django.utils.cache import patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from sync.versions import get_versions
+
+
+def version_etag(user_id, resources):
+    versions = get_versions(user_id, resources)
+    tag = '-'.join(f'{resource}{versions[resource]}' for resource in resources)
+    return f'W/{quote_etag(f"u{user_id}-{tag}")}'
+
+
+def etag_matches(etag, if_none_match):
+    # Weak comparison: the opaque tags must match, W/ prefixes are ignored.
+    etags = parse_etags(if_none_match)
+    return '*' in etags or etag.removeprefix('W/') in (tag.removeprefix('W/') for tag in etags)
+
+
+def conditional_on_versions(*resources, exists=None):
+    """
+    ETag and If-None-Match handling for GET views whose response depends only
+    on the user's data in the given resources (see sync.models.DataVersion).
+    Views embedding subject names or chapter titles list DataVersion.CATALOG
+    among them.
+
+    A matching If-None-Match is answered with 304 after a single version
+    lookup, before the view runs any serializer or data query. Views of one
+    object pass exists, called with the view's arguments: the 304 is only
+    given when it returns True, so missing and other users' ids still get
+    the view's 404.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return view(request, *args, **kwargs)
+
+            etag = version_etag(request.user.pk, resources)
+            if_none_match = request.headers.get('If-None-Match')
+            if if_none_match and etag_matches(etag, if_none_match) \
+                    and (exists is None or exists(request, *args, **kwargs)):
+                response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = view(request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,42 @@
+"""
+JSON renderer backed by orjson when it is installed, DRF's stdlib renderer
+otherwise. Output is byte-for-byte what rest_framework.renderers.JSONRenderer
+produces for the same data.
+"""
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+_encoder = JSONEncoder()
+
+
+class FastJSONRenderer(JSONRenderer):
+    # datetime/date/time go through DRF's encoder so they keep its format
+    # (milliseconds, "Z" for UTC); Decimal, lazy strings, UUIDs and other
+    # types orjson does not know are handled by the same encoder.
+    orjson_options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else 0
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        renderer_context = renderer_context or {}
+        if (
+            orjson is None
+            or self.ensure_ascii
+            or not self.compact
+            or self.get_indent(accepted_media_type, renderer_context) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_encoder.default, option=self.orjson_options)
+
+        # Same escaping of \u2028 and \u2029 as JSONRenderer.
+        if b'\xe2\x80' in ret:
+            ret = ret.replace('\u2028'.encode(), b'\\u2028').replace('\u2029'.encode(), b'\\u2029')
+        return ret
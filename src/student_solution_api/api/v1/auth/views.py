@@ -4,6 +4,7 @@ from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework import status
 
+from student_solution_api.deletion import purge_user
 from .serializers import UserSerializer
 
 
@@ -37,6 +38,11 @@ def create_user(request):
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
 def manage_user(request):
+    """
+    GET: Return the current user
+    PUT: Update the current user
+    DELETE: Deactivate the account, or delete it and all its data with {"purge": true}
+    """
     user = request.user
 
     if request.method == 'GET':
@@ -63,6 +69,13 @@ def manage_user(request):
         }, status=status.HTTP_400_BAD_REQUEST)
 
     elif request.method == 'DELETE':
+        if request.data.get('purge') is True:
+            purge_user(user)
+            return Response({
+                'status': 204,
+                'message': 'User and all their data deleted successfully.'
+            }, status=status.HTTP_204_NO_CONTENT)
+
         user.is_active = False
         user.save()
         
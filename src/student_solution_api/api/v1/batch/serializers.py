@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+
+MAX_OPERATIONS = 25
+
+
+class OperationSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(choices=['GET', 'POST', 'PUT', 'PATCH', 'DELETE'])
+    path = serializers.CharField()
+    body = serializers.JSONField(required=False)
+
+    def validate_path(self, value):
+        if not value.startswith('/api/v1/'):
+            raise serializers.ValidationError("Only /api/v1/ routes can be batched.")
+        if value.startswith('/api/v1/batch/'):
+            raise serializers.ValidationError("Batches cannot be nested.")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    """Serializer for an ordered list of sub-requests"""
+    atomic = serializers.BooleanField(required=False, default=False)
+    operations = OperationSerializer(many=True, allow_empty=False, max_length=MAX_OPERATIONS)
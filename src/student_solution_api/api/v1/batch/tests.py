@@ -0,0 +1,83 @@
+from datetime import date
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError
+from django.test import TestCase
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from homeworks.models import Homework
+from monitoring.metrics import registry
+
+
+class BatchTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.homework = Homework.objects.create(title='Essay', due_date=date(2030, 1, 1), user=self.user)
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+
+    def batch(self, operations, atomic=False):
+        return self.client.post('/api/v1/batch/', {'atomic': atomic, 'operations': operations}, format='json')
+
+    def test_operations_run_in_order(self):
+        response = self.batch([
+            {'method': 'PUT', 'path': '/api/v1/homeworks/manage/', 'body': {'id': self.homework.id}},
+            {'method': 'GET', 'path': '/api/v1/homeworks/manage/?is_completed=true'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        first, second = response.json()['data']
+        self.assertEqual(first['status'], 200)
+        self.assertEqual([homework['id'] for homework in second['data']['data']], [self.homework.id])
+
+    def test_atomic_batch_rolls_back_on_failure(self):
+        response = self.batch([
+            {'method': 'PUT', 'path': '/api/v1/homeworks/manage/', 'body': {'id': self.homework.id}},
+            {'method': 'PUT', 'path': '/api/v1/homeworks/manage/', 'body': {'id': 999999}},
+            {'method': 'GET', 'path': '/api/v1/homeworks/manage/'},
+        ], atomic=True)
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([result['status'] for result in response.json()['data']], [200, 404, 424])
+        self.homework.refresh_from_db()
+        self.assertFalse(self.homework.is_completed)
+
+    def test_rejects_nested_and_unknown_routes(self):
+        response = self.batch([{'method': 'POST', 'path': '/api/v1/batch/', 'body': {}}])
+        self.assertEqual(response.status_code, 400)
+
+        response = self.batch([{'method': 'GET', 'path': '/api/v1/missing/'}])
+        self.assertEqual(response.json()['data'][0]['status'], 404)
+
+    def test_streaming_and_plain_routes(self):
+        self.user.is_staff = True
+        self.user.save()
+        response = self.batch([
+            {'method': 'GET', 'path': '/api/v1/export/ndjson/'},
+            {'method': 'GET', 'path': '/api/v1/monitoring/metrics/'},
+        ])
+        self.assertEqual(response.status_code, 200)
+        streamed, metrics = response.json()['data']
+        self.assertEqual(streamed['status'], 400)
+        self.assertEqual(metrics['status'], 200)
+        self.assertIsInstance(metrics['data'], str)
+
+    def test_operations_are_recorded_in_metrics(self):
+        registry.reset()
+        self.batch([
+            {'method': 'PUT', 'path': '/api/v1/homeworks/manage/', 'body': {'id': self.homework.id}},
+            {'method': 'GET', 'path': '/api/v1/homeworks/manage/'},
+        ])
+        self.assertEqual(registry.responses[('homeworks:manage_homework', 'PUT', '200')], 1)
+        self.assertEqual(registry.responses[('homeworks:manage_homework', 'GET', '200')], 1)
+
+    def test_errors_are_logged_not_returned(self):
+        def failing_view(request):
+            raise DatabaseError('relation "homeworks_homework" does not exist')
+
+        match = mock.Mock(func=failing_view, args=(), kwargs={}, view_name='homeworks:manage_homework')
+        with mock.patch('api.v1.batch.views.resolve', return_value=match), \
+                self.assertLogs('api.v1.batch.views', 'ERROR') as logs:
+            response = self.batch([{'method': 'GET', 'path': '/api/v1/homeworks/manage/'}])
+        self.assertEqual(response.json()['data'], [{'status': 500, 'message': 'Internal server error.'}])
+        self.assertIn('homeworks_homework', logs.output[0])
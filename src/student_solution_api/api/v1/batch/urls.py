@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+
+app_name = 'batch'
+
+urlpatterns = [
+    path('', views.batch, name='batch'),
+]
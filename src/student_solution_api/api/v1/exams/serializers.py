@@ -1,7 +1,79 @@
+from django.db import transaction
+from django.db.models import Count, OuterRef, Q, QuerySet
+from django.utils import timezone
 from rest_framework import serializers
-from exams.models import Exam, Chapter, ExamChapter
+from api.concurrency import VersionConflict, versioned_update
+from api.fields import SparseFieldsMixin
+from exams.models import Exam, Chapter, ExamChapter, ProgressEvent
+from exams.progress import record_progress
+from sync.models import DataVersion
+from student_solution_api.admin_tools import SubqueryCount
+from sync.versions import bump_version
 from timetable.models import Subject
-from collections import defaultdict
+
+
+MAX_CHAPTER_IDS = 2000
+
+
+def get_catalog_chapters(chapter_ids):
+    """Map catalog chapter ids to their subject ids, validated with one id__in query"""
+    chapters = dict(Chapter.objects.filter(id__in=chapter_ids).values_list('id', 'subject_id'))
+    missing = sorted(set(chapter_ids) - chapters.keys())
+    if missing:
+        raise serializers.ValidationError(f"Chapters not found: {', '.join(map(str, missing))}.")
+    return chapters
+
+
+def add_catalog_chapters(exam, chapters):
+    """
+    Add catalog chapters (see get_catalog_chapters) and their subjects to an exam,
+    skipping chapters it already has.
+    """
+    existing = set(exam.exam_chapters.filter(chapter_id__in=chapters).values_list('chapter_id', flat=True))
+    new_chapters = [
+        ExamChapter(exam=exam, chapter_id=chapter_id)
+        for chapter_id in chapters if chapter_id not in existing
+    ]
+    # bulk_create skips the ExamChapter signals.
+    ExamChapter.objects.bulk_create(new_chapters, batch_size=1000)
+    exam.subjects.add(*set(chapters.values()))
+    if new_chapters:
+        Exam.objects.filter(pk=exam.pk).update(updated_at=timezone.now())
+        bump_version(exam.user_id, DataVersion.EXAMS)
+        record_progress([
+            ProgressEvent(exam=exam, chapter_id=exam_chapter.chapter_id, total_delta=1)
+            for exam_chapter in new_chapters
+        ])
+    return new_chapters
+
+
+def set_chapter_status(exam, chapter_id, is_completed, version=None):
+    """
+    Set an exam chapter's completion status in one conditional UPDATE (see
+    api.concurrency). Rows already in the requested state are not written.
+    Raises VersionConflict if the chapter moved past version.
+    """
+    exam_chapters = ExamChapter.objects.filter(exam=exam, chapter_id=chapter_id)
+    with transaction.atomic():
+        written = versioned_update(
+            exam_chapters.exclude(is_completed=is_completed), version, is_completed=is_completed
+        )
+        if written:
+            # The update skips the ExamChapter signals.
+            bump_version(exam.user_id, DataVersion.EXAMS)
+            record_progress([
+                ProgressEvent(exam=exam, chapter_id=chapter_id, completed_delta=1 if is_completed else -1)
+            ])
+    if written:
+        return
+
+    # Nothing written: tell a missing chapter and a newer version from a no-op.
+    current = exam_chapters.values('chapter_id', 'is_completed', 'version').first()
+    if current is None:
+        raise serializers.ValidationError("Chapter not found in this exam.")
+    if version is not None and current['version'] != version:
+        raise VersionConflict(current)
+
 
 class ChapterSerializer(serializers.ModelSerializer):
     is_completed = serializers.BooleanField(required=False, default=False)
@@ -21,19 +93,70 @@ class SubjectSerializer(serializers.ModelSerializer):
         fields = ['id', 'name', 'progress', 'chapters']
 
 
-class ExamListSerializer(serializers.ModelSerializer):
+def progress_percent(completed, total):
+    return round((completed / total) * 100) if total else 0
+
+
+class ExamCountsListSerializer(serializers.ListSerializer):
+    """
+    Serializes exam querysets in one query, with only the requested counts
+    annotated as correlated subqueries instead of several queries per exam.
+    """
+
+    def to_representation(self, data):
+        if not isinstance(data, QuerySet):
+            return super().to_representation(data)
+
+        fields = self.child.requested_fields
+        exam_chapters = ExamChapter.objects.filter(exam=OuterRef('pk')).values('pk')
+        annotations = {}
+        if 'progress' in fields or 'total_chapters' in fields:
+            annotations['total_chapters'] = SubqueryCount(exam_chapters)
+        if 'progress' in fields or 'completed_chapters' in fields:
+            annotations['completed_chapters'] = SubqueryCount(exam_chapters.filter(is_completed=True))
+        if 'subjects_count' in fields:
+            annotations['subjects_count'] = SubqueryCount(
+                Exam.subjects.through.objects.filter(exam=OuterRef('pk')).values('pk')
+            )
+        columns = ['title'] if 'title' in fields else []
+        rows = list(data.values('id', *columns, **annotations))
+
+        if 'subjects' in fields:
+            subjects = {row['id']: [] for row in rows}
+            for exam_id, subject_id, name in Exam.subjects.through.objects.filter(
+                exam_id__in=subjects
+            ).order_by('subject__name', 'subject_id').values_list('exam_id', 'subject_id', 'subject__name'):
+                subjects[exam_id].append({'id': subject_id, 'name': name})
+
+        exams = []
+        for row in rows:
+            if 'progress' in fields:
+                row['progress'] = progress_percent(row['completed_chapters'], row['total_chapters'])
+            if 'subjects' in fields:
+                row['subjects'] = subjects[row['id']]
+            exams.append({name: row[name] for name in fields})
+        return exams
+
+
+class ExamListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Simplified serializer for listing exams"""
     progress = serializers.SerializerMethodField(read_only=True)
     subjects_count = serializers.SerializerMethodField(read_only=True)
     total_chapters = serializers.SerializerMethodField(read_only=True)
     completed_chapters = serializers.SerializerMethodField(read_only=True)
+    subjects = serializers.SerializerMethodField(read_only=True)
+
+    default_fields = ['id', 'title', 'progress', 'subjects_count', 'total_chapters', 'completed_chapters']
+    # Subject ids and names, sorted by name
+    expandable_fields = ['subjects']
 
     class Meta:
         model = Exam
         fields = [
             'id', 'title', 'progress', 'subjects_count', 
-            'total_chapters', 'completed_chapters'
+            'total_chapters', 'completed_chapters', 'subjects'
         ]
+        list_serializer_class = ExamCountsListSerializer
 
     def get_progress(self, obj):
         return obj.progress
@@ -47,65 +170,99 @@ class ExamListSerializer(serializers.ModelSerializer):
     def get_completed_chapters(self, obj):
         return obj.exam_chapters.filter(is_completed=True).count()
 
+    def get_subjects(self, obj):
+        return list(obj.subjects.order_by('name', 'id').values('id', 'name'))
+
 
-class ExamSerializer(serializers.ModelSerializer):
+class ExamSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Detailed serializer for creating/viewing exams"""
     progress = serializers.SerializerMethodField(read_only=True)
-    subjects = SubjectSerializer(many=True)
+    subjects = SubjectSerializer(many=True, required=False)
+    chapter_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, write_only=True, max_length=MAX_CHAPTER_IDS
+    )
+
+    default_fields = ['id', 'title', 'progress', 'subjects']
 
     class Meta:
         model = Exam
-        fields = ['id', 'title', 'progress', 'subjects']
+        fields = ['id', 'title', 'progress', 'subjects', 'chapter_ids']
 
     def get_progress(self, obj):
         return obj.progress
 
+    def validate_chapter_ids(self, value):
+        return get_catalog_chapters(value)
+
     def to_representation(self, instance):
-        """Custom representation to group chapters by subject"""
-        data = super().to_representation(instance)
-        
-        # Group chapters by subject
-        subjects_data = []
-        exam_chapters = instance.exam_chapters.select_related('chapter', 'chapter__subject').all()
-        
+        """
+        Group chapters by subject. Reads only the needed columns in a single
+        values_list query instead of building model instances and nested
+        serializers for every chapter. Without "subjects", progress comes
+        from one count query and without either, no query is made.
+        """
+        fields = self.requested_fields
+        representation = {'id': instance.id, 'title': instance.title}
+        if 'subjects' in fields:
+            representation['subjects'], completed, total = self.get_subjects(instance)
+        elif 'progress' in fields:
+            counts = instance.exam_chapters.aggregate(
+                total=Count('id'), completed=Count('id', filter=Q(is_completed=True))
+            )
+            completed, total = counts['completed'], counts['total']
+        if 'progress' in fields:
+            representation['progress'] = progress_percent(completed, total)
+        return {name: representation[name] for name in fields}
+
+    def get_subjects(self, instance):
+        """The exam's subjects, sorted by name, with their chapters. Returns (subjects, completed, total)."""
+        exam_chapters = instance.exam_chapters.values_list(
+            'chapter__subject_id',
+            'chapter__subject__name',
+            'chapter_id',
+            'chapter__title',
+            'chapter__chapter_number',
+            'is_completed',
+            'version',
+        )
+
         # Group by subject
-        subjects_dict = defaultdict(list)
-        for exam_chapter in exam_chapters:
-            subject = exam_chapter.chapter.subject
-            chapter_data = {
-                'id': exam_chapter.chapter.id,
-                'title': exam_chapter.chapter.title,
-                'chapter_number': exam_chapter.chapter.chapter_number,
-                'is_completed': exam_chapter.is_completed
-            }
-            subjects_dict[subject].append(chapter_data)
-        
-        # Build subjects list
-        for subject, chapters in subjects_dict.items():
-            # Calculate progress for this subject
-            completed = sum(1 for ch in chapters if ch['is_completed'])
-            total = len(chapters)
-            progress = round((completed / total) * 100) if total else 0
-            
+        subjects_dict = {}
+        total = completed = 0
+        for subject_id, subject_name, chapter_id, title, chapter_number, is_completed, version in exam_chapters:
+            subject_data = subjects_dict.get(subject_id)
+            if subject_data is None:
+                subject_data = subjects_dict[subject_id] = {
+                    'id': subject_id,
+                    'name': subject_name,
+                    'progress': 0,
+                    'chapters': []
+                }
+            subject_data['chapters'].append({
+                'id': chapter_id,
+                'title': title,
+                'chapter_number': chapter_number,
+                'is_completed': is_completed,
+                'version': version
+            })
+            total += 1
+            completed += is_completed
+
+        for subject_data in subjects_dict.values():
+            chapters = subject_data['chapters']
+            subject_completed = sum(1 for ch in chapters if ch['is_completed'])
+            subject_data['progress'] = round((subject_completed / len(chapters)) * 100)
+
             # Sort chapters by chapter_number
             chapters.sort(key=lambda x: x['chapter_number'])
-            
-            subject_data = {
-                'id': subject.id,
-                'name': subject.name,
-                'progress': progress,
-                'chapters': chapters
-            }
-            subjects_data.append(subject_data)
-        
+
         # Sort subjects by name
-        subjects_data.sort(key=lambda x: x['name'])
-        data['subjects'] = subjects_data
-        
-        return data
+        return sorted(subjects_dict.values(), key=lambda x: x['name']), completed, total
 
+    @transaction.atomic
     def create(self, validated_data):
         subjects_data = validated_data.pop('subjects', [])
+        catalog_chapters = validated_data.pop('chapter_ids', {})
         user = self.context['request'].user
         
         # Create the exam
@@ -116,6 +273,7 @@ class ExamSerializer(serializers.ModelSerializer):
         
         # Process subjects and chapters
         subjects_to_add = []
+        exam_chapters = []
         
         for subject_data in subjects_data:
             subject_name = subject_data.get('name')
@@ -141,27 +299,111 @@ class ExamSerializer(serializers.ModelSerializer):
                         subject=subject
                     )
                     
-                    # Create ExamChapter (junction record)
-                    ExamChapter.objects.create(
-                        exam=exam,
-                        chapter=chapter,
-                        is_completed=is_completed
-                    )
+                    exam_chapters.append(ExamChapter(exam=exam, chapter=chapter, is_completed=is_completed))
+
+        # bulk_create skips the ExamChapter signals.
+        ExamChapter.objects.bulk_create(exam_chapters, batch_size=1000)
+        if exam_chapters:
+            bump_version(user.id, DataVersion.EXAMS)
+            record_progress([
+                ProgressEvent(
+                    exam=exam, chapter_id=exam_chapter.chapter_id,
+                    completed_delta=int(exam_chapter.is_completed), total_delta=1,
+                )
+                for exam_chapter in exam_chapters
+            ])
         
         # Add subjects to exam
         if subjects_to_add:
             exam.subjects.set(subjects_to_add)
+
+        # Chapters picked from the catalog by id
+        if catalog_chapters:
+            add_catalog_chapters(exam, catalog_chapters)
         
         return exam
 
 
+class ExamSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Exam detail without chapters: each subject's progress and chapter counts
+    from one aggregate query. Chapters are paged per subject (see
+    get_chapter_page).
+    """
+    default_fields = ['id', 'title', 'progress', 'subjects']
+
+    class Meta:
+        model = Exam
+        fields = ['id', 'title']
+
+    def to_representation(self, instance):
+        fields = self.requested_fields
+        representation = {'id': instance.id, 'title': instance.title}
+        if 'subjects' in fields or 'progress' in fields:
+            subjects = [
+                {
+                    'id': row['chapter__subject_id'],
+                    'name': row['chapter__subject__name'],
+                    'progress': progress_percent(row['completed_chapters'], row['total_chapters']),
+                    'total_chapters': row['total_chapters'],
+                    'completed_chapters': row['completed_chapters'],
+                }
+                for row in instance.exam_chapters.values('chapter__subject_id', 'chapter__subject__name').annotate(
+                    total_chapters=Count('id'), completed_chapters=Count('id', filter=Q(is_completed=True))
+                ).order_by('chapter__subject__name', 'chapter__subject_id')
+            ]
+            representation['subjects'] = subjects
+            representation['progress'] = progress_percent(
+                sum(subject['completed_chapters'] for subject in subjects),
+                sum(subject['total_chapters'] for subject in subjects),
+            )
+        return {name: representation[name] for name in fields}
+
+
+def get_chapter_page(exam, subject_id, after, limit):
+    """
+    A page of the exam's chapters of one subject, in (chapter_number, id)
+    order, starting past the after pair (None for the first page). Keyset
+    pagination: the subject's catalog chapters are read in order from the
+    (subject, chapter_number, id) index, starting at the cursor, and each is
+    looked up in the exam until the page is full. Chapters of the subject the
+    exam does not have are read and skipped.
+    """
+    chapters = Chapter.objects.filter(subject_id=subject_id, exam_chapters__exam=exam)
+    if after is not None:
+        chapter_number, chapter_id = after
+        # The >= bound gives the index scan its start.
+        chapters = chapters.filter(
+            Q(chapter_number__gt=chapter_number) | Q(id__gt=chapter_id), chapter_number__gte=chapter_number
+        )
+    rows = chapters.order_by('chapter_number', 'id').values_list(
+        'id', 'title', 'chapter_number', 'exam_chapters__is_completed', 'exam_chapters__version'
+    )[:limit]
+    return [
+        {
+            'id': chapter_id,
+            'title': title,
+            'chapter_number': chapter_number,
+            'is_completed': is_completed,
+            'version': version
+        }
+        for chapter_id, title, chapter_number, is_completed, version in rows
+    ]
+
+
 class ExamUpdateSerializer(serializers.ModelSerializer):
     """Serializer for PATCH updates to exam structure (title and/or subjects)"""
     subjects = SubjectSerializer(many=True, required=False)
+    chapter_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, max_length=MAX_CHAPTER_IDS
+    )
 
     class Meta:
         model = Exam
-        fields = ['title', 'subjects']
+        fields = ['title', 'subjects', 'chapter_ids']
+
+    def validate_chapter_ids(self, value):
+        return get_catalog_chapters(value)
 
     def update(self, instance, validated_data):
         # Update exam title if provided
@@ -214,6 +456,10 @@ class ExamUpdateSerializer(serializers.ModelSerializer):
             if subjects_to_add:
                 all_subjects = existing_subjects.union(set(subjects_to_add))
                 instance.subjects.set(all_subjects)
+
+        # Add chapters picked from the catalog by id
+        if validated_data.get('chapter_ids'):
+            add_catalog_chapters(instance, validated_data['chapter_ids'])
         
         return instance
 
@@ -222,21 +468,13 @@ class UpdateChapterStatusSerializer(serializers.Serializer):
     """Serializer for updating individual chapter completion status"""
     chapter_id = serializers.IntegerField()
     is_completed = serializers.BooleanField()
+    # The chapter's version as last read; omit to overwrite unconditionally
+    version = serializers.IntegerField(required=False, min_value=1)
 
     def update_chapter_status(self, exam, validated_data):
-        chapter_id = validated_data['chapter_id']
-        is_completed = validated_data['is_completed']
-        
-        try:
-            exam_chapter = ExamChapter.objects.get(
-                exam=exam,
-                chapter_id=chapter_id
-            )
-            exam_chapter.is_completed = is_completed
-            exam_chapter.save()
-            return exam_chapter
-        except ExamChapter.DoesNotExist:
-            raise serializers.ValidationError("Chapter not found in this exam.")
+        set_chapter_status(
+            exam, validated_data['chapter_id'], validated_data['is_completed'], validated_data.get('version')
+        )
 
 
 class BulkUpdateChapterStatusSerializer(serializers.Serializer):
@@ -244,28 +482,38 @@ class BulkUpdateChapterStatusSerializer(serializers.Serializer):
     chapters = UpdateChapterStatusSerializer(many=True)
 
     def update_chapters_status(self, exam, validated_data):
+        """
+        Apply every update, or none if any chapter moved past its version:
+        raises VersionConflict with the current state of each such chapter.
+        """
         chapters_data = validated_data['chapters']
         updated_chapters = []
         errors = []
-        
-        for chapter_data in chapters_data:
-            try:
-                chapter_id = chapter_data['chapter_id']
-                is_completed = chapter_data['is_completed']
-                
-                exam_chapter = ExamChapter.objects.get(
-                    exam=exam,
-                    chapter_id=chapter_id
-                )
-                exam_chapter.is_completed = is_completed
-                exam_chapter.save()
-                updated_chapters.append(exam_chapter)
-                
-            except ExamChapter.DoesNotExist:
-                errors.append(f"Chapter {chapter_data.get('chapter_id')} not found in this exam")
-                continue
-        
+        conflicts = []
+
+        with transaction.atomic():
+            for chapter_data in chapters_data:
+                try:
+                    set_chapter_status(
+                        exam, chapter_data['chapter_id'], chapter_data['is_completed'], chapter_data.get('version')
+                    )
+                    updated_chapters.append(chapter_data['chapter_id'])
+                except VersionConflict as conflict:
+                    conflicts.append(conflict.current)
+                except serializers.ValidationError:
+                    errors.append(f"Chapter {chapter_data.get('chapter_id')} not found in this exam")
+
+            if conflicts:
+                transaction.set_rollback(True)
+                raise VersionConflict(conflicts)
+
         if errors and not updated_chapters:
             raise serializers.ValidationError(errors)
-        
-        return updated_chapters
\ No newline at end of file
+
+        return updated_chapters
+
+
+class CloneExamSerializer(serializers.Serializer):
+    """Serializer for the clone action: a new title and whether to reset chapter status"""
+    title = serializers.CharField(max_length=200, required=False)
+    reset_status = serializers.BooleanField(required=False, default=False)
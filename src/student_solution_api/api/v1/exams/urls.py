@@ -10,6 +10,21 @@ urlpatterns = [
     # View all exams (list)
     path('view/', views.view_exams, name='view_exams'),
     
+    # Shared chapter catalog
+    path('chapters/', views.chapter_catalog, name='chapter_catalog'),
+    
+    # Cross-user completion rates, for staff
+    path('analytics/', views.completion_analytics, name='completion_analytics'),
+
     # Manage specific exam (view, patch update, delete, manage chapters)
     path('manage/<int:id>/', views.manage_exam, name='manage_exam'),
+
+    # One subject's chapters of an exam, paged
+    path('manage/<int:id>/subjects/<int:subject_id>/chapters/', views.subject_chapters, name='subject_chapters'),
+
+    # Daily progress history of an exam
+    path('manage/<int:id>/progress/', views.exam_progress, name='exam_progress'),
+
+    # Study plan over the timetable
+    path('manage/<int:id>/plan/', views.exam_plan, name='exam_plan'),
 ]
\ No newline at end of file
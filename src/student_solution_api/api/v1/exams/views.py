@@ -1,23 +1,65 @@
-from rest_framework import status
+from datetime import timedelta
+
+from rest_framework import serializers, status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
+from django.core.cache import cache
+from django.db.models import Count, Max
 from django.shortcuts import get_object_or_404
-from exams.models import Exam, ExamChapter
+from django.utils.cache import patch_cache_control
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.utils.http import quote_etag
+from api.concurrency import VersionConflict, conflict_response
+from api.conditional import conditional_on_versions, etag_matches
+from api.fields import invalid_fields_response, requested_fields
+from exams.cloning import clone_exam
+from exams.models import (
+    Exam, Chapter, ExamChapter, DailyProgress, ChapterCompletion, CompletionRollup, SubjectCompletion
+)
+from exams.planner import get_plan
+from student_solution_api.deletion import delete_exam
+from sync.models import DataVersion
 from .serializers import (
+    CloneExamSerializer,
     ExamSerializer, 
     ExamListSerializer,
+    ExamSummarySerializer,
     ExamUpdateSerializer,
     UpdateChapterStatusSerializer, 
-    BulkUpdateChapterStatusSerializer
+    BulkUpdateChapterStatusSerializer,
+    get_chapter_page
 )
 
+
+# The catalog is keyed by its version, so stale entries are never served.
+CATALOG_CACHE_SECONDS = 60 * 60
+
+# Furthest study plan target date, in days from today
+MAX_PLAN_DAYS = 366
+
+MAX_CHAPTERS_PAGE = 200
+
+MAX_ANALYTICS_CHAPTERS = 200
+
+
+def exam_exists(request, id, subject_id=None):
+    """Whether the user has the exam, with the subject when given"""
+    exams = Exam.objects.filter(id=id, user=request.user)
+    if subject_id is not None:
+        exams = exams.filter(subjects=subject_id)
+    return exams.exists()
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_exam(request):
     """
     Create a new exam with subjects and chapters
     POST /create/
+
+    Chapters come from "subjects" (by title) and/or "chapter_ids" (from the catalog).
     """
     serializer = ExamSerializer(data=request.data, context={'request': request})
     
@@ -40,13 +82,22 @@ def create_exam(request):
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
+@conditional_on_versions(DataVersion.EXAMS, DataVersion.CATALOG)
 def view_exams(request):
     """
     List all exams for the authenticated user
-    GET /view/
+    GET /view/?fields=id,title&expand=subjects
+
+    "fields" limits each exam to the named fields and "expand" adds the
+    optional "subjects"; counts left out are not computed.
     """
+    try:
+        fields = requested_fields(request.query_params, ExamListSerializer)
+    except serializers.ValidationError as error:
+        return invalid_fields_response(error)
+
     exams = Exam.objects.filter(user=request.user).order_by('-id')
-    serializer = ExamListSerializer(exams, many=True, context={'request': request})
+    serializer = ExamListSerializer(exams, many=True, fields=fields, context={'request': request})
     
     return Response({
         'status': 200,
@@ -55,19 +106,160 @@ def view_exams(request):
     }, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def chapter_catalog(request):
+    """
+    List the shared chapter catalog grouped by subject
+    GET /chapters/?subject=<subject id>
+
+    Exams can be created and extended from catalog chapters with "chapter_ids".
+    """
+    chapters = Chapter.objects.all()
+    subject_id = request.query_params.get('subject')
+    if subject_id is not None:
+        if not subject_id.isdigit():
+            return Response({
+                'status': 400,
+                'message': 'Subject must be an id.'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        chapters = chapters.filter(subject_id=subject_id)
+
+    # Deleted chapters lower the count; added and edited chapters move their
+    # latest updated_at, renamed subjects (whose names the catalog embeds)
+    # their subjects'. Together they version the catalog in one query.
+    state = chapters.aggregate(
+        count=Count('id'), last_updated=Max('updated_at'), subjects_updated=Max('subject__updated_at')
+    )
+    last_updated, subjects_updated = (
+        state[key].timestamp() if state[key] else 0 for key in ('last_updated', 'subjects_updated')
+    )
+    version = f'{subject_id or "all"}-{state["count"]}-{last_updated}-{subjects_updated}'
+    etag = f'W/{quote_etag(f"chapters-{version}")}'
+
+    if_none_match = request.headers.get('If-None-Match')
+    if if_none_match and etag_matches(etag, if_none_match):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        cache_key = f'chapter-catalog:{version}'
+        subjects = cache.get(cache_key)
+        if subjects is None:
+            subjects = get_catalog(chapters)
+            cache.set(cache_key, subjects, CATALOG_CACHE_SECONDS)
+        response = Response({
+            'status': 200,
+            'message': 'Chapter catalog retrieved successfully.',
+            'data': subjects
+        }, status=status.HTTP_200_OK)
+
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def get_catalog(chapters):
+    """Helper function to group catalog chapters by subject"""
+    subjects = {}
+    for subject_id, subject_name, chapter_id, title, chapter_number in chapters.order_by(
+        'subject__name', 'subject_id', 'chapter_number', 'id'
+    ).values_list('subject_id', 'subject__name', 'id', 'title', 'chapter_number'):
+        subject = subjects.get(subject_id)
+        if subject is None:
+            subject = subjects[subject_id] = {'id': subject_id, 'name': subject_name, 'chapters': []}
+        subject['chapters'].append({'id': chapter_id, 'title': title, 'chapter_number': chapter_number})
+    return list(subjects.values())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def completion_analytics(request):
+    """
+    Completion rates across all users, for staff, from the summaries kept by
+    the rollup_completion command
+    GET /analytics/?subject=<subject id>&order=asc|desc&limit=<n>
+
+    Subjects, then chapters (of one subject with "subject"), by completion
+    rate: lowest first, so the chapters students leave for last lead.
+    """
+    subject_id = request.query_params.get('subject')
+    order = request.query_params.get('order', 'asc')
+    limit = request.query_params.get('limit', '50')
+    if (subject_id is not None and not subject_id.isdigit()) or order not in ('asc', 'desc') \
+            or not limit.isdigit() or not 1 <= int(limit) <= MAX_ANALYTICS_CHAPTERS:
+        return Response({
+            'status': 400,
+            'message': f'"subject" must be an id, "order" asc or desc and "limit" between 1 and '
+                       f'{MAX_ANALYTICS_CHAPTERS}.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    rate = 'completion_rate' if order == 'asc' else '-completion_rate'
+    subjects = SubjectCompletion.objects.all()
+    chapters = ChapterCompletion.objects.all()
+    if subject_id is not None:
+        subjects = subjects.filter(subject_id=subject_id)
+        chapters = chapters.filter(subject_id=subject_id)
+    rollup = CompletionRollup.objects.first()
+
+    return Response({
+        'status': 200,
+        'message': 'Completion analytics retrieved successfully.',
+        'data': {
+            'processed_until': rollup and rollup.processed_until,
+            'subjects': [
+                {
+                    'id': subject_id,
+                    'name': name,
+                    'chapters': chapters_count,
+                    'total': total,
+                    'completed': completed,
+                    'completion_rate': completion_rate
+                }
+                for subject_id, name, chapters_count, total, completed, completion_rate in subjects.order_by(
+                    rate, 'subject_id'
+                ).values_list('subject_id', 'subject__name', 'chapters', 'total', 'completed', 'completion_rate')
+            ],
+            'chapters': [
+                {
+                    'id': chapter_id,
+                    'title': title,
+                    'chapter_number': chapter_number,
+                    'subject_id': chapter_subject_id,
+                    'total': total,
+                    'completed': completed,
+                    'completion_rate': completion_rate,
+                    'average_days_to_complete': average_days
+                }
+                for chapter_id, title, chapter_number, chapter_subject_id, total, completed, completion_rate,
+                average_days in chapters.order_by(rate, 'chapter_id').values_list(
+                    'chapter_id', 'chapter__title', 'chapter__chapter_number', 'subject_id', 'total', 'completed',
+                    'completion_rate', 'average_days_to_complete'
+                )[:int(limit)]
+            ],
+        }
+    }, status=status.HTTP_200_OK)
+
+
 @api_view(['GET', 'PATCH', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@conditional_on_versions(DataVersion.EXAMS, DataVersion.CATALOG, exists=exam_exists)
 def manage_exam(request, id):
     """
     Manage a specific exam: view, update, delete, and manage chapters
     
-    GET /manage/<id>/ - Get exam details
+    GET /manage/<id>/?fields=id,title,progress - Get exam details, optionally
+        only the named fields; without "subjects" no chapter is read
+    GET /manage/<id>/?summary=true - Subjects with progress and chapter counts
+        only; page their chapters from /manage/<id>/subjects/<subject id>/chapters/
     PATCH /manage/<id>/ - Update exam or chapter status based on payload:
         - Update exam title: {"title": "New Title"}
         - Add subjects/chapters: {"subjects": [...]}
-        - Update single chapter: {"chapter_id": 1, "is_completed": true}
-        - Bulk update chapters: {"chapters": [{"chapter_id": 1, "is_completed": true}, ...]}
+        - Add catalog chapters: {"chapter_ids": [1, 2, ...]}
+        - Update single chapter: {"chapter_id": 1, "is_completed": true, "version": 3}
+        - Bulk update chapters: {"chapters": [{"chapter_id": 1, "is_completed": true, "version": 3}, ...]}
+          "version" is the chapter's version as last read: if the chapter was
+          written since, nothing is updated and 409 returns its current state.
         - Get stats: {"action": "stats"}
+        - Clone exam: {"action": "clone", "title": "Finals", "reset_status": true}
     DELETE /manage/<id>/ - Delete exam
     """
     
@@ -76,7 +268,15 @@ def manage_exam(request, id):
     
     # Handle exam details retrieval
     if request.method == 'GET':
-        serializer = ExamSerializer(exam, context={'request': request})
+        if request.query_params.get('summary', '').lower() == 'true':
+            serializer_class = ExamSummarySerializer
+        else:
+            serializer_class = ExamSerializer
+        try:
+            fields = requested_fields(request.query_params, serializer_class)
+        except serializers.ValidationError as error:
+            return invalid_fields_response(error)
+        serializer = serializer_class(exam, fields=fields, context={'request': request})
         return Response({
             'status': 200,
             'message': 'Exam retrieved successfully.',
@@ -88,6 +288,9 @@ def manage_exam(request, id):
         # Check if this is a stats request
         if request.data.get('action') == 'stats':
             return get_exam_stats(exam)
+
+        if request.data.get('action') == 'clone':
+            return clone_exam_structure(exam, request.data)
         
         # Check if this is a bulk chapter update
         if 'chapters' in request.data:
@@ -103,13 +306,136 @@ def manage_exam(request, id):
     # Handle exam deletion
     elif request.method == 'DELETE':
         exam_title = exam.title
-        exam.delete()
+        delete_exam(exam)
         return Response({
             'status': 200,
             'message': f'Exam "{exam_title}" deleted successfully.'
         }, status=status.HTTP_200_OK)
 
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+@conditional_on_versions(DataVersion.EXAMS, DataVersion.CATALOG, exists=exam_exists)
+def subject_chapters(request, id, subject_id):
+    """
+    One subject's chapters of an exam, by chapter number, a page at a time
+    GET /manage/<id>/subjects/<subject id>/chapters/?after=<cursor>&limit=<n>
+
+    Pass "next_after" back as "after" for the next page; it is null after the last.
+    """
+    exam = get_object_or_404(Exam.objects.only('id'), id=id, user=request.user)
+
+    # The cursor is the last chapter's "<chapter number>:<chapter id>".
+    chapter_number, _, chapter_id = request.query_params.get('after', '0:0').partition(':')
+    limit = request.query_params.get('limit', '50')
+    if not chapter_number.isdigit() or not chapter_id.isdigit() or not limit.isdigit() \
+            or not 1 <= int(limit) <= MAX_CHAPTERS_PAGE:
+        return Response({
+            'status': 400,
+            'message': f'"after" must be a "next_after" cursor and "limit" between 1 and {MAX_CHAPTERS_PAGE}.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    after = (int(chapter_number), int(chapter_id)) if 'after' in request.query_params else None
+
+    chapters = get_chapter_page(exam, subject_id, after, int(limit))
+    if not chapters and after is None and not exam.subjects.filter(id=subject_id).exists():
+        return Response({
+            'status': 404,
+            'message': 'Subject not found in this exam.'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    last = chapters[-1] if len(chapters) == int(limit) else None
+    return Response({
+        'status': 200,
+        'message': 'Chapters retrieved successfully.',
+        'data': {
+            'exam_id': exam.id,
+            'subject_id': subject_id,
+            'chapters': chapters,
+            'next_after': f"{last['chapter_number']}:{last['id']}" if last else None,
+        }
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exam_progress(request, id):
+    """
+    Progress history of an exam, or of one of its subjects, for a chart
+    GET /manage/<id>/progress/?subject=<subject id>&from=<date>&to=<date>
+
+    One point per day with changes, read from the daily rollups, which the
+    rollup_progress command keeps up to date.
+    """
+    exam = get_object_or_404(Exam.objects.only('id'), id=id, user=request.user)
+
+    subject_id = request.query_params.get('subject')
+    if subject_id is not None and not subject_id.isdigit():
+        return Response({
+            'status': 400,
+            'message': 'Subject must be an id.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    rows = DailyProgress.objects.filter(exam=exam, subject_id=subject_id)
+    for param, lookup in (('from', 'day__gte'), ('to', 'day__lte')):
+        value = request.query_params.get(param)
+        if value is None:
+            continue
+        try:
+            day = parse_date(value)
+        except ValueError:
+            day = None
+        if day is None:
+            return Response({
+                'status': 400,
+                'message': f'"{param}" must be a date (YYYY-MM-DD).'
+            }, status=status.HTTP_400_BAD_REQUEST)
+        rows = rows.filter(**{lookup: day})
+
+    points = [
+        {
+            'day': day,
+            'completed': completed,
+            'total': total,
+            'progress': round((completed / total) * 100) if total else 0
+        }
+        for day, completed, total in rows.order_by('day').values_list('day', 'completed', 'total')
+    ]
+
+    return Response({
+        'status': 200,
+        'message': 'Exam progress retrieved successfully.',
+        'data': {'exam_id': exam.id, 'subject_id': subject_id and int(subject_id), 'points': points}
+    }, status=status.HTTP_200_OK)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def exam_plan(request, id):
+    """
+    Study plan: the exam's pending chapters spread over the user's upcoming
+    timetable periods of the same subject, from today until a target date
+    GET /manage/<id>/plan/?until=<date>
+    """
+    exam = get_object_or_404(Exam.objects.only('id', 'user_id'), id=id, user=request.user)
+
+    today = timezone.localdate()
+    try:
+        until = parse_date(request.query_params.get('until', ''))
+    except ValueError:
+        until = None
+    if until is None or not today <= until <= today + timedelta(days=MAX_PLAN_DAYS):
+        return Response({
+            'status': 400,
+            'message': f'"until" must be a date (YYYY-MM-DD) within {MAX_PLAN_DAYS} days from today.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'status': 200,
+        'message': 'Study plan retrieved successfully.',
+        'data': {'exam_id': exam.id, 'from': today, 'until': until, **get_plan(exam, today, until)}
+    }, status=status.HTTP_200_OK)
+
+
 def update_exam_structure(exam, data):
     """Helper function to update exam title and/or add subjects/chapters"""
     serializer = ExamUpdateSerializer(exam, data=data, partial=True)
@@ -153,6 +479,8 @@ def update_single_chapter_status(exam, data):
                 'message': 'Chapter status updated successfully.',
                 'data': exam_serializer.data
             }, status=status.HTTP_200_OK)
+        except VersionConflict as conflict:
+            return conflict_response(conflict.current)
         except Exception as e:
             return Response({
                 'status': 400,
@@ -182,6 +510,8 @@ def bulk_update_chapters_status(exam, data):
                 'message': f'{len(updated_chapters)} chapters updated successfully.',
                 'data': exam_serializer.data
             }, status=status.HTTP_200_OK)
+        except VersionConflict as conflict:
+            return conflict_response(conflict.current)
         except Exception as e:
             return Response({
                 'status': 400,
@@ -195,6 +525,29 @@ def bulk_update_chapters_status(exam, data):
     }, status=status.HTTP_400_BAD_REQUEST)
 
 
+def clone_exam_structure(exam, data):
+    """Helper function to copy an exam with its subjects and chapters"""
+    serializer = CloneExamSerializer(data=data)
+    if not serializer.is_valid():
+        return Response({
+            'status': 400,
+            'message': 'Validation error.',
+            'errors': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    clone, subjects_count, chapters_count = clone_exam(exam, **serializer.validated_data)
+    return Response({
+        'status': 201,
+        'message': 'Exam cloned successfully.',
+        'data': {
+            'id': clone.id,
+            'title': clone.title,
+            'subjects_count': subjects_count,
+            'total_chapters': chapters_count,
+        }
+    }, status=status.HTTP_201_CREATED)
+
+
 def get_exam_stats(exam):
     """Helper function to get exam statistics"""
     total_chapters = exam.exam_chapters.count()
@@ -0,0 +1,54 @@
+import csv
+import json
+from datetime import date
+
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+
+from exams.models import Exam, Chapter, ExamChapter
+from homeworks.models import Homework
+from timetable.models import Subject, Day, Timetable, Period
+
+
+class ExportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        subject = Subject.objects.create(name='Physics')
+        exam = Exam.objects.create(title='Finals', user=self.user)
+        for number in range(1, 4):
+            chapter = Chapter.objects.create(title=f'Optics {number}', chapter_number=number, subject=subject)
+            ExamChapter.objects.create(exam=exam, chapter=chapter, is_completed=number == 1)
+        for day in range(1, 6):
+            Homework.objects.create(
+                title=f'Worksheet {day}', due_date=date(2030, 1, day), user=self.user, is_deleted=day == 5
+            )
+        timetable = Timetable.objects.create(user=self.user, name='Term 1')
+        Period.objects.create(timetable=timetable, day=Day.objects.create(name='monday'), order=1, subject=subject)
+        self.client.force_authenticate(self.user)
+
+    def get_export(self, export_format):
+        response = self.client.get(f'/api/v1/export/{export_format}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode()
+
+    def test_ndjson(self):
+        records = [json.loads(line) for line in self.get_export('ndjson').splitlines()]
+        self.assertEqual(
+            [record['record'] for record in records],
+            ['homework'] * 4 + ['exam'] + ['exam_chapter'] * 3 + ['timetable', 'period'],
+        )
+        self.assertEqual(records[0]['due_date'], '2030-01-01')
+        self.assertEqual(records[5]['subject_name'], 'Physics')
+        self.assertTrue(records[5]['is_completed'])
+        self.assertEqual(records[-1]['day_name'], 'monday')
+
+    def test_csv(self):
+        rows = list(csv.DictReader(self.get_export('csv').splitlines()))
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows[0]['record'], 'homework')
+        self.assertEqual(rows[0]['subject_name'], '')
+        self.assertEqual(rows[5]['is_completed'], 'true')
+
+    def test_unknown_format(self):
+        self.assertEqual(self.client.get('/api/v1/export/xml/').status_code, 404)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+
+app_name = 'export'
+
+urlpatterns = [
+    path('<str:export_format>/', views.export_data, name='export_data'),
+]
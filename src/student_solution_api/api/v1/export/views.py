@@ -0,0 +1,129 @@
+import csv
+from itertools import islice
+
+from django.db import router
+from django.db.models import F
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.utils.encoders import JSONEncoder
+
+from api.renderers import FastJSONRenderer
+from exams.models import Exam, ExamChapter
+from homeworks.models import Homework
+from timetable.models import Timetable, Period
+
+
+# Rows fetched per database round trip and records per chunk written to the client.
+EXPORT_CHUNK_SIZE = 2000
+
+CSV_COLUMNS = [
+    'record', 'id', 'exam_id', 'timetable_id', 'chapter_id', 'title', 'name', 'subject_name',
+    'chapter_number', 'day_name', 'order', 'is_completed', 'due_date', 'created_at', 'updated_at',
+]
+
+encoder = JSONEncoder()
+
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv; charset=utf-8',
+}
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def export_data(request, export_format):
+    """
+    Stream all of the user's homework, exams (with chapter status) and timetables
+    GET /ndjson/ - one JSON object per line
+    GET /csv/ - one row per record, with the union of all record columns
+
+    Every record has a "record" type: homework, exam, exam_chapter, timetable or period.
+    Rows are read with database cursors in chunks, so memory use does not grow with
+    the size of the export.
+    """
+    if export_format not in CONTENT_TYPES:
+        return Response({
+            'status': 404,
+            'message': 'Export format must be "ndjson" or "csv".'
+        }, status=status.HTTP_404_NOT_FOUND)
+
+    # The body is produced after the view returns, outside the request's
+    # replica routing, so pin the queries to the database chosen now.
+    db = router.db_for_read(Homework)
+    records = export_records(request.user, db)
+    lines = ndjson_lines(records) if export_format == 'ndjson' else csv_lines(records)
+
+    response = StreamingHttpResponse(chunked(lines), content_type=CONTENT_TYPES[export_format])
+    filename = f'export-{timezone.localdate().isoformat()}.{export_format}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    response['Cache-Control'] = 'no-store'
+    return response
+
+
+def export_records(user, db):
+    """Helper function to yield every exported record as a dict"""
+    querysets = (
+        ('homework', Homework.objects.filter(user=user, is_deleted=False).order_by('id').values(
+            'id', 'title', 'is_completed', 'due_date', 'created_at', 'updated_at',
+            subject_name=F('subject__name'),
+        )),
+        ('exam', Exam.objects.filter(user=user).order_by('id').values('id', 'title', 'updated_at')),
+        ('exam_chapter', ExamChapter.objects.filter(exam__user=user).order_by('exam_id', 'id').values(
+            'id', 'exam_id', 'chapter_id', 'is_completed', 'updated_at',
+            title=F('chapter__title'),
+            chapter_number=F('chapter__chapter_number'),
+            subject_name=F('chapter__subject__name'),
+        )),
+        ('timetable', Timetable.objects.filter(user=user).order_by('id').values('id', 'name', 'updated_at')),
+        ('period', Period.objects.filter(timetable__user=user).order_by('timetable_id', 'day_id', 'order').values(
+            'id', 'timetable_id', 'order', 'updated_at',
+            day_name=F('day__name'),
+            subject_name=F('subject__name'),
+        )),
+    )
+    for record, queryset in querysets:
+        # iterator() streams from a server-side cursor on PostgreSQL.
+        for row in queryset.using(db).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+            yield {'record': record, **row}
+
+
+def ndjson_lines(records):
+    renderer = FastJSONRenderer()
+    for record in records:
+        yield renderer.render(record) + b'\n'
+
+
+class Echo:
+    """File-like object that returns what is written, for csv.writer"""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(records):
+    writer = csv.writer(Echo())
+    yield writer.writerow(CSV_COLUMNS).encode()
+    for record in records:
+        yield writer.writerow([csv_value(record.get(column)) for column in CSV_COLUMNS]).encode()
+
+
+def csv_value(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if hasattr(value, 'isoformat'):
+        # Same date and datetime format as the JSON API
+        return encoder.default(value)
+    return value
+
+
+def chunked(lines):
+    """Join lines into chunks so each write to the client carries many records"""
+    lines = iter(lines)
+    while chunk := b''.join(islice(lines, EXPORT_CHUNK_SIZE)):
+        yield chunk
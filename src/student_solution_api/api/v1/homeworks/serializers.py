@@ -1,13 +1,50 @@
+from django.db.models import QuerySet
 from rest_framework import serializers
 
-from homeworks.models import Homework
+from api.fields import SparseFieldsMixin
+
+from homeworks.models import Homework, Reminder
 from timetable.models import Subject
 
 
-class HomeworkSerializer(serializers.ModelSerializer):
+class HomeworkListSerializer(serializers.ListSerializer):
+    """
+    Serializes homework querysets from a values_list of the requested
+    columns, skipping model instances, and the subject join unless asked for.
+    """
+    columns = {'subject': 'subject__name'}
+
+    def to_representation(self, data):
+        if not isinstance(data, QuerySet):
+            return super().to_representation(data)
+
+        fields = self.child.requested_fields
+        # DateTime and date values need their field's formatting.
+        formatters = {
+            name: self.child.fields[name].to_representation
+            for name in ('created_at', 'due_date') if name in fields
+        }
+        rows = data.values_list(*(self.columns.get(name, name) for name in fields))
+        homeworks = []
+        for row in rows:
+            homework = {}
+            for name, value in zip(fields, row):
+                if name in formatters:
+                    value = formatters[name](value)
+                # Like the nested source='subject.name' field, omit the key without a subject.
+                elif name == 'subject' and value is None:
+                    continue
+                homework[name] = value
+            homeworks.append(homework)
+        return homeworks
+
+
+class HomeworkSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     subject_name = serializers.CharField(write_only=True, required=False, allow_blank=True)
     subject = serializers.CharField(source='subject.name', read_only=True)
 
+    default_fields = ['id', 'title', 'subject', 'is_completed', 'is_deleted', 'created_at', 'due_date', 'version']
+
     class Meta:
         model = Homework
         fields = [
@@ -18,8 +55,11 @@ class HomeworkSerializer(serializers.ModelSerializer):
             'is_completed',
             'is_deleted',
             'created_at',
-            'due_date'
+            'due_date',
+            'version'
         ]
+        read_only_fields = ['version']
+        list_serializer_class = HomeworkListSerializer
 
     def create(self, validated_data):
         subject_name = validated_data.pop('subject_name', '').strip().lower()
@@ -35,3 +75,23 @@ class HomeworkSerializer(serializers.ModelSerializer):
         validated_data['subject'] = subject
         validated_data['user'] = self.context['request'].user
         return Homework.objects.create(**validated_data)
+
+
+class ReminderSerializer(serializers.ModelSerializer):
+    homework_id = serializers.IntegerField(read_only=True)
+    title = serializers.CharField(source='homework.title', read_only=True)
+
+    class Meta:
+        model = Reminder
+        fields = ['id', 'homework_id', 'title', 'window', 'due_date', 'created_at', 'read_at']
+
+
+class ReadRemindersSerializer(serializers.Serializer):
+    """Reminders to mark as read: the given ids, or all unread ones"""
+    ids = serializers.ListField(child=serializers.IntegerField(), required=False, max_length=500)
+    all = serializers.BooleanField(required=False, default=False)
+
+    def validate(self, attrs):
+        if not attrs.get('ids') and not attrs['all']:
+            raise serializers.ValidationError('Provide "ids" or "all": true.')
+        return attrs
@@ -6,7 +6,8 @@ from .views import *
 app_name = 'homeworks'
 
 urlpatterns = [
-    path('create/', create_homework),
-    path('manage/', manage_homework),
+    path('create/', create_homework, name='create_homework'),
+    path('manage/', manage_homework, name='manage_homework'),
+    path('reminders/', reminders, name='reminders'),
 
 ]
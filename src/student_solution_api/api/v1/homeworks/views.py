@@ -1,10 +1,20 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import serializers, status
+from django.db import transaction
+from django.utils import timezone
 
-from homeworks.models import Homework
-from .serializers import HomeworkSerializer
+from api.concurrency import VersionConflict, conflict_response, versioned_update
+from api.conditional import conditional_on_versions
+from api.fields import invalid_fields_response, requested_fields
+from homeworks.models import Homework, Reminder
+from sync.models import DataVersion
+from sync.versions import bump_version
+from .serializers import HomeworkSerializer, ReadRemindersSerializer, ReminderSerializer
+
+
+MAX_REMINDERS_PAGE = 100
 
 
 @api_view([ 'POST'])
@@ -27,10 +37,22 @@ def create_homework(request):
 
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@conditional_on_versions(DataVersion.HOMEWORKS, DataVersion.CATALOG)
 def manage_homework(request):
+    """
+    GET ?due_date=<date>&is_completed=<bool>&fields=id,title - Live homework,
+        optionally only the named fields
+    PUT {"id": 1, "version": 3} - Mark as completed
+    DELETE {"id": 1, "version": 3} - Delete
+    """
     user = request.user
 
     if request.method == 'GET':
+        try:
+            fields = requested_fields(request.query_params, HomeworkSerializer)
+        except serializers.ValidationError as error:
+            return invalid_fields_response(error)
+
         due_date = request.query_params.get('due_date')
         is_completed = request.query_params.get('is_completed')
 
@@ -46,7 +68,7 @@ def manage_homework(request):
                 homeworks = homeworks.filter(is_completed=False)
 
         homeworks = homeworks.order_by('created_at')
-        serializer = HomeworkSerializer(homeworks, many=True)
+        serializer = HomeworkSerializer(homeworks, many=True, fields=fields)
 
         return Response({
             'status': 200,
@@ -63,20 +85,26 @@ def manage_homework(request):
                 'message': 'Homework ID is required.',
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            homework = Homework.objects.get(id=homework_id, user=user, is_deleted=False)
-            homework.is_deleted = True
-            homework.save()
+        if not is_valid_version(request.data.get('version')):
             return Response({
-                'status': 200,
-                'message': 'Homework deleted successfully.',
-                'data': {'id': homework_id}
-            }, status=status.HTTP_200_OK)
+                'status': 400,
+                'message': 'Version must be a positive integer.',
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            update_homework(user, homework_id, request.data.get('version'), is_deleted=True)
         except Homework.DoesNotExist:
             return Response({
                 'status': 404,
                 'message': 'Homework not found.',
             }, status=status.HTTP_404_NOT_FOUND)
+        except VersionConflict as conflict:
+            return conflict_response(HomeworkSerializer(conflict.current).data)
+        return Response({
+            'status': 200,
+            'message': 'Homework deleted successfully.',
+            'data': {'id': homework_id}
+        }, status=status.HTTP_200_OK)
 
     elif request.method == 'PUT':
         homework_id = request.data.get('id')
@@ -87,21 +115,106 @@ def manage_homework(request):
                 'message': 'Homework ID is required.',
             }, status=status.HTTP_400_BAD_REQUEST)
 
+        if not is_valid_version(request.data.get('version')):
+            return Response({
+                'status': 400,
+                'message': 'Version must be a positive integer.',
+            }, status=status.HTTP_400_BAD_REQUEST)
+
         try:
-            homework = Homework.objects.get(id=homework_id, user=user, is_deleted=False)
+            update_homework(user, homework_id, request.data.get('version'), is_completed=True)
         except Homework.DoesNotExist:
             return Response({
                 'status': 404,
                 'message': 'Homework not found.',
             }, status=status.HTTP_404_NOT_FOUND)
+        except VersionConflict as conflict:
+            return conflict_response(HomeworkSerializer(conflict.current).data)
 
-        homework.is_completed = True
-        homework.save()
-
-        serializer = HomeworkSerializer(homework)
+        serializer = HomeworkSerializer(Homework.objects.select_related('subject').get(id=homework_id))
 
         return Response({
             'status': 200,
             'message': 'Homework marked as completed.',
             'data': serializer.data
-        }, status=status.HTTP_200_OK)
\ No newline at end of file
+        }, status=status.HTTP_200_OK)
+
+
+def update_homework(user, homework_id, version, **values):
+    """
+    Write values to a live homework in one conditional UPDATE (see
+    api.concurrency), unless it already has them, and bump the sync version
+    in the same transaction: two statements on success. Raises
+    Homework.DoesNotExist, or VersionConflict if it moved past version.
+    """
+    homeworks = Homework.objects.filter(id=homework_id, user=user, is_deleted=False)
+    with transaction.atomic():
+        if versioned_update(homeworks.exclude(**values), version, **values):
+            # The update skips the Homework signals.
+            bump_version(user.pk, DataVersion.HOMEWORKS)
+            return
+
+    current = homeworks.select_related('subject').first()
+    if current is None:
+        raise Homework.DoesNotExist
+    if version is not None and current.version != version:
+        raise VersionConflict(current)
+
+
+def is_valid_version(version):
+    return version is None or (type(version) is int and version >= 1)
+
+
+@api_view(['GET', 'PATCH'])
+@permission_classes([IsAuthenticated])
+def reminders(request):
+    """
+    Due-date reminder inbox, written by the send_reminders command
+    GET /reminders/?unread=true&before=<reminder id>&limit=<n> - Newest first,
+        only for homework still open; pass "next_before" back for older ones
+    PATCH /reminders/ - Mark as read: {"ids": [1, 2]} or {"all": true}
+    """
+    inbox = Reminder.objects.filter(user=request.user)
+
+    if request.method == 'PATCH':
+        serializer = ReadRemindersSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response({
+                'status': 400,
+                'message': 'Validation error.',
+                'errors': serializer.errors
+            }, status=status.HTTP_400_BAD_REQUEST)
+        unread = inbox.filter(read_at=None)
+        if not serializer.validated_data['all']:
+            unread = unread.filter(id__in=serializer.validated_data['ids'])
+        updated = unread.update(read_at=timezone.now())
+        return Response({
+            'status': 200,
+            'message': f'{updated} reminders marked as read.',
+            'data': {'updated': updated}
+        }, status=status.HTTP_200_OK)
+
+    before = request.query_params.get('before')
+    limit = request.query_params.get('limit', '50')
+    if (before is not None and not before.isdigit()) or not limit.isdigit() \
+            or not 1 <= int(limit) <= MAX_REMINDERS_PAGE:
+        return Response({
+            'status': 400,
+            'message': f'"before" must be a reminder id and "limit" between 1 and {MAX_REMINDERS_PAGE}.'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    inbox = inbox.filter(homework__is_completed=False, homework__is_deleted=False)
+    if request.query_params.get('unread', '').lower() == 'true':
+        inbox = inbox.filter(read_at=None)
+    if before is not None:
+        inbox = inbox.filter(id__lt=before)
+    page = list(inbox.select_related('homework').order_by('-id')[:int(limit)])
+
+    return Response({
+        'status': 200,
+        'message': 'Reminders fetched successfully.',
+        'data': {
+            'reminders': ReminderSerializer(page, many=True).data,
+            'next_before': page[-1].id if len(page) == int(limit) else None,
+        }
+    }, status=status.HTTP_200_OK)
@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+
+MAX_PAGE_SIZE = 50
+
+# Deeper pages would make every kind fetch offset + page_size rows.
+MAX_RESULTS = 500
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    q = serializers.CharField(max_length=200)
+    page = serializers.IntegerField(min_value=1, default=1)
+    page_size = serializers.IntegerField(min_value=1, max_value=MAX_PAGE_SIZE, default=20)
+
+    def validate(self, attrs):
+        if attrs['page'] * attrs['page_size'] > MAX_RESULTS:
+            raise serializers.ValidationError(f'Only the first {MAX_RESULTS} results can be paged through.')
+        return attrs
@@ -0,0 +1,39 @@
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework import status
+
+from search.engine import search as search_index
+from .serializers import SearchQuerySerializer
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def search(request):
+    """
+    Ranked search over the user's homework, exams and the chapters in their exams
+    GET /?q=<text>&page=<n>&page_size=<n>
+    """
+    serializer = SearchQuerySerializer(data=request.query_params)
+    if not serializer.is_valid():
+        return Response({
+            'status': 400,
+            'message': 'Validation error.',
+            'errors': serializer.errors
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    page, page_size = serializer.validated_data['page'], serializer.validated_data['page_size']
+    offset = (page - 1) * page_size
+    # One extra row tells whether another page exists.
+    results = search_index(request.user.id, serializer.validated_data['q'], offset + page_size + 1)
+
+    return Response({
+        'status': 200,
+        'message': 'Search results retrieved successfully.',
+        'data': {
+            'page': page,
+            'page_size': page_size,
+            'has_more': len(results) > offset + page_size,
+            'results': results[offset:offset + page_size],
+        }
+    }, status=status.HTTP_200_OK)
@@ -0,0 +1,10 @@
+from django.urls import path
+
+from . import views
+
+
+app_name = 'sync'
+
+urlpatterns = [
+    path('', views.sync_changes, name='sync_changes'),
+]
@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from exams.models import Exam, ExamChapter
+from homeworks.models import Homework
+from student_solution_api.db_routers import read_from_primary
+from sync.models import Tombstone
+from sync.tombstones import tombstone_horizon
+from timetable.models import Timetable, Period
+
+
+# Rows are stamped when saved, not when committed; re-sending the last few
+# seconds picks up transactions that were still open at the previous sync.
+CURSOR_OVERLAP = timedelta(seconds=5)
+
+DELETED_KEYS = {
+    Tombstone.EXAM: 'exams',
+    Tombstone.EXAM_CHAPTER: 'exam_chapters',
+    Tombstone.HOMEWORK: 'homeworks',
+    Tombstone.TIMETABLE: 'timetables',
+    Tombstone.PERIOD: 'periods',
+}
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def sync_changes(request):
+    """
+    Everything changed or deleted since a cursor, across exams, homework and timetables
+    GET /?since=<cursor>
+
+    Pass the returned cursor as `since` on the next sync. Without `since`, or with
+    a cursor older than the tombstone retention, a full snapshot is returned
+    ("full": true) and the client should replace its local copy.
+    """
+    cursor = timezone.now()
+    since = None
+
+    since_param = request.query_params.get('since')
+    if since_param:
+        try:
+            since = parse_datetime(since_param)
+        except ValueError:
+            since = None
+        if since is None or timezone.is_naive(since):
+            return Response({
+                'status': 400,
+                'message': 'Invalid sync cursor.',
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+    full = since is None or since < tombstone_horizon()
+    if not full:
+        since -= CURSOR_OVERLAP
+
+    # A lagging replica would hide rows stamped before the cursor.
+    with read_from_primary():
+        changes = get_changes(request.user, None if full else since)
+        deleted = {key: [] for key in DELETED_KEYS.values()}
+        if not full:
+            get_deletions(request.user, since, deleted)
+
+    return Response({
+        'status': 200,
+        'message': 'Changes fetched successfully.',
+        'data': {
+            'cursor': cursor.isoformat(),
+            'full': full,
+            'changes': changes,
+            'deleted': deleted,
+        }
+    }, status=status.HTTP_200_OK)
+
+
+def changed_since(queryset, since):
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    return queryset.order_by('id')
+
+
+def get_changes(user, since):
+    """Helper function to collect rows modified since `since` (all rows if None)"""
+    exams = list(changed_since(Exam.objects.filter(user=user), since).values('id', 'title', 'updated_at'))
+    if exams:
+        exam_subjects = {exam['id']: [] for exam in exams}
+        subject_rows = Exam.subjects.through.objects.filter(exam_id__in=exam_subjects).values_list(
+            'exam_id', 'subject_id', 'subject__name'
+        )
+        for exam_id, subject_id, subject_name in subject_rows:
+            exam_subjects[exam_id].append({'id': subject_id, 'name': subject_name})
+        for exam in exams:
+            exam['subjects'] = exam_subjects[exam['id']]
+
+    exam_chapters = changed_since(ExamChapter.objects.filter(exam__user=user), since).values(
+        'id', 'exam_id', 'chapter_id', 'is_completed', 'version', 'updated_at',
+        title=F('chapter__title'),
+        chapter_number=F('chapter__chapter_number'),
+        subject_id=F('chapter__subject_id'),
+        subject_name=F('chapter__subject__name'),
+    )
+
+    homeworks = changed_since(Homework.objects.filter(user=user, is_deleted=False), since).values(
+        'id', 'title', 'subject_id', 'is_completed', 'created_at', 'due_date', 'version', 'updated_at',
+        subject_name=F('subject__name'),
+    )
+
+    timetables = changed_since(Timetable.objects.filter(user=user), since).values('id', 'name', 'updated_at')
+
+    periods = changed_since(Period.objects.filter(timetable__user=user), since).values(
+        'id', 'timetable_id', 'day_id', 'order', 'subject_id', 'updated_at',
+        subject_name=F('subject__name'),
+    )
+
+    return {
+        'exams': exams,
+        'exam_chapters': list(exam_chapters),
+        'homeworks': list(homeworks),
+        'timetables': list(timetables),
+        'periods': list(periods),
+    }
+
+
+def get_deletions(user, since, deleted):
+    """Helper function to collect ids deleted since `since`, by resource"""
+    tombstones = Tombstone.objects.filter(user=user, deleted_at__gte=since).values_list('resource', 'object_id')
+    for resource, object_id in tombstones:
+        deleted[DELETED_KEYS[resource]].append(object_id)
+
+    # Soft-deleted homework is gone for the client as well.
+    deleted['homeworks'].extend(
+        changed_since(Homework.objects.filter(user=user, is_deleted=True), since).values_list('id', flat=True)
+    )
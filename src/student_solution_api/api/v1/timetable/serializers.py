@@ -1,5 +1,6 @@
 # serializers.py
 from rest_framework import serializers
+from api.fields import SparseFieldsMixin
 from timetable.models import Timetable, Day, Period, Subject
 
 class PeriodSerializer(serializers.ModelSerializer):
@@ -54,34 +55,43 @@ class TimetableCreateSerializer(serializers.ModelSerializer):
         
         return timetable
 
-class TimetableManageSerializer(serializers.ModelSerializer):
+class TimetableManageSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     days = serializers.ListField(write_only=True, required=False)
+
+    default_fields = ['id', 'name', 'days']
     
     class Meta:
         model = Timetable
         fields = ['id', 'name', 'days']
     
     def to_representation(self, instance):
-        # This is your old get_days logic
+        representation = {'id': instance.id, 'name': instance.name}
+        # Periods are only read when asked for
+        if 'days' in self.requested_fields:
+            representation['days'] = self.get_days(instance)
+        return {name: representation[name] for name in self.requested_fields}
+
+    def get_days(self, instance):
+        # Group periods by day from a values_list of the needed columns
+        day_names = dict(Day.WEEKDAYS)
         days_dict = {}
-        periods = instance.periods.select_related('day', 'subject').all()
-        for period in periods:
-            day_id = period.day.pk
+        periods = instance.periods.values_list(
+            'day_id', 'day__name', 'order', 'subject__name'
+        )
+        for day_id, day_name, order, subject_name in periods:
             if day_id not in days_dict:
                 days_dict[day_id] = {
                     'id': day_id,
-                    'name': period.day.get_name_display(),
+                    'name': day_names.get(day_name, day_name),
                     'periods': []
                 }
             days_dict[day_id]['periods'].append({
-                'order': period.order,
-                'subject': period.subject.name
+                'order': order,
+                'subject': subject_name
             })
         for day_data in days_dict.values():
             day_data['periods'].sort(key=lambda x: x['order'])
-        data = super().to_representation(instance)
-        data['days'] = sorted(days_dict.values(), key=lambda x: x['id'])
-        return data
+        return sorted(days_dict.values(), key=lambda x: x['id'])
     
     def update(self, instance, validated_data):
         days_data = validated_data.pop('days', None)
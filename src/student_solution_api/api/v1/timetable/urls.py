@@ -8,4 +8,5 @@ app_name = 'timetable'
 urlpatterns = [
     path('create/', create_timetable, name='create-timetable'),
     path('manage/', manage_timetable, name='manage-timetable'),
+    path('subjects/', subject_typeahead, name='subject-typeahead'),
 ]
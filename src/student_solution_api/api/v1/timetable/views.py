@@ -1,11 +1,19 @@
 # views.py
-from rest_framework import status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework import serializers, status
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+from api.conditional import conditional_on_versions
+from api.fields import requested_fields
+from student_solution_api.deletion import delete_timetable
+from sync.models import DataVersion
 from timetable.models import Timetable
+from timetable.typeahead import subject_index
 from .serializers import TimetableCreateSerializer, TimetableManageSerializer
 
+MAX_TYPEAHEAD_RESULTS = 50
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_timetable(request):
@@ -22,9 +30,11 @@ def create_timetable(request):
 
 @api_view(['GET', 'PUT', 'DELETE'])
 @permission_classes([IsAuthenticated])
+@conditional_on_versions(DataVersion.TIMETABLE, DataVersion.CATALOG)
 def manage_timetable(request):
     """
-    GET: Return the first timetable of the currently logged in user
+    GET: Return the first timetable of the currently logged in user,
+        optionally only the fields in ?fields=id,name (periods are skipped without "days")
     PUT: Update the user's timetable
     DELETE: Delete the user's timetable
     """
@@ -35,7 +45,11 @@ def manage_timetable(request):
             return Response({'error': 'No timetable found for this user'}, status=status.HTTP_404_NOT_FOUND)
         
         if request.method == 'GET':
-            serializer = TimetableManageSerializer(timetable)
+            try:
+                fields = requested_fields(request.query_params, TimetableManageSerializer)
+            except serializers.ValidationError as error:
+                return Response(error.detail, status=status.HTTP_400_BAD_REQUEST)
+            serializer = TimetableManageSerializer(timetable, fields=fields)
             return Response(serializer.data)
         
         elif request.method == 'PUT':
@@ -46,8 +60,25 @@ def manage_timetable(request):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
         elif request.method == 'DELETE':
-            timetable.delete()
+            delete_timetable(timetable)
             return Response({'message': 'Timetable deleted successfully'}, status=status.HTTP_204_NO_CONTENT)
     
     except Exception as e:
-        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+
+@api_view(['GET'])
+# Token-only authentication: the keystroke path makes no database queries.
+@authentication_classes([JWTStatelessUserAuthentication])
+@permission_classes([IsAuthenticated])
+def subject_typeahead(request):
+    """
+    Subjects whose name or one of its words starts with q, for autocompletion
+    GET /subjects/?q=<prefix>&limit=<n>
+    """
+    limit = request.query_params.get('limit', '10')
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_TYPEAHEAD_RESULTS:
+        return Response(
+            {'error': f'limit must be between 1 and {MAX_TYPEAHEAD_RESULTS}'}, status=status.HTTP_400_BAD_REQUEST
+        )
+    return Response(subject_index.get().lookup(request.query_params.get('q', ''), int(limit)))
@@ -1,34 +1,98 @@
 from django.contrib import admin
-from .models import Exam, Chapter, ExamChapter
+from django.db.models import OuterRef
+from student_solution_api.admin_tools import EstimatedCountPaginator, IdRangeListFilter, SubqueryCount
+from .models import Exam, Chapter, ExamChapter, ChapterCompletion, SubjectCompletion
 
 
 @admin.register(Chapter)
 class ChapterAdmin(admin.ModelAdmin):
     list_display = ['id', 'title', 'chapter_number', 'subject']
     list_filter = ['subject']
+    list_select_related = ['subject']
     search_fields = ['title', 'subject__name']
     ordering = ['subject__name', 'chapter_number']
     list_per_page = 20
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Exam)
 class ExamAdmin(admin.ModelAdmin):
     list_display = ['id', 'title', 'user', 'progress', 'subjects_count']
-    list_filter = ['user']
+    list_filter = [('user', IdRangeListFilter)]
+    list_select_related = ['user']
     search_fields = ['title', 'user__username']
+    autocomplete_fields = ['user', 'subjects']
     ordering = ['-id']
     list_per_page = 20
-    
+
+    def get_queryset(self, request):
+        # Counts per row as correlated subqueries; joining both relations
+        # would multiply chapters by subjects.
+        exam_chapters = ExamChapter.objects.filter(exam=OuterRef('pk')).values('pk')
+        return super().get_queryset(request).annotate(
+            total_chapters=SubqueryCount(exam_chapters),
+            completed_chapters=SubqueryCount(exam_chapters.filter(is_completed=True)),
+            subjects_total=SubqueryCount(Exam.subjects.through.objects.filter(exam=OuterRef('pk')).values('pk')),
+        )
+
+    def progress(self, obj):
+        if not obj.total_chapters:
+            return 0
+        return round((obj.completed_chapters / obj.total_chapters) * 100)
+
     def subjects_count(self, obj):
-        return obj.subjects.count()
+        return obj.subjects_total
     subjects_count.short_description = 'Subjects Count'
+    subjects_count.admin_order_field = 'subjects_total'
 
 
 @admin.register(ExamChapter)
 class ExamChapterAdmin(admin.ModelAdmin):
     list_display = ['id', 'exam', 'chapter', 'is_completed', 'created_at']
-    list_filter = ['is_completed', 'exam', 'chapter__subject']
+    list_filter = ['is_completed', ('exam', IdRangeListFilter), 'chapter__subject']
+    list_select_related = ['exam', 'chapter__subject']
     search_fields = ['chapter__title', 'exam__title', 'chapter__subject__name']
-    ordering = ['exam__title', 'chapter__subject__name', 'chapter__chapter_number']
+    autocomplete_fields = ['exam', 'chapter']
+    # Sorting by exam and chapter ids keeps to the (exam, chapter) unique index.
+    ordering = ['exam_id', 'chapter_id']
     list_per_page = 20
     readonly_fields = ['created_at', 'updated_at']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class CompletionAdmin(admin.ModelAdmin):
+    """Read-only completion summaries, kept by the rollup_completion command (see exams.analytics)"""
+    ordering = ['completion_rate']
+    list_per_page = 20
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+    def rate(self, obj):
+        return f'{obj.completion_rate:.0%}'
+    rate.admin_order_field = 'completion_rate'
+
+
+@admin.register(SubjectCompletion)
+class SubjectCompletionAdmin(CompletionAdmin):
+    list_display = ['subject', 'rate', 'completed', 'total', 'chapters', 'updated_at']
+    list_select_related = ['subject']
+    search_fields = ['subject__name']
+
+
+@admin.register(ChapterCompletion)
+class ChapterCompletionAdmin(CompletionAdmin):
+    list_display = ['chapter', 'subject', 'rate', 'completed', 'total', 'average_days_to_complete', 'updated_at']
+    list_filter = ['subject']
+    list_select_related = ['chapter__subject', 'subject']
+    search_fields = ['chapter__title']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,123 @@
+"""
+Completion of catalog chapters and subjects across all users.
+
+rollup_completion() (run periodically by the rollup_completion command)
+reads the ExamChapter rows written since its watermark from the updated_at
+index and recounts only the chapters they belong to into
+ChapterCompletion, then sums those chapters' subjects into
+SubjectCompletion. Staff views read the summaries and never scan
+ExamChapter.
+
+A chapter is recounted from its rows as a whole rather than adjusted by
+deltas, so passing over a row twice is harmless: each pass starts
+COMPLETION_OVERLAP before the watermark, to pick up rows whose transaction
+committed after the previous pass had read. Rows deleted outright (exam
+deletion, account purge) leave nothing to find by updated_at; a full pass
+(rollup_completion --full, e.g. nightly) recounts every chapter.
+"""
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Q, Sum
+from django.utils import timezone
+
+from .models import Chapter, ChapterCompletion, CompletionRollup, ExamChapter, SubjectCompletion
+
+
+COMPLETION_OVERLAP = timedelta(minutes=5)
+
+COMPLETION_BATCH_SIZE = 500
+
+
+def rollup_completion(full=False):
+    """Recount the chapters changed since the watermark, or all with full. Returns the number recounted."""
+    started = timezone.now()
+    rollup = CompletionRollup.objects.first()
+    if full or rollup is None:
+        chapter_ids = Chapter.objects.order_by('id').values_list('id', flat=True)
+    else:
+        chapter_ids = ExamChapter.objects.filter(
+            updated_at__gt=rollup.processed_until - COMPLETION_OVERLAP
+        ).values_list('chapter_id', flat=True).distinct()
+    chapter_ids = sorted(set(chapter_ids))
+
+    subject_ids = set()
+    for start in range(0, len(chapter_ids), COMPLETION_BATCH_SIZE):
+        subject_ids |= recount_chapters(chapter_ids[start:start + COMPLETION_BATCH_SIZE])
+    recount_subjects(None if full else subject_ids)
+
+    # Rows written while this pass ran are before the next one's overlap.
+    CompletionRollup.objects.update_or_create(pk=1, defaults={'processed_until': started})
+    return len(chapter_ids)
+
+
+def recount_chapters(chapter_ids):
+    """Rewrite the chapters' ChapterCompletion rows. Returns the ids of their subjects."""
+    days_to_complete = ExpressionWrapper(F('updated_at') - F('created_at'), output_field=DurationField())
+    rows = ExamChapter.objects.filter(chapter_id__in=chapter_ids).values(
+        'chapter_id', 'chapter__subject_id'
+    ).annotate(
+        total=Count('id'),
+        completed=Count('id', filter=Q(is_completed=True)),
+        duration=Avg(days_to_complete, filter=Q(is_completed=True)),
+    )
+    completions = [
+        ChapterCompletion(
+            chapter_id=row['chapter_id'],
+            subject_id=row['chapter__subject_id'],
+            total=row['total'],
+            completed=row['completed'],
+            completion_rate=row['completed'] / row['total'],
+            average_days_to_complete=None if row['duration'] is None else row['duration'] / timedelta(days=1),
+        )
+        for row in rows
+    ]
+
+    stale = ChapterCompletion.objects.filter(chapter_id__in=chapter_ids).exclude(
+        chapter_id__in=[completion.chapter_id for completion in completions]
+    )
+    with transaction.atomic():
+        subject_ids = set(stale.values_list('subject_id', flat=True))
+        # Chapters no exam has any more
+        stale.delete()
+        ChapterCompletion.objects.bulk_create(
+            completions,
+            update_conflicts=True,
+            unique_fields=['chapter'],
+            update_fields=[
+                'subject', 'total', 'completed', 'completion_rate', 'average_days_to_complete', 'updated_at'
+            ],
+        )
+    return subject_ids | {completion.subject_id for completion in completions}
+
+
+def recount_subjects(subject_ids=None):
+    """Rewrite the subjects' SubjectCompletion rows from ChapterCompletion; all subjects for None."""
+    chapters = ChapterCompletion.objects.all()
+    if subject_ids is not None:
+        chapters = chapters.filter(subject_id__in=subject_ids)
+    completions = [
+        SubjectCompletion(
+            subject_id=row['subject_id'],
+            chapters=row['chapters'],
+            total=row['total'],
+            completed=row['completed'],
+            completion_rate=row['completed'] / row['total'],
+        )
+        for row in chapters.values('subject_id').annotate(
+            chapters=Count('chapter_id'), total=Sum('total'), completed=Sum('completed')
+        )
+    ]
+
+    stale = SubjectCompletion.objects.exclude(subject_id__in=[completion.subject_id for completion in completions])
+    if subject_ids is not None:
+        stale = stale.filter(subject_id__in=subject_ids)
+    with transaction.atomic():
+        # Subjects none of whose chapters is in an exam any more
+        stale.delete()
+        SubjectCompletion.objects.bulk_create(
+            completions,
+            update_conflicts=True,
+            unique_fields=['subject'],
+            update_fields=['chapters', 'total', 'completed', 'completion_rate', 'updated_at'],
+        )
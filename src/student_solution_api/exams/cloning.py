@@ -0,0 +1,52 @@
+"""
+Server-side copies of exams.
+
+An exam's subject links, chapter rows and their progress events are copied
+with one INSERT ... SELECT per table, inside one transaction, so cloning
+takes the same handful of queries whatever the exam's size. Those
+statements skip the ExamChapter and m2m signals; the new exam's own save
+bumps the owner's data version for all of it.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import Exam, ExamChapter, ProgressEvent
+
+
+def clone_exam(exam, title=None, reset_status=False):
+    """
+    Copy an exam for the same user. With reset_status every chapter starts
+    pending. Returns the new exam and its subject and chapter counts.
+    """
+    subjects = Exam.subjects.through._meta.db_table
+    exam_chapters = ExamChapter._meta.db_table
+    progress_events = ProgressEvent._meta.db_table
+    now = connection.ops.adapt_datetimefield_value(timezone.now())
+
+    with transaction.atomic(), connection.cursor() as cursor:
+        clone = Exam.objects.create(title=title or exam.title, user_id=exam.user_id)
+
+        cursor.execute(
+            f'INSERT INTO {subjects} (exam_id, subject_id) '
+            f'SELECT %s, subject_id FROM {subjects} WHERE exam_id = %s',
+            [clone.pk, exam.pk],
+        )
+        subjects_count = cursor.rowcount
+
+        is_completed = '%s' if reset_status else 'is_completed'
+        cursor.execute(
+            f'INSERT INTO {exam_chapters} (exam_id, chapter_id, is_completed, version, created_at, updated_at) '
+            f'SELECT %s, chapter_id, {is_completed}, 1, %s, %s FROM {exam_chapters} WHERE exam_id = %s',
+            [clone.pk, *([False] if reset_status else []), now, now, exam.pk],
+        )
+        chapters_count = cursor.rowcount
+
+        # See exams.progress: each added chapter is an event.
+        cursor.execute(
+            f'INSERT INTO {progress_events} (exam_id, chapter_id, completed_delta, total_delta, created_at) '
+            f'SELECT exam_id, chapter_id, CASE WHEN is_completed THEN 1 ELSE 0 END, 1, %s '
+            f'FROM {exam_chapters} WHERE exam_id = %s',
+            [now, clone.pk],
+        )
+
+    return clone, subjects_count, chapters_count
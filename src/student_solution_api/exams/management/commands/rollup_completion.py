@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from exams.analytics import rollup_completion
+
+
+class Command(BaseCommand):
+    help = (
+        'Roll chapter changes since the last run up into the cross-user completion summaries. '
+        'Run periodically, e.g. every few minutes, and with --full nightly.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--full', action='store_true', help='Recount every chapter, also catching rows deleted outright.'
+        )
+
+    def handle(self, *args, **options):
+        recounted = rollup_completion(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(f'Recounted {recounted} chapters.'))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from exams.progress import rollup_progress
+
+
+class Command(BaseCommand):
+    help = 'Fold pending chapter progress events into daily progress rows. Run periodically, e.g. every few minutes.'
+
+    def handle(self, *args, **options):
+        folded = rollup_progress()
+        self.stdout.write(self.style.SUCCESS(f'Folded {folded} progress events.'))
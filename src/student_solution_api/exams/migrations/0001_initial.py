@@ -0,0 +1,66 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:53
+#
+# The app used to ship without migrations, so existing databases got its
+# tables from a locally generated one. Delete those local migration files
+# before upgrading. If the database has the tables but no applied
+# 0001_initial for this app, record this one without running it:
+#
+#     python manage.py migrate --fake-initial
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('timetable', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Chapter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('chapter_number', models.PositiveIntegerField()),
+                ('subject', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chapters', to='timetable.subject')),
+            ],
+            options={
+                'ordering': ['subject', 'chapter_number'],
+                'unique_together': {('title', 'chapter_number', 'subject')},
+            },
+        ),
+        migrations.CreateModel(
+            name='Exam',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('subjects', models.ManyToManyField(blank=True, related_name='exams', to='timetable.subject')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exams', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ExamChapter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_completed', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('chapter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exam_chapters', to='exams.chapter')),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='exam_chapters', to='exams.exam')),
+            ],
+            options={
+                'unique_together': {('exam', 'chapter')},
+            },
+        ),
+        migrations.AddField(
+            model_name='exam',
+            name='chapters',
+            field=models.ManyToManyField(related_name='exams', through='exams.ExamChapter', to='exams.chapter'),
+        ),
+    ]
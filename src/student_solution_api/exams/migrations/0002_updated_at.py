@@ -0,0 +1,29 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0001_initial'),
+        ('timetable', '0002_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='exam',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='exam',
+            index=models.Index(fields=['user', 'updated_at'], name='exams_exam_user_id_c2cbb9_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='examchapter',
+            index=models.Index(fields=['exam', 'updated_at'], name='exams_examc_exam_id_1d6cf2_idx'),
+        ),
+    ]
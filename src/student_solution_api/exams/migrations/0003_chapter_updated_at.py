@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0002_updated_at'),
+        ('timetable', '0002_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chapter',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='chapter',
+            index=models.Index(fields=['updated_at'], name='exams_chapt_updated_684113_idx'),
+        ),
+    ]
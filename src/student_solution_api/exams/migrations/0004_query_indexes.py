@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0003_chapter_updated_at'),
+        ('timetable', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='chapter',
+            options={'ordering': ['subject_id', 'chapter_number']},
+        ),
+        migrations.AddIndex(
+            model_name='chapter',
+            index=models.Index(fields=['subject', 'chapter_number'], name='exams_chapt_subject_7c8ffc_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='examchapter',
+            index=models.Index(fields=['exam', 'is_completed'], name='exams_examc_exam_id_6f67a7_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:18
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0004_query_indexes'),
+        ('timetable', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProgressEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('completed_delta', models.SmallIntegerField(default=0)),
+                ('total_delta', models.SmallIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('chapter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='exams.chapter')),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='exams.exam')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='DailyProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('completed', models.PositiveIntegerField()),
+                ('total', models.PositiveIntegerField()),
+                ('exam', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_progress', to='exams.exam')),
+                ('subject', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to='timetable.subject')),
+            ],
+            options={
+                'verbose_name_plural': 'Daily progress',
+                'constraints': [models.UniqueConstraint(fields=('exam', 'subject', 'day'), name='daily_progress_subject_day'), models.UniqueConstraint(condition=models.Q(('subject', None)), fields=('exam', 'day'), name='daily_progress_exam_day')],
+            },
+        ),
+    ]
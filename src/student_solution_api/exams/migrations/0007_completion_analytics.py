@@ -0,0 +1,65 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0006_row_version'),
+        ('timetable', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChapterCompletion',
+            fields=[
+                ('chapter', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='exams.chapter')),
+                ('total', models.PositiveIntegerField()),
+                ('completed', models.PositiveIntegerField()),
+                ('completion_rate', models.FloatField()),
+                ('average_days_to_complete', models.FloatField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CompletionRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('processed_until', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='SubjectCompletion',
+            fields=[
+                ('subject', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='timetable.subject')),
+                ('chapters', models.PositiveIntegerField()),
+                ('total', models.PositiveIntegerField()),
+                ('completed', models.PositiveIntegerField()),
+                ('completion_rate', models.FloatField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='examchapter',
+            index=models.Index(fields=['updated_at'], name='exams_examc_updated_6e9a96_idx'),
+        ),
+        migrations.AddField(
+            model_name='chaptercompletion',
+            name='subject',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='timetable.subject'),
+        ),
+        migrations.AddIndex(
+            model_name='subjectcompletion',
+            index=models.Index(fields=['completion_rate'], name='exams_subje_complet_96f6c8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chaptercompletion',
+            index=models.Index(fields=['completion_rate'], name='exams_chapt_complet_7efe49_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='chaptercompletion',
+            index=models.Index(fields=['subject', 'completion_rate'], name='exams_chapt_subject_462dd3_idx'),
+        ),
+    ]
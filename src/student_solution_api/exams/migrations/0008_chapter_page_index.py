@@ -0,0 +1,22 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0007_completion_analytics'),
+        ('timetable', '0004_subject_updated_at'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='chapter',
+            name='exams_chapt_subject_7c8ffc_idx',
+        ),
+        migrations.AddIndex(
+            model_name='chapter',
+            index=models.Index(fields=['subject', 'chapter_number', 'id'], name='exams_chapt_subject_515679_idx'),
+        ),
+    ]
@@ -7,6 +7,12 @@ class Exam(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='exams')
     subjects = models.ManyToManyField(Subject, related_name='exams', blank=True)
     chapters = models.ManyToManyField('Chapter', through='ExamChapter', related_name='exams')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),
+        ]
 
     def __str__(self):
         return self.title
@@ -34,10 +40,17 @@ class Chapter(models.Model):
     title = models.CharField(max_length=200)
     chapter_number = models.PositiveIntegerField()
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='chapters')
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('title', 'chapter_number', 'subject')
-        ordering = ['subject', 'chapter_number']
+        # By subject id: ordering by "subject" would join Subject for its name.
+        ordering = ['subject_id', 'chapter_number']
+        indexes = [
+            # With the id tie-break, for keyset pages of a subject's chapters
+            models.Index(fields=['subject', 'chapter_number', 'id']),
+            models.Index(fields=['updated_at']),
+        ]
 
     def __str__(self):
         return f"{self.subject.name} - {self.chapter_number}. {self.title}"
@@ -48,11 +61,106 @@ class ExamChapter(models.Model):
     exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name='exam_chapters')
     chapter = models.ForeignKey(Chapter, on_delete=models.CASCADE, related_name='exam_chapters')
     is_completed = models.BooleanField(default=False)
+    # Incremented on every write, for optimistic concurrency (see api.concurrency)
+    version = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = ('exam', 'chapter')
+        indexes = [
+            # Progress counts
+            models.Index(fields=['exam', 'is_completed']),
+            models.Index(fields=['exam', 'updated_at']),
+            # Changes since the completion analytics watermark
+            models.Index(fields=['updated_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.exam.title} - {self.chapter.title}"
+
+class ProgressEvent(models.Model):
+    """
+    A change to an exam's chapter counts: a chapter completed or reopened
+    (completed_delta), added or removed (total_delta). Recorded by the
+    ExamChapter signals and by bulk paths via exams.progress, and folded
+    into DailyProgress by the rollup_progress command.
+    """
+    exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name='+')
+    chapter = models.ForeignKey(Chapter, on_delete=models.CASCADE, related_name='+')
+    completed_delta = models.SmallIntegerField(default=0)
+    total_delta = models.SmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Exam {self.exam_id} chapter {self.chapter_id}: {self.completed_delta:+d}/{self.total_delta:+d}"
+
+
+class DailyProgress(models.Model):
+    """Chapter counts of an exam, or of one subject in it, at the end of a day"""
+    exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name='daily_progress')
+    # Null for the whole exam
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    day = models.DateField()
+    completed = models.PositiveIntegerField()
+    total = models.PositiveIntegerField()
+
+    class Meta:
+        verbose_name_plural = 'Daily progress'
+        constraints = [
+            models.UniqueConstraint(fields=['exam', 'subject', 'day'], name='daily_progress_subject_day'),
+            models.UniqueConstraint(
+                fields=['exam', 'day'], condition=models.Q(subject=None), name='daily_progress_exam_day'
+            ),
+        ]
+
+    def __str__(self):
+        return f"Exam {self.exam_id} on {self.day}: {self.completed}/{self.total}"
+
+
+class ChapterCompletion(models.Model):
+    """Completion of a catalog chapter across all exams, kept by the rollup_completion command"""
+    chapter = models.OneToOneField(Chapter, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    subject = models.ForeignKey(Subject, on_delete=models.CASCADE, related_name='+')
+    # Exams with the chapter, and those where it is completed
+    total = models.PositiveIntegerField()
+    completed = models.PositiveIntegerField()
+    completion_rate = models.FloatField()
+    # From adding the chapter to an exam to its last write while completed
+    average_days_to_complete = models.FloatField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['completion_rate']),
+            models.Index(fields=['subject', 'completion_rate']),
+        ]
+
+    def __str__(self):
+        return f"Chapter {self.chapter_id}: {self.completed}/{self.total}"
+
+
+class SubjectCompletion(models.Model):
+    """Completion of a subject's catalog chapters across all exams, summed from ChapterCompletion"""
+    subject = models.OneToOneField(Subject, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    chapters = models.PositiveIntegerField()
+    total = models.PositiveIntegerField()
+    completed = models.PositiveIntegerField()
+    completion_rate = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['completion_rate']),
+        ]
+
+    def __str__(self):
+        return f"Subject {self.subject_id}: {self.completed}/{self.total}"
+
+
+class CompletionRollup(models.Model):
+    """The completion analytics watermark: ExamChapter changes up to processed_until are rolled up"""
+    processed_until = models.DateTimeField()
 
     def __str__(self):
-        return f"{self.exam.title} - {self.chapter.title}"
\ No newline at end of file
+        return f"Completion rolled up to {self.processed_until}"
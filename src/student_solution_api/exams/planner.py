@@ -0,0 +1,129 @@
+"""
+Study planner: spreads an exam's pending chapters over the upcoming
+timetable periods of their subjects until a target date.
+
+Both steps are linear: build_slots() expands the weekly period grid into
+per-subject lists of dated slots, and allocate() walks each subject's
+chapters once, placing chapter i of n on slot i * m // n of m, so chapters
+are spread evenly and no slot gets more than one chapter above any other.
+Plans are cached under the user's exam and timetable data versions (see
+sync.versions), so a chapter toggle only re-runs the allocation over the
+cached slots, and a timetable change only rebuilds the slots.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.cache import cache
+
+from sync.models import DataVersion
+from sync.versions import get_versions
+from timetable.models import Day, Timetable, Period
+from .models import ExamChapter
+
+
+PLAN_CACHE_SECONDS = 24 * 60 * 60
+
+WEEKDAY_INDEX = {name: index for index, (name, _) in enumerate(Day.WEEKDAYS)}
+
+
+def get_plan(exam, start, until):
+    """The exam's study plan from start to until (inclusive), cached."""
+    versions = get_versions(exam.user_id, [DataVersion.EXAMS, DataVersion.TIMETABLE, DataVersion.CATALOG])
+    plan_key = (
+        f'plan:{exam.pk}:{start}:{until}:{versions[DataVersion.EXAMS]}:{versions[DataVersion.TIMETABLE]}'
+        f':{versions[DataVersion.CATALOG]}'
+    )
+    plan = cache.get(plan_key)
+    if plan is None:
+        slots_key = f'plan-slots:{exam.user_id}:{start}:{until}:{versions[DataVersion.TIMETABLE]}'
+        slots = cache.get(slots_key)
+        if slots is None:
+            slots = build_slots(get_periods(exam.user_id), start, until)
+            cache.set(slots_key, slots, PLAN_CACHE_SECONDS)
+        plan = allocate(get_pending_chapters(exam), slots)
+        cache.set(plan_key, plan, PLAN_CACHE_SECONDS)
+    return plan
+
+
+def get_periods(user_id):
+    """(weekday, order, subject id) of the user's timetable, as manage_timetable picks it."""
+    timetable = Timetable.objects.filter(user_id=user_id).values_list('id', flat=True).first()
+    if timetable is None:
+        return []
+    return [
+        (WEEKDAY_INDEX[day_name], order, subject_id)
+        for day_name, order, subject_id in Period.objects.filter(timetable_id=timetable).values_list(
+            'day__name', 'order', 'subject_id'
+        )
+    ]
+
+
+def get_pending_chapters(exam):
+    return ExamChapter.objects.filter(exam=exam, is_completed=False).order_by(
+        'chapter__subject_id', 'chapter__chapter_number', 'chapter_id'
+    ).values_list(
+        'chapter__subject_id', 'chapter__subject__name', 'chapter_id', 'chapter__title', 'chapter__chapter_number'
+    )
+
+
+def build_slots(periods, start, until):
+    """Dated (day, order) slots per subject id for the weekly periods, in time order."""
+    periods_by_weekday = defaultdict(list)
+    for weekday, order, subject_id in sorted(periods):
+        periods_by_weekday[weekday].append((order, subject_id))
+
+    slots = defaultdict(list)
+    day = start
+    while day <= until:
+        for order, subject_id in periods_by_weekday.get(day.weekday(), ()):
+            slots[subject_id].append((day, order))
+        day += timedelta(days=1)
+    return dict(slots)
+
+
+def allocate(pending_chapters, slots):
+    """
+    Spread pending chapters, ordered by subject and chapter number, over
+    their subjects' slots. Chapters of subjects without slots are returned
+    as unscheduled.
+    """
+    chapters_by_subject = defaultdict(list)
+    subject_names = {}
+    for subject_id, subject_name, chapter_id, title, chapter_number in pending_chapters:
+        subject_names[subject_id] = subject_name
+        chapters_by_subject[subject_id].append({'id': chapter_id, 'title': title, 'chapter_number': chapter_number})
+
+    sessions = []
+    unscheduled = []
+    subjects = []
+    for subject_id, chapters in chapters_by_subject.items():
+        subject_slots = slots.get(subject_id, [])
+        subjects.append({
+            'id': subject_id,
+            'name': subject_names[subject_id],
+            'pending_chapters': len(chapters),
+            'periods': len(subject_slots),
+        })
+        if not subject_slots:
+            unscheduled.extend(chapters)
+            continue
+
+        slot_count = len(subject_slots)
+        subject_sessions = {}
+        for index, chapter in enumerate(chapters):
+            slot = subject_slots[index * slot_count // len(chapters)]
+            session = subject_sessions.get(slot)
+            if session is None:
+                session = subject_sessions[slot] = {
+                    'date': slot[0],
+                    'order': slot[1],
+                    'subject_id': subject_id,
+                    'subject_name': subject_names[subject_id],
+                    'chapters': [],
+                }
+            session['chapters'].append(chapter)
+        sessions.extend(subject_sessions.values())
+
+    sessions.sort(key=lambda session: (session['date'], session['order']))
+    subjects.sort(key=lambda subject: subject['name'])
+    return {'subjects': subjects, 'sessions': sessions, 'unscheduled': unscheduled}
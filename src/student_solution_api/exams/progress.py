@@ -0,0 +1,119 @@
+"""
+Progress history of exams.
+
+Every change to an exam's chapter counts is recorded as a ProgressEvent.
+The ExamChapter signals record single saves and deletes; code that writes
+ExamChapter rows with bulk_create(), queryset update() or raw SQL must call
+record_progress() itself. rollup_progress() (run periodically by the
+rollup_progress command) folds pending events into DailyProgress rows, one
+per exam, and per subject of it, for each day with changes.
+
+One rollup runs at a time: on PostgreSQL a run that finds another holding
+the rollup's advisory lock folds nothing, instead of folding the same
+events a second time. SQLite does not let an overlapping run write the
+tables the first one read, and fails it with an error instead.
+"""
+from collections import defaultdict
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .models import ExamChapter, ProgressEvent, DailyProgress
+
+
+def record_progress(events):
+    """Save unsaved ProgressEvents in one query."""
+    ProgressEvent.objects.bulk_create(events)
+
+
+DELETE_BATCH_SIZE = 500
+
+# pg_try_advisory_xact_lock key held by a running rollup
+ROLLUP_LOCK_ID = 0x70726f67
+
+
+def lock_rollup():
+    """Take the rollup lock for the current transaction. Returns False if another run holds it."""
+    if connection.vendor != 'postgresql':
+        return True
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_try_advisory_xact_lock(%s)', [ROLLUP_LOCK_ID])
+        return cursor.fetchone()[0]
+
+
+def rollup_progress():
+    """
+    Fold pending ProgressEvents into DailyProgress rows. Returns the number
+    of events folded: 0 when another rollup is running.
+    """
+    with transaction.atomic():
+        if not lock_rollup():
+            return 0
+
+        # Read the events once and delete exactly those: events committed
+        # while this runs wait for the next rollup instead of being deleted
+        # unfolded.
+        events = list(ProgressEvent.objects.order_by('id').values_list(
+            'id', 'exam_id', 'chapter__subject_id', 'created_at', 'completed_delta', 'total_delta'
+        ))
+        if not events:
+            return 0
+
+        # Deltas per (exam, subject) and day; subject None for the whole exam.
+        deltas = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+        for _, exam_id, subject_id, created_at, completed, total in events:
+            day = timezone.localdate(created_at)
+            for key in ((exam_id, subject_id), (exam_id, None)):
+                delta = deltas[key][day]
+                delta[0] += completed
+                delta[1] += total
+
+        for (exam_id, subject_id), days in deltas.items():
+            fold_days(exam_id, subject_id, days)
+
+        ids = [event[0] for event in events]
+        for start in range(0, len(ids), DELETE_BATCH_SIZE):
+            ProgressEvent.objects.filter(id__in=ids[start:start + DELETE_BATCH_SIZE]).delete()
+        return len(events)
+
+
+def fold_days(exam_id, subject_id, days):
+    rows = DailyProgress.objects.filter(exam_id=exam_id, subject_id=subject_id)
+    baseline = None
+    if not rows.exists():
+        # First rollup: chapters that predate event recording have no events,
+        # so start from the current counts minus the pending changes.
+        completed, total = current_counts(exam_id, subject_id)
+        baseline = (
+            completed - sum(delta[0] for delta in days.values()),
+            total - sum(delta[1] for delta in days.values()),
+        )
+    else:
+        # Days before every rolled-up one start from the earliest of those
+        # less their changes, which the loop below adds back.
+        first = rows.order_by('day').values_list('day', 'completed', 'total')[0]
+        earlier = [delta for day, delta in days.items() if day < first[0]]
+        baseline = (
+            first[1] - sum(delta[0] for delta in earlier),
+            first[2] - sum(delta[1] for delta in earlier),
+        )
+
+    for day in sorted(days):
+        if not rows.filter(day=day).exists():
+            # Start the day from the closest earlier day, or the baseline.
+            previous = rows.filter(day__lt=day).order_by('-day').values_list('completed', 'total').first()
+            completed, total = previous or baseline
+            rows.create(exam_id=exam_id, subject_id=subject_id, day=day, completed=completed, total=total)
+
+        # The change also carries into any later days already rolled up.
+        completed, total = days[day]
+        rows.filter(day__gte=day).update(completed=F('completed') + completed, total=F('total') + total)
+
+
+def current_counts(exam_id, subject_id):
+    exam_chapters = ExamChapter.objects.filter(exam_id=exam_id)
+    if subject_id is not None:
+        exam_chapters = exam_chapters.filter(chapter__subject_id=subject_id)
+    counts = exam_chapters.aggregate(completed=Count('id', filter=Q(is_completed=True)), total=Count('id'))
+    return counts['completed'], counts['total']
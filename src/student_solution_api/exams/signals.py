@@ -0,0 +1,93 @@
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from sync.models import DataVersion, Tombstone
+from sync.tombstones import record_deletion
+from sync.versions import bump_version, deleted_via
+from timetable.models import Subject
+from .models import Exam, Chapter, ExamChapter, ProgressEvent
+
+
+@receiver(post_save, sender=Chapter)
+def chapter_saved(sender, instance, **kwargs):
+    # Exams embed chapter titles.
+    bump_version(None, DataVersion.CATALOG)
+
+
+@receiver(post_delete, sender=Chapter)
+def chapter_deleted(sender, instance, origin=None, **kwargs):
+    # Cascades from subjects are covered by their signal.
+    if not deleted_via(origin, Subject):
+        bump_version(None, DataVersion.CATALOG)
+
+
+@receiver(post_save, sender=Exam)
+def exam_saved(sender, instance, **kwargs):
+    bump_version(instance.user_id, DataVersion.EXAMS)
+
+
+@receiver(post_delete, sender=Exam)
+def exam_deleted(sender, instance, origin=None, **kwargs):
+    if not deleted_via(origin, User):
+        bump_version(instance.user_id, DataVersion.EXAMS)
+        record_deletion(instance.user_id, Tombstone.EXAM, instance.pk)
+
+
+@receiver(m2m_changed, sender=Exam.subjects.through)
+def exam_subjects_changed(sender, instance, action, reverse, **kwargs):
+    if action.startswith('post_') and not reverse:
+        # The subject list is part of the exam for sync clients.
+        Exam.objects.filter(pk=instance.pk).update(updated_at=timezone.now())
+        bump_version(instance.user_id, DataVersion.EXAMS)
+
+
+@receiver(post_init, sender=ExamChapter)
+def exam_chapter_loaded(sender, instance, **kwargs):
+    # The stored status, to tell on save whether it changed.
+    instance._saved_is_completed = instance.__dict__.get('is_completed') if instance.pk else None
+
+
+@receiver(pre_save, sender=ExamChapter)
+def exam_chapter_saving(sender, instance, update_fields=None, **kwargs):
+    # Queryset writes use api.concurrency.versioned_update instead. Incremented
+    # in SQL, so a stale instance cannot write back a version another write
+    # already reached; the saved signal reads the result back.
+    if not instance._state.adding and (update_fields is None or 'version' in update_fields):
+        instance.version = F('version') + 1
+
+
+@receiver(post_save, sender=ExamChapter)
+def exam_chapter_saved(sender, instance, created, using, **kwargs):
+    if hasattr(instance.version, 'resolve_expression'):
+        instance.refresh_from_db(using=using, fields=['version'])
+    bump_version(instance.exam.user_id, DataVersion.EXAMS)
+
+    if created:
+        ProgressEvent.objects.create(
+            exam_id=instance.exam_id, chapter_id=instance.chapter_id,
+            completed_delta=int(instance.is_completed), total_delta=1,
+        )
+    elif instance._saved_is_completed is not None and instance.is_completed != instance._saved_is_completed:
+        ProgressEvent.objects.create(
+            exam_id=instance.exam_id, chapter_id=instance.chapter_id,
+            completed_delta=1 if instance.is_completed else -1,
+        )
+    instance._saved_is_completed = instance.is_completed
+
+
+@receiver(post_delete, sender=ExamChapter)
+def exam_chapter_deleted(sender, instance, origin=None, **kwargs):
+    # Cascades from exams are covered by exam_deleted.
+    if not deleted_via(origin, Exam, User):
+        user_id = instance.exam.user_id
+        bump_version(user_id, DataVersion.EXAMS)
+        record_deletion(user_id, Tombstone.EXAM_CHAPTER, instance.pk)
+        # A cascade from the chapter or its subject deletes the chapter's events too.
+        if not deleted_via(origin, Chapter, Subject):
+            ProgressEvent.objects.create(
+                exam_id=instance.exam_id, chapter_id=instance.chapter_id,
+                completed_delta=-int(instance.is_completed), total_delta=-1,
+            )
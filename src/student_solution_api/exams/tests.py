@@ -1,3 +1,760 @@
-from django.test import TestCase
+import base64
+import threading
+from datetime import date, timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import OperationalError, connection, connections
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v1.exams.serializers import ExamListSerializer, ExamSerializer, ExamSummarySerializer
+from exams.analytics import rollup_completion
+from exams.models import (
+    Exam, Chapter, ExamChapter, ProgressEvent, DailyProgress, ChapterCompletion, SubjectCompletion
+)
+from exams.planner import allocate, build_slots
+from exams import progress
+from exams.progress import rollup_progress
+from student_solution_api.deletion import delete_exam
+from timetable.models import Subject, Day, Timetable, Period
+
+
+@skipUnless('replica' in settings.DATABASES, 'needs the "replica" database alias (DB_ENGINE=sqlite)')
+@override_settings(DATABASE_REPLICAS=['replica'])
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = {'default', 'replica'}
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.exam = Exam.objects.create(title='Finals', user=self.user)
+        subject = Subject.objects.create(name='Physics')
+        self.exam.subjects.add(subject)
+        self.chapter = Chapter.objects.create(title='Optics', chapter_number=1, subject=subject)
+        ExamChapter.objects.create(exam=self.exam, chapter=self.chapter)
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(self.user)}')
+        self.url = f'/api/v1/exams/manage/{self.exam.id}/'
+
+    def get_exam(self):
+        with CaptureQueriesContext(connections['default']) as primary, \
+                CaptureQueriesContext(connections['replica']) as replica:
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return len(primary), len(replica)
+
+    def test_get_reads_from_replica(self):
+        primary_queries, replica_queries = self.get_exam()
+        self.assertEqual(primary_queries, 0)
+        self.assertGreater(replica_queries, 0)
+
+    def test_reads_stick_to_primary_after_write(self):
+        response = self.client.patch(
+            self.url, {'chapter_id': self.chapter.id, 'is_completed': True}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+
+        primary_queries, replica_queries = self.get_exam()
+        self.assertGreater(primary_queries, 0)
+        self.assertEqual(replica_queries, 0)
+
+    def test_pin_expires(self):
+        self.client.patch(self.url, {'chapter_id': self.chapter.id, 'is_completed': True}, format='json')
+        cache.clear()
+
+        primary_queries, replica_queries = self.get_exam()
+        self.assertEqual(primary_queries, 0)
+        self.assertGreater(replica_queries, 0)
+
+    def test_basic_auth_reads_from_primary(self):
+        # The user behind Basic credentials is unknown until the view runs,
+        # so its pin can't be checked.
+        self.client.credentials(HTTP_AUTHORIZATION=f'Basic {base64.b64encode(b"student:secret").decode()}')
+        primary_queries, replica_queries = self.get_exam()
+        self.assertGreater(primary_queries, 0)
+        self.assertEqual(replica_queries, 0)
+
+
+def legacy_exam_representation(exam):
+    """The exam tree as ExamSerializer built it from model instances"""
+    subjects_dict = {}
+    for exam_chapter in exam.exam_chapters.select_related('chapter', 'chapter__subject'):
+        subject = exam_chapter.chapter.subject
+        subjects_dict.setdefault(subject, []).append({
+            'id': exam_chapter.chapter.id,
+            'title': exam_chapter.chapter.title,
+            'chapter_number': exam_chapter.chapter.chapter_number,
+            'is_completed': exam_chapter.is_completed,
+            'version': exam_chapter.version
+        })
+
+    subjects_data = []
+    for subject, chapters in subjects_dict.items():
+        completed = sum(1 for ch in chapters if ch['is_completed'])
+        chapters.sort(key=lambda x: x['chapter_number'])
+        subjects_data.append({
+            'id': subject.id,
+            'name': subject.name,
+            'progress': round((completed / len(chapters)) * 100),
+            'chapters': chapters
+        })
+    subjects_data.sort(key=lambda x: x['name'])
+
+    return {'id': exam.id, 'title': exam.title, 'progress': exam.progress, 'subjects': subjects_data}
+
+
+class ExamSerializerTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='student', password='secret')
+        self.exam = Exam.objects.create(title='Finals', user=user)
+        for name in ('Physics', 'Chemistry', 'Biology'):
+            subject = Subject.objects.create(name=name)
+            self.exam.subjects.add(subject)
+            for number in range(25, 0, -1):
+                chapter = Chapter.objects.create(title=f'{name} {number}', chapter_number=number, subject=subject)
+                ExamChapter.objects.create(exam=self.exam, chapter=chapter, is_completed=number % 3 == 0)
+
+    def test_representation_matches_instance_path(self):
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(ExamSerializer(self.exam).data),
+            renderer.render(legacy_exam_representation(self.exam)),
+        )
+
+    def test_representation_is_one_query(self):
+        with self.assertNumQueries(1):
+            ExamSerializer(self.exam).data
+
+    def test_empty_exam(self):
+        exam = Exam.objects.create(title='Empty', user=self.exam.user)
+        self.assertEqual(
+            ExamSerializer(exam).data,
+            {'id': exam.id, 'title': 'Empty', 'progress': 0, 'subjects': []},
+        )
+
+    def test_sparse_fields(self):
+        with self.assertNumQueries(0):
+            data = ExamSerializer(self.exam, fields=['id', 'title']).data
+        self.assertEqual(data, {'id': self.exam.id, 'title': 'Finals'})
+        # Progress alone is one count query, not the chapter tree.
+        with self.assertNumQueries(1):
+            data = ExamSerializer(self.exam, fields=['progress']).data
+        self.assertEqual(data, {'progress': self.exam.progress})
+
+
+class ExamFieldsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        physics, biology = Subject.objects.create(name='Physics'), Subject.objects.create(name='Biology')
+        for title in ('Mocks', 'Finals', 'Empty'):
+            exam = Exam.objects.create(title=title, user=self.user)
+            if title == 'Empty':
+                continue
+            exam.subjects.add(physics, biology)
+            for number in range(1, 5):
+                chapter = Chapter.objects.create(title=f'{title} {number}', chapter_number=number, subject=physics)
+                ExamChapter.objects.create(exam=exam, chapter=chapter, is_completed=number % 2 == 0)
+
+    def test_list_matches_instance_path(self):
+        exams = Exam.objects.filter(user=self.user).order_by('-id')
+        with self.assertNumQueries(1):
+            data = ExamListSerializer(exams, many=True).data
+        self.assertEqual(data, ExamListSerializer(list(exams), many=True).data)
+
+    def test_list_fields_and_expand(self):
+        response = self.client.get('/api/v1/exams/view/', {'fields': 'id,title'})
+        self.assertEqual([list(exam) for exam in response.data['data']], [['id', 'title']] * 3)
+
+        response = self.client.get('/api/v1/exams/view/', {'fields': 'title,progress', 'expand': 'subjects'})
+        self.assertEqual(response.data['data'][1], {
+            'title': 'Finals',
+            'progress': 50,
+            'subjects': [
+                {'id': Subject.objects.get(name='Biology').id, 'name': 'Biology'},
+                {'id': Subject.objects.get(name='Physics').id, 'name': 'Physics'},
+            ],
+        })
+        self.assertEqual(response.data['data'][0]['subjects'], [])
+
+    def test_unknown_fields(self):
+        response = self.client.get('/api/v1/exams/view/', {'fields': 'id,owner', 'expand': 'chapters'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data['errors']), {'fields', 'expand'})
+
+        exam = Exam.objects.get(title='Finals')
+        response = self.client.get(f'/api/v1/exams/manage/{exam.id}/', {'expand': 'subjects'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(f'/api/v1/exams/manage/{exam.id}/', {'fields': 'id,progress'})
+        self.assertEqual(response.data['data'], {'id': exam.id, 'progress': 50})
+
+
+class SubjectChaptersTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.exam = Exam.objects.create(title='Finals', user=self.user)
+        self.physics, self.biology = Subject.objects.create(name='Physics'), Subject.objects.create(name='Biology')
+        self.exam.subjects.add(self.physics, self.biology)
+        for subject, count in ((self.physics, 7), (self.biology, 2)):
+            # Two chapters share each number, so the id breaks ties.
+            for number in range(count):
+                chapter = Chapter.objects.create(title=f'{subject.name} {number}', chapter_number=number // 2,
+                                                 subject=subject)
+                ExamChapter.objects.create(exam=self.exam, chapter=chapter, is_completed=number < 2)
+
+    def test_summary(self):
+        with self.assertNumQueries(1):
+            data = ExamSummarySerializer(self.exam).data
+        self.assertEqual(data, {
+            'id': self.exam.id,
+            'title': 'Finals',
+            'progress': 44,
+            'subjects': [
+                {'id': self.biology.id, 'name': 'Biology', 'progress': 100, 'total_chapters': 2,
+                 'completed_chapters': 2},
+                {'id': self.physics.id, 'name': 'Physics', 'progress': 29, 'total_chapters': 7,
+                 'completed_chapters': 2},
+            ],
+        })
+        response = self.client.get(f'/api/v1/exams/manage/{self.exam.id}/', {'summary': 'true'})
+        self.assertEqual(response.data['data'], data)
+
+    def test_keyset_pages(self):
+        url = f'/api/v1/exams/manage/{self.exam.id}/subjects/{self.physics.id}/chapters/'
+        expected = list(
+            self.exam.exam_chapters.filter(chapter__subject=self.physics)
+            .order_by('chapter__chapter_number', 'chapter_id').values_list('chapter_id', flat=True)
+        )
+        pages, params = [], {'limit': 3}
+        while True:
+            data = self.client.get(url, params).data['data']
+            pages.append([chapter['id'] for chapter in data['chapters']])
+            if data['next_after'] is None:
+                break
+            params['after'] = data['next_after']
+        self.assertEqual([len(page) for page in pages], [3, 3, 1])
+        self.assertEqual(sum(pages, []), expected)
+
+    def test_invalid_requests(self):
+        url = f'/api/v1/exams/manage/{self.exam.id}/subjects/'
+        self.assertEqual(self.client.get(f'{url}{self.physics.id}/chapters/', {'after': '3'}).status_code, 400)
+        self.assertEqual(self.client.get(f'{url}{self.physics.id}/chapters/', {'limit': 0}).status_code, 400)
+        other = Subject.objects.create(name='Chemistry')
+        self.assertEqual(self.client.get(f'{url}{other.id}/chapters/').status_code, 404)
+
+
+class ChapterCatalogTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.physics = Subject.objects.create(name='Physics')
+        self.chapters = [
+            Chapter.objects.create(title=f'Physics {number}', chapter_number=number, subject=self.physics)
+            for number in range(1, 4)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_catalog_etag(self):
+        response = self.client.get('/api/v1/exams/chapters/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [chapter['id'] for chapter in response.json()['data'][0]['chapters']],
+            [chapter.id for chapter in self.chapters],
+        )
+
+        etag = response['ETag']
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/v1/exams/chapters/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        Chapter.objects.create(title='Physics 4', chapter_number=4, subject=self.physics)
+        response = self.client.get('/api/v1/exams/chapters/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data'][0]['chapters']), 4)
+
+        etag = response['ETag']
+        self.physics.name = 'Applied Physics'
+        self.physics.save()
+        response = self.client.get('/api/v1/exams/chapters/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data'][0]['name'], 'Applied Physics')
+
+    def test_create_and_extend_exam_from_chapter_ids(self):
+        response = self.client.post('/api/v1/exams/create/', {
+            'title': 'Finals', 'chapter_ids': [chapter.id for chapter in self.chapters[:2]],
+        }, format='json')
+        self.assertEqual(response.status_code, 201)
+        data = response.json()['data']
+        self.assertEqual([subject['id'] for subject in data['subjects']], [self.physics.id])
+        self.assertEqual(len(data['subjects'][0]['chapters']), 2)
+
+        exam = Exam.objects.get(id=data['id'])
+        etag = self.client.get(f'/api/v1/exams/manage/{exam.id}/')['ETag']
+        response = self.client.patch(f'/api/v1/exams/manage/{exam.id}/', {
+            'chapter_ids': [chapter.id for chapter in self.chapters],
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(exam.exam_chapters.count(), 3)
+        self.assertNotEqual(self.client.get(f'/api/v1/exams/manage/{exam.id}/')['ETag'], etag)
+
+    def test_create_with_chapters_writes_in_bulk(self):
+        chapters = [{'title': f'Waves {number}', 'chapter_number': number, 'is_completed': number == 1}
+                    for number in range(1, 11)]
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.post('/api/v1/exams/create/', {
+                'title': 'Finals', 'subjects': [{'name': 'Physics', 'chapters': chapters}],
+            }, format='json')
+        self.assertEqual(response.status_code, 201)
+        inserts = [query['sql'] for query in queries if query['sql'].startswith('INSERT INTO "exams_examchapter"')]
+        self.assertEqual(len(inserts), 1)
+        exam = Exam.objects.get(id=response.json()['data']['id'])
+        self.assertEqual(
+            sorted(ProgressEvent.objects.filter(exam=exam).values_list('completed_delta', 'total_delta')),
+            [(0, 1)] * 9 + [(1, 1)],
+        )
+
+    def test_unknown_chapter_ids(self):
+        response = self.client.post('/api/v1/exams/create/', {
+            'title': 'Finals', 'chapter_ids': [self.chapters[0].id, 999999],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('999999', str(response.json()['errors']['chapter_ids']))
+        self.assertFalse(Exam.objects.exists())
+
+
+class AdminChangelistTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser(username='admin', password='secret')
+        self.client.force_login(self.admin)
+        self.subject = Subject.objects.create(name='Physics')
+        self.day = Day.objects.create(name='monday')
+
+    def add_rows(self, count):
+        for index in range(count):
+            user = User.objects.create_user(username=f'student{User.objects.count()}')
+            exam = Exam.objects.create(title='Finals', user=user)
+            exam.subjects.add(self.subject)
+            chapter = Chapter.objects.create(title=f'Optics {user.id}', chapter_number=1, subject=self.subject)
+            ExamChapter.objects.create(exam=exam, chapter=chapter, is_completed=index % 2 == 0)
+            timetable = Timetable.objects.create(user=user, name='Term 1')
+            Period.objects.create(timetable=timetable, day=self.day, order=1, subject=self.subject)
+
+    def count_queries(self, url):
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_changelists_run_constant_queries(self):
+        urls = [
+            '/admin/exams/exam/', '/admin/exams/examchapter/', '/admin/exams/chapter/',
+            '/admin/timetable/period/', '/admin/timetable/timetable/', '/admin/homeworks/homework/',
+        ]
+        self.add_rows(2)
+        before = [self.count_queries(url) for url in urls]
+        self.add_rows(8)
+        self.assertEqual([self.count_queries(url) for url in urls], before)
+
+    def test_exam_annotations_and_id_range_filter(self):
+        self.add_rows(3)
+        exams = list(Exam.objects.order_by('id'))
+        response = self.client.get(
+            '/admin/exams/exam/', {'user__id__gte': exams[1].user_id, 'user__id__lte': ''}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([exam.id for exam in response.context['cl'].result_list], [exams[2].id, exams[1].id])
+        self.assertEqual(response.context['cl'].result_list[0].total_chapters, 1)
+        self.assertContains(response, 'name="user__id__gte"')
+
+
+class ProgressHistoryTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.physics = Subject.objects.create(name='Physics')
+        self.exam = Exam.objects.create(title='Finals', user=self.user)
+        self.exam.subjects.add(self.physics)
+        self.chapters = [
+            Chapter.objects.create(title=f'Optics {number}', chapter_number=number, subject=self.physics)
+            for number in range(1, 5)
+        ]
+        # Chapters from before progress events were recorded
+        ExamChapter.objects.bulk_create([
+            ExamChapter(exam=self.exam, chapter=chapter, is_completed=chapter.chapter_number == 1)
+            for chapter in self.chapters
+        ])
+        self.url = f'/api/v1/exams/manage/{self.exam.id}/'
+
+    def complete(self, *chapters):
+        response = self.client.patch(self.url, {'chapters': [
+            {'chapter_id': chapter.id, 'is_completed': True} for chapter in chapters
+        ]}, format='json')
+        self.assertEqual(response.status_code, 200)
+
+    def test_daily_rollups(self):
+        today = timezone.localdate()
+        self.complete(self.chapters[1])
+        ProgressEvent.objects.update(created_at=timezone.now() - timedelta(days=1))
+        self.complete(self.chapters[1], self.chapters[2])
+        chemistry = Subject.objects.create(name='Chemistry')
+        chapter = Chapter.objects.create(title='Acids', chapter_number=1, subject=chemistry)
+        self.client.patch(self.url, {'chapter_ids': [chapter.id]}, format='json')
+
+        self.assertEqual(rollup_progress(), 3)
+        self.assertFalse(ProgressEvent.objects.exists())
+        self.assertEqual(rollup_progress(), 0)
+
+        response = self.client.get(f'{self.url}progress/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(point['day'], point['completed'], point['total']) for point in response.json()['data']['points']],
+            [(str(today - timedelta(days=1)), 2, 4), (str(today), 3, 5)],
+        )
+
+        response = self.client.get(f'{self.url}progress/', {'subject': chemistry.id, 'from': str(today)})
+        self.assertEqual(
+            [(point['completed'], point['total']) for point in response.json()['data']['points']], [(0, 1)]
+        )
+
+    def test_later_events_carry_forward(self):
+        self.complete(self.chapters[1])
+        rollup_progress()
+        ExamChapter.objects.get(exam=self.exam, chapter=self.chapters[0]).delete()
+        rollup_progress()
+
+        row = DailyProgress.objects.get(exam=self.exam, subject=None)
+        self.assertEqual((row.completed, row.total), (1, 3))
+        self.assertEqual(
+            DailyProgress.objects.filter(exam=self.exam, subject=self.physics).values_list('completed', 'total').get(),
+            (1, 3),
+        )
+
+    def test_late_events_before_rolled_up_days(self):
+        today = timezone.localdate()
+        self.complete(self.chapters[1])
+        rollup_progress()
+        self.complete(self.chapters[2])
+        ProgressEvent.objects.update(created_at=timezone.now() - timedelta(days=2))
+        rollup_progress()
+
+        self.assertEqual(
+            list(DailyProgress.objects.filter(exam=self.exam, subject=None).order_by('day').values_list(
+                'day', 'completed', 'total'
+            )),
+            [(today - timedelta(days=2), 2, 4), (today, 3, 4)],
+        )
+
+    def test_events_recorded_during_rollup_are_kept(self):
+        self.complete(self.chapters[1])
+        fold_days = progress.fold_days
+
+        def fold_and_record(*args):
+            fold_days(*args)
+            if not ProgressEvent.objects.filter(chapter=self.chapters[2]).exists():
+                ProgressEvent.objects.create(exam=self.exam, chapter=self.chapters[2], completed_delta=1)
+
+        with mock.patch('exams.progress.fold_days', fold_and_record):
+            self.assertEqual(rollup_progress(), 1)
+        self.assertEqual(ProgressEvent.objects.get().chapter_id, self.chapters[2].id)
+
+    def test_invalid_range(self):
+        response = self.client.get(f'{self.url}progress/', {'from': '2025-13-01'})
+        self.assertEqual(response.status_code, 400)
+
+
+class OverlappingRollupTests(TransactionTestCase):
+    def test_overlapping_rollups_fold_once(self):
+        user = User.objects.create_user(username='student', password='secret')
+        exam = Exam.objects.create(title='Finals', user=user)
+        physics = Subject.objects.create(name='Physics')
+        chapter = Chapter.objects.create(title='Optics', chapter_number=1, subject=physics)
+        ExamChapter.objects.create(exam=exam, chapter=chapter, is_completed=True)
+
+        # The first run stops after reading the events until the second has run.
+        reading, resume, results = threading.Event(), threading.Event(), []
+        fold_days = progress.fold_days
+
+        def paused_fold(*args):
+            reading.set()
+            resume.wait(10)
+            fold_days(*args)
+
+        def first_run():
+            try:
+                results.append(rollup_progress())
+            finally:
+                connection.close()
+
+        with mock.patch('exams.progress.fold_days', paused_fold):
+            thread = threading.Thread(target=first_run)
+            thread.start()
+            self.assertTrue(reading.wait(10))
+        try:
+            if connection.vendor == 'postgresql':
+                # The advisory lock is taken: nothing to fold.
+                self.assertEqual(rollup_progress(), 0)
+            else:
+                # SQLite refuses the second writer instead.
+                with self.assertRaises(OperationalError):
+                    rollup_progress()
+        finally:
+            resume.set()
+            thread.join()
+
+        self.assertEqual(results, [1])
+        self.assertFalse(ProgressEvent.objects.exists())
+        self.assertEqual(DailyProgress.objects.get(exam=exam, subject=None).completed, 1)
+
+
+class StudyPlanTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.physics = Subject.objects.create(name='Physics')
+        self.exam = Exam.objects.create(title='Finals', user=self.user)
+        for number in range(1, 7):
+            chapter = Chapter.objects.create(title=f'Optics {number}', chapter_number=number, subject=self.physics)
+            ExamChapter.objects.create(exam=self.exam, chapter=chapter)
+        timetable = Timetable.objects.create(user=self.user, name='Term 1')
+        for name, _ in Day.WEEKDAYS[:5]:
+            Period.objects.create(timetable=timetable, day=Day.objects.create(name=name), order=1, subject=self.physics)
+        self.url = f'/api/v1/exams/manage/{self.exam.id}/plan/'
+        self.until = str(timezone.localdate() + timedelta(days=13))
+
+    def test_allocation_is_balanced(self):
+        # Monday 2030-01-07 to Sunday 2030-01-13: five weekday slots.
+        periods = [(0, 1, 1), (2, 1, 1), (4, 1, 1), (1, 2, 1), (3, 2, 1)]
+        slots = build_slots(periods, date(2030, 1, 7), date(2030, 1, 13))
+        chapters = [(1, 'Physics', number, f'Chapter {number}', number) for number in range(1, 13)]
+        plan = allocate(chapters, slots)
+        self.assertEqual([len(session['chapters']) for session in plan['sessions']], [3, 2, 3, 2, 2])
+        self.assertEqual(
+            [chapter['chapter_number'] for session in plan['sessions'] for chapter in session['chapters']],
+            list(range(1, 13)),
+        )
+        self.assertEqual(allocate(chapters, {})['unscheduled'][0]['id'], 1)
+
+    def test_plan_follows_progress_and_timetable(self):
+        response = self.client.get(self.url, {'until': self.until})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()['data']
+        self.assertEqual(
+            data['subjects'], [{'id': self.physics.id, 'name': 'Physics', 'pending_chapters': 6, 'periods': 10}]
+        )
+        self.assertEqual(len(data['sessions']), 6)
+
+        # Cached: only the exam lookup and the version lookup.
+        with self.assertNumQueries(2):
+            self.client.get(self.url, {'until': self.until})
+
+        chapter_id = data['sessions'][0]['chapters'][0]['id']
+        self.client.patch(
+            f'/api/v1/exams/manage/{self.exam.id}/', {'chapter_id': chapter_id, 'is_completed': True}, format='json'
+        )
+        data = self.client.get(self.url, {'until': self.until}).json()['data']
+        self.assertEqual(data['subjects'][0]['pending_chapters'], 5)
+
+        saturday = Day.objects.create(name='saturday')
+        self.client.put('/api/v1/timetable/manage/', {'days': [
+            {'id': saturday.id, 'periods': [{'order': 1, 'subject': 'Physics'}]},
+        ]}, format='json')
+        self.assertEqual(self.client.get(self.url, {'until': self.until}).json()['data']['subjects'][0]['periods'], 12)
+
+    def test_invalid_target_date(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {'until': '2000-01-01'}).status_code, 400)
+
+
+class ExamCloneTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.exam = Exam.objects.create(title='Unit test', user=self.user)
+
+    def add_chapters(self, count):
+        subject = Subject.objects.create(name=f'Subject {Subject.objects.count()}')
+        self.exam.subjects.add(subject)
+        chapters = Chapter.objects.bulk_create([
+            Chapter(title=f'Chapter {number}', chapter_number=number, subject=subject)
+            for number in range(1, count + 1)
+        ])
+        ExamChapter.objects.bulk_create([
+            ExamChapter(exam=self.exam, chapter=chapter, is_completed=chapter.chapter_number % 2 == 0)
+            for chapter in chapters
+        ])
+
+    def clone(self, **data):
+        with CaptureQueriesContext(connections['default']) as queries:
+            response = self.client.patch(
+                f'/api/v1/exams/manage/{self.exam.id}/', {'action': 'clone', **data}, format='json'
+            )
+        self.assertEqual(response.status_code, 201)
+        return Exam.objects.get(id=response.data['data']['id']), len(queries)
+
+    def test_clone_copies_subjects_and_chapter_status(self):
+        self.add_chapters(4)
+        self.add_chapters(3)
+        clone, _ = self.clone(title='Midterm')
+        self.assertEqual(clone.title, 'Midterm')
+        self.assertEqual(set(clone.subjects.all()), set(self.exam.subjects.all()))
+        self.assertEqual(
+            set(clone.exam_chapters.values_list('chapter_id', 'is_completed')),
+            set(self.exam.exam_chapters.values_list('chapter_id', 'is_completed')),
+        )
+        self.assertEqual(ProgressEvent.objects.filter(exam=clone).count(), 7)
+
+        rollup_progress()
+        self.assertEqual(
+            DailyProgress.objects.filter(exam=clone, subject=None).values_list('completed', 'total').get(), (3, 7)
+        )
+
+    def test_clone_resets_status_in_constant_queries(self):
+        self.add_chapters(5)
+        small, small_queries = self.clone(reset_status=True)
+        self.add_chapters(500)
+        large, large_queries = self.clone(reset_status=True)
+        self.assertEqual(small_queries, large_queries)
+        self.assertEqual(large.title, 'Unit test')
+        self.assertEqual(large.exam_chapters.count(), 505)
+        self.assertFalse(large.exam_chapters.filter(is_completed=True).exists())
+        self.assertTrue(self.exam.exam_chapters.filter(is_completed=True).exists())
+
+    def test_clone_is_limited_to_own_exams(self):
+        other = User.objects.create_user(username='other', password='secret')
+        self.client.force_authenticate(other)
+        response = self.client.patch(f'/api/v1/exams/manage/{self.exam.id}/', {'action': 'clone'}, format='json')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(Exam.objects.count(), 1)
+
+
+class ChapterConcurrencyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+        self.exam = Exam.objects.create(title='Finals', user=self.user)
+        subject = Subject.objects.create(name='Physics')
+        self.chapters = [
+            Chapter.objects.create(title=f'Physics {number}', chapter_number=number, subject=subject)
+            for number in (1, 2)
+        ]
+        for chapter in self.chapters:
+            ExamChapter.objects.create(exam=self.exam, chapter=chapter)
+
+    def patch(self, data):
+        return self.client.patch(f'/api/v1/exams/manage/{self.exam.id}/', data, format='json')
+
+    def test_second_device_gets_conflict(self):
+        first = self.chapters[0].id
+        response = self.patch({'chapter_id': first, 'is_completed': True, 'version': 1})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['subjects'][0]['chapters'][0]['version'], 2)
+
+        # The other device still holds version 1.
+        response = self.patch({'chapter_id': first, 'is_completed': False, 'version': 1})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['data'], {'chapter_id': first, 'is_completed': True, 'version': 2})
+        self.assertEqual(ProgressEvent.objects.filter(completed_delta=1).count(), 1)
+        self.assertFalse(ProgressEvent.objects.filter(completed_delta=-1).exists())
+
+    def test_bulk_update_is_all_or_nothing(self):
+        first, second = (chapter.id for chapter in self.chapters)
+        ExamChapter.objects.get(chapter_id=second).save()
+        response = self.patch({'chapters': [
+            {'chapter_id': first, 'is_completed': True, 'version': 1},
+            {'chapter_id': second, 'is_completed': True, 'version': 1},
+        ]})
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['data'], [{'chapter_id': second, 'is_completed': False, 'version': 2}])
+        self.assertFalse(ExamChapter.objects.filter(is_completed=True).exists())
+
+        response = self.patch({'chapters': [
+            {'chapter_id': first, 'is_completed': True, 'version': 1},
+            {'chapter_id': second, 'is_completed': True, 'version': 2},
+        ]})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ExamChapter.objects.filter(is_completed=True, version__in=[2, 3]).count(), 2)
+
+
+class CompletionAnalyticsTests(TestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='staff', password='secret', is_staff=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.staff)
+        self.physics, self.biology = Subject.objects.create(name='Physics'), Subject.objects.create(name='Biology')
+        self.chapters = [
+            Chapter.objects.create(title=f'{subject.name} {number}', chapter_number=number, subject=subject)
+            for subject in (self.physics, self.biology) for number in (1, 2)
+        ]
+        self.exams = []
+        for index in range(3):
+            user = User.objects.create_user(username=f'student{index}', password='secret')
+            exam = Exam.objects.create(title='Finals', user=user)
+            self.exams.append(exam)
+            # Student n completed the first n chapters.
+            ExamChapter.objects.bulk_create([
+                ExamChapter(exam=exam, chapter=chapter, is_completed=number < index)
+                for number, chapter in enumerate(self.chapters)
+            ])
+        # Out of the next rollup's overlap
+        ExamChapter.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        rollup_completion(full=True)
+
+    def test_full_rollup(self):
+        self.assertEqual(
+            dict(ChapterCompletion.objects.values_list('chapter_id', 'completed')),
+            dict(zip([chapter.id for chapter in self.chapters], [2, 1, 0, 0])),
+        )
+        physics = SubjectCompletion.objects.get(subject=self.physics)
+        self.assertEqual((physics.chapters, physics.total, physics.completed), (2, 6, 3))
+        self.assertEqual(SubjectCompletion.objects.get(subject=self.biology).completion_rate, 0)
+
+    def test_incremental_rollup(self):
+        last = self.chapters[-1]
+        exam_chapter = ExamChapter.objects.get(exam=self.exams[0], chapter=last)
+        exam_chapter.is_completed = True
+        exam_chapter.save()
+
+        # Only the changed chapter is recounted.
+        self.assertEqual(rollup_completion(), 1)
+        self.assertEqual(ChapterCompletion.objects.get(pk=last.id).completed, 1)
+        self.assertEqual(SubjectCompletion.objects.get(subject=self.biology).completed, 1)
+
+        # Rows deleted outright are only caught by a full rollup.
+        delete_exam(self.exams[2])
+        # The overlap only takes in the earlier change again.
+        self.assertEqual(rollup_completion(), 1)
+        self.assertEqual(ChapterCompletion.objects.get(pk=self.chapters[0].id).total, 3)
+        rollup_completion(full=True)
+        self.assertEqual(ChapterCompletion.objects.get(pk=self.chapters[0].id).total, 2)
+
+    def test_endpoint(self):
+        response = self.client.get('/api/v1/exams/analytics/', {'subject': self.physics.id, 'order': 'desc'})
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual([subject['name'] for subject in data['subjects']], ['Physics'])
+        self.assertEqual([chapter['id'] for chapter in data['chapters']], [self.chapters[0].id, self.chapters[1].id])
+        self.assertEqual(data['chapters'][0]['completion_rate'], 2 / 3)
+
+        response = self.client.get('/api/v1/exams/analytics/', {'limit': 1})
+        self.assertEqual([subject['name'] for subject in response.data['data']['subjects']], ['Biology', 'Physics'])
+        self.assertEqual(len(response.data['data']['chapters']), 1)
+        self.assertEqual(self.client.get('/api/v1/exams/analytics/', {'order': 'up'}).status_code, 400)
+
+        self.client.force_authenticate(self.exams[0].user)
+        self.assertEqual(self.client.get('/api/v1/exams/analytics/').status_code, 403)
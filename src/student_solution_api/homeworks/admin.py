@@ -1,11 +1,27 @@
 from django.contrib import admin
 
-from .models import Homework
+from student_solution_api.admin_tools import EstimatedCountPaginator, IdRangeListFilter
+from .models import Homework, Reminder
 
 
 @admin.register(Homework)
 class HomeworkAdmin(admin.ModelAdmin):
     list_display = ('title', 'subject', 'due_date', 'is_completed', 'is_deleted', 'created_at')
-    list_filter = ('is_completed', 'is_deleted', 'subject')
+    list_filter = ('is_completed', 'is_deleted', 'subject', ('user', IdRangeListFilter))
+    list_select_related = ('subject',)
     search_fields = ('title',)
+    autocomplete_fields = ('user', 'subject')
     ordering = ('-due_date',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(Reminder)
+class ReminderAdmin(admin.ModelAdmin):
+    list_display = ('homework', 'user', 'window', 'due_date', 'created_at', 'read_at')
+    list_filter = ('window', ('user', IdRangeListFilter))
+    list_select_related = ('homework', 'user')
+    raw_id_fields = ('homework',)
+    autocomplete_fields = ('user',)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from homeworks.reminders import REMINDER_BATCH_SIZE, send_reminders
+
+
+class Command(BaseCommand):
+    help = (
+        'Write due-date reminders for open homework into user inboxes. Loops every --interval seconds; '
+        'run one instance.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Run a single tick and exit.')
+        parser.add_argument('--interval', type=int, default=300, help='Seconds between tick starts.')
+        parser.add_argument('--batch-size', type=int, default=REMINDER_BATCH_SIZE)
+        parser.add_argument('--workers', type=int, default=1, help='Writer threads; 0 writes inline.')
+
+    def handle(self, *args, **options):
+        while True:
+            started = time.monotonic()
+            sent = send_reminders(batch_size=options['batch_size'], workers=options['workers'])
+            elapsed = time.monotonic() - started
+            self.stdout.write(f'Wrote {sent} reminders in {elapsed:.2f} s.')
+            if options['once']:
+                return
+            close_old_connections()
+            try:
+                time.sleep(max(options['interval'] - elapsed, 0))
+            except KeyboardInterrupt:
+                return
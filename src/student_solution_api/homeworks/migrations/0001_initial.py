@@ -0,0 +1,43 @@
+# Generated by Django 5.2.3 on 2026-10-19 12:53
+#
+# The app used to ship without migrations, so existing databases got its
+# tables from a locally generated one. Delete those local migration files
+# before upgrading. If the database has the tables but no applied
+# 0001_initial for this app, record this one without running it:
+#
+#     python manage.py migrate --fake-initial
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('timetable', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Homework',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=200)),
+                ('is_completed', models.BooleanField(default=False)),
+                ('is_deleted', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('due_date', models.DateField()),
+                ('subject', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='timetable.subject')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Homework',
+                'verbose_name_plural': 'Homeworks',
+                'ordering': ['-due_date'],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homeworks', '0001_initial'),
+        ('timetable', '0002_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='homework',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='homework',
+            index=models.Index(fields=['user', 'updated_at'], name='homeworks_h_user_id_0a1749_idx'),
+        ),
+    ]
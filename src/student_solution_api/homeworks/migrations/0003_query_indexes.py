@@ -0,0 +1,24 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:13
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homeworks', '0002_updated_at'),
+        ('timetable', '0003_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='homework',
+            options={'verbose_name': 'Homework', 'verbose_name_plural': 'Homeworks'},
+        ),
+        migrations.AddIndex(
+            model_name='homework',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['user', 'created_at'], name='homework_user_live_created_idx'),
+        ),
+    ]
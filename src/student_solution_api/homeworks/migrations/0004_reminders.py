@@ -0,0 +1,49 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:31
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homeworks', '0003_query_indexes'),
+        ('timetable', '0003_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Reminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('window', models.CharField(max_length=20)),
+                ('due_date', models.DateField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('read_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='homework',
+            index=models.Index(condition=models.Q(('is_completed', False), ('is_deleted', False)), fields=['due_date', 'id'], name='homework_open_due_idx'),
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='homework',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='homeworks.homework'),
+        ),
+        migrations.AddField(
+            model_name='reminder',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='reminder',
+            index=models.Index(fields=['user', 'id'], name='homeworks_r_user_id_ec6237_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='reminder',
+            constraint=models.UniqueConstraint(fields=('homework', 'window', 'due_date'), name='reminder_homework_window_due'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homeworks', '0004_reminders'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='homework',
+            name='version',
+            field=models.PositiveIntegerField(default=1),
+        ),
+    ]
@@ -16,15 +16,57 @@ class Homework(models.Model):
 
     is_completed = models.BooleanField(default=False)
     is_deleted = models.BooleanField(default=False)
+    # Incremented on every write, for optimistic concurrency (see api.concurrency)
+    version = models.PositiveIntegerField(default=1)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     due_date = models.DateField()
     user = models.ForeignKey(User, on_delete=models.CASCADE)
 
     class Meta:
         verbose_name = "Homework"
         verbose_name_plural = "Homeworks"
-        ordering = ['-due_date']
+        indexes = [
+            # Homework list: a user's live homework by creation time. Partial, as
+            # is_deleted=False compiles to NOT is_deleted, which SQLite cannot
+            # match against a key column.
+            models.Index(
+                fields=['user', 'created_at'],
+                condition=models.Q(is_deleted=False),
+                name='homework_user_live_created_idx',
+            ),
+            models.Index(fields=['user', 'updated_at']),
+            # Reminder scans: open homework by due date, across users.
+            models.Index(
+                fields=['due_date', 'id'],
+                condition=models.Q(is_completed=False, is_deleted=False),
+                name='homework_open_due_idx',
+            ),
+        ]
 
 
     def __str__(self):
         return self.title
+
+
+class Reminder(models.Model):
+    """A homework coming due within one of the reminder windows, in its owner's inbox"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='reminders')
+    homework = models.ForeignKey(Homework, on_delete=models.CASCADE, related_name='reminders')
+    window = models.CharField(max_length=20)
+    # The due date reminded of: moving the due date earns a new reminder.
+    due_date = models.DateField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    read_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['homework', 'window', 'due_date'], name='reminder_homework_window_due'),
+        ]
+        indexes = [
+            # Inbox, newest first
+            models.Index(fields=['user', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.homework_id} {self.window} ({self.due_date})"
@@ -0,0 +1,123 @@
+"""
+Homework due-date reminders.
+
+A tick scans the open (not completed, not deleted) homework of all users
+that falls due inside each of settings.HOMEWORK_REMINDER_WINDOWS. Every due
+date in a window is read in id-keyset batches from the partial
+(due_date, id) index, so each batch is one index range scan whatever the
+table size. Batches pass through a bounded in-process queue to writer
+threads, which insert Reminder rows; the unique (homework, window, due_date)
+constraint keeps concurrent or overlapping ticks from adding duplicates,
+and the scan skips homework already reminded of, so a repeated tick only
+reads. At most a few batches are held in memory at once.
+"""
+import queue
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Homework, Reminder
+
+
+REMINDER_BATCH_SIZE = 2000
+
+
+def get_window_days(today):
+    """(window, due date) pairs covered by the configured windows."""
+    return [
+        (window, today + timedelta(days=offset))
+        for window, (first, last) in settings.HOMEWORK_REMINDER_WINDOWS.items()
+        for offset in range(first, last + 1)
+    ]
+
+
+def get_due_homework(window, due_date):
+    """Open homework due on due_date not yet reminded of in window."""
+    reminded = Reminder.objects.filter(homework_id=OuterRef('id'), window=window, due_date=due_date)
+    return Homework.objects.filter(~Exists(reminded), is_completed=False, is_deleted=False, due_date=due_date)
+
+
+def scan_due(window, due_date, batch_size):
+    """Yield batches of (id, user_id) of get_due_homework()."""
+    due_homework = get_due_homework(window, due_date)
+    last_id = 0
+    while True:
+        batch = list(
+            due_homework.filter(id__gt=last_id).order_by('id').values_list('id', 'user_id')[:batch_size]
+        )
+        if batch:
+            yield batch
+        if len(batch) < batch_size:
+            return
+        last_id = batch[-1][0]
+
+
+def write_reminders(window, due_date, batch):
+    Reminder.objects.bulk_create(
+        [
+            Reminder(user_id=user_id, homework_id=homework_id, window=window, due_date=due_date)
+            for homework_id, user_id in batch
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def send_reminders(today=None, batch_size=REMINDER_BATCH_SIZE, workers=1):
+    """
+    Run one tick. With workers=0 batches are written inline, in the caller's
+    connection and transaction. Returns the number of reminders written,
+    counting any that a concurrent tick inserted first and were skipped.
+
+    SQLite takes one writer at a time and locks the table against the scan,
+    so there batches are always written inline.
+    """
+    if connection.vendor == 'sqlite':
+        workers = 0
+    jobs = (
+        (window, due_date, batch)
+        for window, due_date in get_window_days(today or timezone.localdate())
+        for batch in scan_due(window, due_date, batch_size)
+    )
+    sent = 0
+
+    if not workers:
+        for window, due_date, batch in jobs:
+            write_reminders(window, due_date, batch)
+            sent += len(batch)
+        return sent
+
+    # Bounded: the scan waits for the writers instead of reading ahead.
+    pending = queue.Queue(maxsize=workers * 2)
+    errors = []
+    threads = [threading.Thread(target=writer, args=(pending, errors), daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        for job in jobs:
+            pending.put(job)
+            sent += len(job[2])
+    finally:
+        for _ in threads:
+            pending.put(None)
+        for thread in threads:
+            thread.join()
+    if errors:
+        raise errors[0]
+    return sent
+
+
+def writer(pending, errors):
+    try:
+        while (job := pending.get()) is not None:
+            # After a failure keep draining, so the scan never blocks on a full queue.
+            if not errors:
+                try:
+                    write_reminders(*job)
+                except Exception as error:
+                    errors.append(error)
+    finally:
+        connection.close()
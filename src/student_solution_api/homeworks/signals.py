@@ -0,0 +1,32 @@
+from django.contrib.auth.models import User
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from sync.models import DataVersion, Tombstone
+from sync.tombstones import record_deletion
+from sync.versions import bump_version, deleted_via
+from .models import Homework
+
+
+@receiver(pre_save, sender=Homework)
+def homework_saving(sender, instance, update_fields=None, **kwargs):
+    # Queryset writes use api.concurrency.versioned_update instead. Incremented
+    # in SQL, so a stale instance cannot write back a version another write
+    # already reached; the saved signal reads the result back.
+    if not instance._state.adding and (update_fields is None or 'version' in update_fields):
+        instance.version = F('version') + 1
+
+
+@receiver(post_save, sender=Homework)
+def homework_saved(sender, instance, using, **kwargs):
+    if hasattr(instance.version, 'resolve_expression'):
+        instance.refresh_from_db(using=using, fields=['version'])
+    bump_version(instance.user_id, DataVersion.HOMEWORKS)
+
+
+@receiver(post_delete, sender=Homework)
+def homework_deleted(sender, instance, origin=None, **kwargs):
+    if not deleted_via(origin, User):
+        bump_version(instance.user_id, DataVersion.HOMEWORKS)
+        record_deletion(instance.user_id, Tombstone.HOMEWORK, instance.pk)
@@ -1,3 +1,247 @@
-from django.test import TestCase
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, TransactionTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer
+from api.v1.homeworks.serializers import HomeworkSerializer
+from homeworks.models import Homework, Reminder
+from homeworks.reminders import send_reminders
+from timetable.models import Subject
+
+
+class HomeworkSerializerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        subject = Subject.objects.create(name='Physics')
+        for day in range(1, 11):
+            Homework.objects.create(
+                title=f'Worksheet {day}',
+                subject=subject if day % 2 else None,
+                due_date=date(2030, 1, day),
+                is_completed=day % 3 == 0,
+                user=self.user,
+            )
+
+    def test_list_representation_matches_instance_path(self):
+        homeworks = Homework.objects.filter(user=self.user).order_by('created_at')
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(HomeworkSerializer(homeworks, many=True).data),
+            renderer.render([HomeworkSerializer(homework).data for homework in homeworks]),
+        )
+
+    def test_list_representation_is_one_query(self):
+        with self.assertNumQueries(1):
+            HomeworkSerializer(Homework.objects.filter(user=self.user), many=True).data
+
+    def test_sparse_fields(self):
+        homeworks = Homework.objects.filter(user=self.user).order_by('due_date')
+        with self.assertNumQueries(1) as queries:
+            data = HomeworkSerializer(homeworks, many=True, fields=['id', 'due_date']).data
+        self.assertNotIn('JOIN', queries.captured_queries[0]['sql'])
+        self.assertEqual(data[0], {'id': homeworks[0].id, 'due_date': '2030-01-01'})
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.get('/api/v1/homeworks/manage/', {'fields': 'title,subject'})
+        self.assertEqual(
+            response.data['data'][:2], [{'title': 'Worksheet 1', 'subject': 'Physics'}, {'title': 'Worksheet 2'}]
+        )
+        response = client.get('/api/v1/homeworks/manage/', {'fields': 'title,user'})
+        self.assertEqual(response.status_code, 400)
+
+
+class FastJSONTests(SimpleTestCase):
+    payload = {
+        'created_at': datetime(2025, 1, 1, 8, 30, 15, 123456, tzinfo=dt_timezone.utc),
+        'due_date': date(2025, 1, 2),
+        'score': Decimal('9.50'),
+        'title': gettext_lazy('Worksheet'),
+        'notes': 'caf\u00e9 \u2028 line',
+        1: [None, True, 1.5],
+    }
+
+    def test_render_matches_stdlib_renderer(self):
+        self.assertEqual(FastJSONRenderer().render(self.payload), JSONRenderer().render(self.payload))
+
+    def test_indented_render_matches_stdlib_renderer(self):
+        media_type = 'application/json; indent=4'
+        self.assertEqual(
+            FastJSONRenderer().render(self.payload, media_type),
+            JSONRenderer().render(self.payload, media_type),
+        )
+
+    def test_parse_matches_stdlib_parser(self):
+        body = '{"title": "caf\u00e9", "chapters": [{"chapter_number": 1, "is_completed": true}]}'.encode()
+        self.assertEqual(FastJSONParser().parse(BytesIO(body)), JSONParser().parse(BytesIO(body)))
+
+    def test_parse_error(self):
+        with self.assertRaises(ParseError):
+            FastJSONParser().parse(BytesIO(b'{"title": NaN}'))
+
+
+class OptimisticConcurrencyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.homework = Homework.objects.create(title='Essay', due_date=date(2030, 1, 1), user=self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def put(self, **data):
+        return self.client.put('/api/v1/homeworks/manage/', {'id': self.homework.id, **data}, format='json')
+
+    def test_stale_version_conflicts(self):
+        # Another device renamed the homework since this one read version 1.
+        self.homework.title = 'Long essay'
+        self.homework.save()
+        self.assertEqual(self.homework.version, 2)
+
+        response = self.put(version=1)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['data']['version'], 2)
+        self.assertEqual(response.data['data']['title'], 'Long essay')
+        self.assertFalse(Homework.objects.get().is_completed)
+
+        response = self.put(version=2)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['data']['version'], 3)
+        self.assertTrue(response.data['data']['is_completed'])
+
+        response = self.client.delete(
+            '/api/v1/homeworks/manage/', {'id': self.homework.id, 'version': 2}, format='json'
+        )
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(self.put(version='3').status_code, 400)
+
+    def test_stale_save_moves_past_concurrent_update(self):
+        stale = Homework.objects.get()
+        self.assertEqual(self.put(version=1).status_code, 200)
+        # Saving the instance read before the update still moves the version on.
+        stale.title = 'Long essay'
+        stale.save()
+        self.assertEqual(stale.version, 3)
+        self.assertEqual(self.put(version=2).status_code, 409)
+
+    def test_single_statement_writes(self):
+        # UPDATE and version bump inside a savepoint, then the read for the
+        # response: 3 statements outside a test transaction.
+        with self.assertNumQueries(5):
+            self.assertEqual(self.put(version=1).status_code, 200)
+        # Already completed: nothing to write, and no conflict at the current version.
+        self.assertEqual(self.put(version=2).status_code, 200)
+        self.assertEqual(Homework.objects.get().version, 2)
+        with self.assertNumQueries(4):
+            response = self.client.delete('/api/v1/homeworks/manage/', {'id': self.homework.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.put().status_code, 404)
+
+class ReminderTests(TestCase):
+    today = date(2030, 1, 1)
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.other = User.objects.create_user(username='other', password='secret')
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def homework(self, days, user=None, **fields):
+        return Homework.objects.create(
+            title=f'Due in {days}', due_date=self.today + timedelta(days=days), user=user or self.user, **fields
+        )
+
+    def test_reminders_per_window_without_duplicates(self):
+        today, tomorrow, week = self.homework(0), self.homework(1), self.homework(5)
+        self.homework(8)
+        self.homework(-1)
+        self.homework(1, is_completed=True)
+        self.homework(1, is_deleted=True)
+        others = [self.homework(1, user=self.other) for _ in range(5)]
+
+        self.assertEqual(send_reminders(self.today, batch_size=2, workers=0), 8)
+        self.assertEqual(send_reminders(self.today, batch_size=2, workers=0), 0)
+        self.assertEqual(
+            set(Reminder.objects.values_list('homework_id', 'window')),
+            {(today.id, 'due_today'), (tomorrow.id, 'due_tomorrow'), (week.id, 'due_this_week')}
+            | {(homework.id, 'due_tomorrow') for homework in others},
+        )
+
+        # A day later the same homework moves into the next window.
+        send_reminders(self.today + timedelta(days=1), workers=0)
+        self.assertTrue(Reminder.objects.filter(homework=tomorrow, window='due_today').exists())
+
+    def test_inbox(self):
+        for days in (0, 1, 2):
+            self.homework(days)
+        done = self.homework(3)
+        self.homework(1, user=self.other)
+        send_reminders(self.today, workers=0)
+        done.is_completed = True
+        done.save()
+
+        response = self.client.get('/api/v1/homeworks/reminders/', {'limit': 2})
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual([reminder['title'] for reminder in data['reminders']], ['Due in 2', 'Due in 1'])
+        response = self.client.get('/api/v1/homeworks/reminders/', {'before': data['next_before']})
+        self.assertEqual([reminder['title'] for reminder in response.data['data']['reminders']], ['Due in 0'])
+        self.assertIsNone(response.data['data']['next_before'])
+
+        first = data['reminders'][0]['id']
+        response = self.client.patch('/api/v1/homeworks/reminders/', {'ids': [first]}, format='json')
+        self.assertEqual(response.data['data']['updated'], 1)
+        unread = self.client.get('/api/v1/homeworks/reminders/', {'unread': 'true'}).data['data']['reminders']
+        self.assertEqual(len(unread), 2)
+        response = self.client.patch('/api/v1/homeworks/reminders/', {'all': True}, format='json')
+        # The completed homework's reminder is marked too, though no longer listed.
+        self.assertEqual(response.data['data']['updated'], 3)
+        self.assertEqual(self.client.patch('/api/v1/homeworks/reminders/', {}, format='json').status_code, 400)
+
+
+    def test_writer_threads(self):
+        for days in range(9):
+            self.homework(days)
+        written, threads = [], set()
+
+        def write(window, due_date, batch):
+            threads.add(threading.get_ident())
+            written.extend((window, homework_id) for homework_id, _ in batch)
+
+        # SQLite writes inline, so stand in for a server database with the writes mocked.
+        with mock.patch.object(connections['default'], 'vendor', 'postgresql'), \
+                mock.patch('homeworks.reminders.write_reminders', write):
+            self.assertEqual(send_reminders(self.today, batch_size=1, workers=2), 8)
+        self.assertEqual(len(set(written)), 8)
+        self.assertNotIn(threading.get_ident(), threads)
+
+    def test_writer_errors_are_raised(self):
+        for days in range(3):
+            self.homework(days)
+        with mock.patch.object(connections['default'], 'vendor', 'postgresql'), \
+                mock.patch('homeworks.reminders.write_reminders', side_effect=ValueError('full')):
+            with self.assertRaisesMessage(ValueError, 'full'):
+                send_reminders(self.today, batch_size=1, workers=2)
+
+
+class ReminderWorkerTests(TransactionTestCase):
+    def test_writer_threads(self):
+        user = User.objects.create_user(username='student', password='secret')
+        today = date(2030, 1, 1)
+        Homework.objects.bulk_create([
+            Homework(title=f'Homework {index}', due_date=today + timedelta(days=index % 9), user=user)
+            for index in range(90)
+        ])
+        # Days 0-7 of 0-8 are inside a window. SQLite writes inline.
+        self.assertEqual(send_reminders(today, batch_size=7, workers=2), 80)
+        self.assertEqual(Reminder.objects.count(), 80)
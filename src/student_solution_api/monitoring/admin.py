@@ -0,0 +1,58 @@
+from django.contrib import admin
+from django.utils.html import format_html, format_html_join
+
+from .models import ProfileReport
+
+
+@admin.register(ProfileReport)
+class ProfileReportAdmin(admin.ModelAdmin):
+    list_display = ['created_at', 'method', 'path', 'status_code', 'duration_ms', 'query_count', 'duplicate_count', 'user']
+    list_filter = ['method', 'status_code']
+    list_select_related = ['user']
+    search_fields = ['path']
+    ordering = ['-created_at']
+    list_per_page = 20
+    fields = [
+        'created_at', 'user', 'method', 'path', 'status_code', 'duration_ms', 'query_count', 'query_ms',
+        'duplicate_count', 'repeated_queries_table', 'functions_table', 'queries_table',
+    ]
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def table(self, headers, rows):
+        return format_html(
+            '<table><thead><tr>{}</tr></thead><tbody>{}</tbody></table>',
+            format_html_join('', '<th>{}</th>', ((header,) for header in headers)),
+            format_html_join('', '<tr>{}</tr>', (
+                (format_html_join('', '<td>{}</td>', ((value,) for value in row)),) for row in rows
+            )),
+        )
+
+    def repeated_queries_table(self, obj):
+        return self.table(
+            ['Count', 'Identical', 'ms', 'SQL'],
+            ([entry['count'], entry['identical'], f"{entry['ms']:.2f}", entry['sql']] for entry in obj.repeated_queries),
+        )
+    repeated_queries_table.short_description = 'Repeated queries'
+
+    def functions_table(self, obj):
+        return self.table(
+            ['Calls', 'Own ms', 'Cumulative ms', 'Function'],
+            (
+                [entry['calls'], f"{entry['own_ms']:.2f}", f"{entry['cumulative_ms']:.2f}", entry['function']]
+                for entry in obj.functions
+            ),
+        )
+    functions_table.short_description = 'Top functions'
+
+    def queries_table(self, obj):
+        return self.table(
+            ['ms', 'SQL', 'Params'],
+            ([f"{entry['ms']:.2f}", entry['sql'], entry['params']] for entry in obj.queries),
+        )
+    queries_table.short_description = 'Queries'
@@ -0,0 +1,290 @@
+import json
+import time
+from contextlib import ExitStack
+from datetime import timedelta
+from io import BytesIO
+from urllib.parse import urlencode
+from wsgiref.util import setup_testing_defaults
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.core.signals import request_finished, request_started
+from django.core.wsgi import get_wsgi_application
+from django.db import close_old_connections, connection, connections, transaction
+from django.urls import get_resolver
+from django.utils import timezone
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from exams.models import Exam
+from homeworks.models import Homework
+from monitoring.middleware import QueryTimer
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmark every /api/v1/ route through the WSGI application against seeded data '
+        '(see seed_data) and optionally save or compare a JSON baseline. Each scenario runs in '
+        'a transaction that is rolled back, so runs stay comparable; commits become savepoints.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', default='bench_user_0', help='Seeded user to run requests as.')
+        parser.add_argument('--password', default='bench-password')
+        parser.add_argument('--requests', type=int, default=100, help='Measured requests per route.')
+        parser.add_argument('--warmup', type=int, default=5)
+        parser.add_argument('--only', help='Run only scenarios whose name contains this string.')
+        parser.add_argument('--save', help='Write the results to this JSON file.')
+        parser.add_argument('--compare', help='Compare the results against this JSON baseline.')
+        parser.add_argument(
+            '--threshold', type=float, default=10.0,
+            help='Percent p50 slowdown against the baseline reported as a regression.',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            self.user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["user"]}" does not exist. Run seed_data first.')
+
+        self.application = get_wsgi_application()
+        self.password = options['password']
+        self.access_token = str(RefreshToken.for_user(self.user).access_token)
+
+        scenarios = self.get_scenarios()
+        self.check_route_coverage(scenarios)
+        if options['only']:
+            scenarios = [scenario for scenario in scenarios if options['only'] in scenario['name']]
+
+        # As in django.test.Client: the per-request connection cleanup would
+        # close the connection inside the scenario's transaction.
+        request_started.disconnect(close_old_connections)
+        request_finished.disconnect(close_old_connections)
+
+        results = {}
+        for scenario in scenarios:
+            with transaction.atomic():
+                results[scenario['name']] = self.run_scenario(scenario, options['requests'], options['warmup'])
+                transaction.set_rollback(True)
+            self.print_result(scenario['name'], results[scenario['name']])
+
+        report = {
+            'vendor': connection.vendor,
+            'requests_per_route': options['requests'],
+            'results': results,
+        }
+
+        if options['save']:
+            with open(options['save'], 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+            self.stdout.write(f'Saved results to {options["save"]}.')
+
+        if options['compare']:
+            with open(options['compare']) as f:
+                baseline = json.load(f)
+            self.compare(baseline, report, options['threshold'])
+
+    def get_scenarios(self):
+        exam = Exam.objects.filter(user=self.user).order_by('id').first()
+        homework = Homework.objects.filter(user=self.user, is_deleted=False).order_by('id').first()
+        if exam is None or homework is None:
+            raise CommandError(f'User "{self.user.username}" has no seeded exams or homework.')
+        exam_chapter = exam.exam_chapters.order_by('id').first()
+        catalog_chapter_ids = list(exam.exam_chapters.values_list('chapter_id', flat=True))
+        refresh_token = str(RefreshToken.for_user(self.user))
+        timetable_days = [{'id': 1, 'periods': [{'order': 1, 'subject': 'Mathematics'}]}]
+
+        return [
+            # Each scenario: name, route (URL name), method, path, JSON body, whether to authenticate.
+            self.scenario('auth token', 'auth:token_obtain_pair', 'POST', '/api/v1/auth/token/',
+                          {'username': self.user.username, 'password': self.password}, auth=False),
+            self.scenario('auth token refresh', 'auth:token_refresh', 'POST', '/api/v1/auth/token/refresh/',
+                          {'refresh': refresh_token}, auth=False),
+            self.scenario('auth register (invalid)', 'auth:create_user', 'POST', '/api/v1/auth/register/',
+                          {'username': self.user.username}, auth=False),
+            self.scenario('auth manage GET', 'auth:manage_user', 'GET', '/api/v1/auth/manage/'),
+            self.scenario('timetable manage GET', 'timetable:manage-timetable', 'GET', '/api/v1/timetable/manage/'),
+            self.scenario('timetable manage PUT', 'timetable:manage-timetable', 'PUT', '/api/v1/timetable/manage/',
+                          {'days': timetable_days}),
+            self.scenario('timetable subject typeahead', 'timetable:subject-typeahead', 'GET',
+                          '/api/v1/timetable/subjects/', query={'q': 'ma'}),
+            self.scenario('timetable create', 'timetable:create-timetable', 'POST', '/api/v1/timetable/create/',
+                          {'name': 'Benchmark timetable', 'days': timetable_days}),
+            self.scenario('homeworks manage GET', 'homeworks:manage_homework', 'GET', '/api/v1/homeworks/manage/'),
+            self.scenario('homeworks manage GET pending', 'homeworks:manage_homework', 'GET',
+                          '/api/v1/homeworks/manage/', query={'is_completed': 'false'}),
+            self.scenario('homeworks manage GET sparse', 'homeworks:manage_homework', 'GET',
+                          '/api/v1/homeworks/manage/', query={'fields': 'id,title'}),
+            self.scenario('homeworks manage PUT', 'homeworks:manage_homework', 'PUT', '/api/v1/homeworks/manage/',
+                          {'id': homework.id}),
+            self.scenario('homeworks reminders', 'homeworks:reminders', 'GET', '/api/v1/homeworks/reminders/'),
+            self.scenario('homeworks create', 'homeworks:create_homework', 'POST', '/api/v1/homeworks/create/',
+                          {'title': 'Benchmark homework', 'subject_name': 'Mathematics', 'due_date': '2030-01-01'}),
+            self.scenario('exams view', 'exams:view_exams', 'GET', '/api/v1/exams/view/'),
+            self.scenario('exams view sparse', 'exams:view_exams', 'GET', '/api/v1/exams/view/',
+                          query={'fields': 'id,title'}),
+            self.scenario('exams manage GET', 'exams:manage_exam', 'GET', f'/api/v1/exams/manage/{exam.id}/'),
+            self.scenario('exams manage GET sparse', 'exams:manage_exam', 'GET', f'/api/v1/exams/manage/{exam.id}/',
+                          query={'fields': 'id,title,progress'}),
+            self.scenario('exams manage GET summary', 'exams:manage_exam', 'GET', f'/api/v1/exams/manage/{exam.id}/',
+                          query={'summary': 'true'}),
+            self.scenario('exams completion analytics', 'exams:completion_analytics', 'GET',
+                          '/api/v1/exams/analytics/'),
+            self.scenario('exams subject chapters', 'exams:subject_chapters', 'GET',
+                          f'/api/v1/exams/manage/{exam.id}/subjects/{exam_chapter.chapter.subject_id}/chapters/'),
+            self.scenario('exams manage PATCH chapter', 'exams:manage_exam', 'PATCH',
+                          f'/api/v1/exams/manage/{exam.id}/',
+                          {'chapter_id': exam_chapter.chapter_id, 'is_completed': True}),
+            self.scenario('exams manage PATCH stats', 'exams:manage_exam', 'PATCH',
+                          f'/api/v1/exams/manage/{exam.id}/', {'action': 'stats'}),
+            self.scenario('exams manage PATCH clone', 'exams:manage_exam', 'PATCH',
+                          f'/api/v1/exams/manage/{exam.id}/', {'action': 'clone', 'reset_status': True}),
+            self.scenario('exams create', 'exams:create_exam', 'POST', '/api/v1/exams/create/',
+                          {'title': 'Benchmark exam', 'subjects': [
+                              {'name': 'Physics', 'chapters': [{'title': 'Introduction 1', 'chapter_number': 1}]},
+                          ]}),
+            self.scenario('batch', 'batch:batch', 'POST', '/api/v1/batch/', {'atomic': True, 'operations': [
+                {'method': 'PATCH', 'path': f'/api/v1/exams/manage/{exam.id}/',
+                 'body': {'chapter_id': exam_chapter.chapter_id, 'is_completed': True}},
+                {'method': 'PUT', 'path': '/api/v1/homeworks/manage/', 'body': {'id': homework.id}},
+            ]}),
+            self.scenario('exams progress', 'exams:exam_progress', 'GET', f'/api/v1/exams/manage/{exam.id}/progress/'),
+            self.scenario('exams plan', 'exams:exam_plan', 'GET', f'/api/v1/exams/manage/{exam.id}/plan/',
+                          query={'until': (timezone.localdate() + timedelta(days=90)).isoformat()}),
+            self.scenario('exams chapter catalog', 'exams:chapter_catalog', 'GET', '/api/v1/exams/chapters/'),
+            self.scenario('exams create from catalog', 'exams:create_exam', 'POST', '/api/v1/exams/create/',
+                          {'title': 'Benchmark exam', 'chapter_ids': catalog_chapter_ids}),
+            self.scenario('export ndjson', 'export:export_data', 'GET', '/api/v1/export/ndjson/'),
+            self.scenario('export csv', 'export:export_data', 'GET', '/api/v1/export/csv/'),
+            self.scenario('search', 'search:search', 'GET', '/api/v1/search/', query={'q': 'review'}),
+            self.scenario('search prefix', 'search:search', 'GET', '/api/v1/search/', query={'q': 'work math'}),
+            self.scenario('sync full', 'sync:sync_changes', 'GET', '/api/v1/sync/'),
+            self.scenario('sync incremental', 'sync:sync_changes', 'GET', '/api/v1/sync/',
+                          query={'since': timezone.now().isoformat()}),
+            self.scenario('monitoring metrics', 'monitoring:metrics', 'GET', '/api/v1/monitoring/metrics/'),
+        ]
+
+    def scenario(self, name, route, method, path, body=None, query=None, auth=True):
+        return {
+            'name': name,
+            'route': route,
+            'method': method,
+            'path': path,
+            'query': urlencode(query or {}),
+            'body': json.dumps(body).encode() if body is not None else b'',
+            'auth': auth,
+        }
+
+    def check_route_coverage(self, scenarios):
+        covered = {scenario['route'] for scenario in scenarios}
+        for route in self.api_routes():
+            if route not in covered:
+                self.stderr.write(self.style.WARNING(f'No benchmark scenario for route {route}.'))
+
+    def api_routes(self, resolver=None, prefix='', namespace=''):
+        resolver = resolver or get_resolver()
+        for pattern in resolver.url_patterns:
+            route = prefix + str(pattern.pattern)
+            if hasattr(pattern, 'url_patterns'):
+                child_namespace = pattern.namespace or namespace
+                yield from self.api_routes(pattern, route, child_namespace)
+            elif route.startswith('api/v1/') and pattern.name:
+                yield f'{namespace}:{pattern.name}' if namespace else pattern.name
+
+    def run_scenario(self, scenario, requests, warmup):
+        for _ in range(warmup):
+            self.request(scenario)
+
+        latencies, queries, statuses = [], [], set()
+        started = time.perf_counter()
+        for _ in range(requests):
+            query_timer = QueryTimer()
+            with ExitStack() as stack:
+                for db in connections.all():
+                    stack.enter_context(db.execute_wrapper(query_timer))
+                start = time.perf_counter()
+                status = self.request(scenario)
+                latencies.append(time.perf_counter() - start)
+            queries.append(query_timer.count)
+            statuses.add(status)
+        elapsed = time.perf_counter() - started
+
+        latencies.sort()
+        return {
+            'method': scenario['method'],
+            'path': scenario['path'],
+            'statuses': sorted(statuses),
+            'requests_per_second': round(requests / elapsed, 1),
+            'p50_ms': round(percentile(latencies, 50) * 1000, 3),
+            'p95_ms': round(percentile(latencies, 95) * 1000, 3),
+            'p99_ms': round(percentile(latencies, 99) * 1000, 3),
+            'queries_per_request': round(sum(queries) / len(queries), 2),
+        }
+
+    def request(self, scenario):
+        environ = {
+            'REQUEST_METHOD': scenario['method'],
+            'PATH_INFO': scenario['path'],
+            'QUERY_STRING': scenario['query'],
+            'HTTP_HOST': self.host(),
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(scenario['body'])),
+            'wsgi.input': BytesIO(scenario['body']),
+        }
+        if scenario['auth']:
+            environ['HTTP_AUTHORIZATION'] = f'Bearer {self.access_token}'
+        setup_testing_defaults(environ)
+
+        status_holder = []
+        chunks = self.application(environ, lambda status, headers, exc_info=None: status_holder.append(status))
+        try:
+            for _ in chunks:
+                pass
+        finally:
+            if hasattr(chunks, 'close'):
+                chunks.close()
+        return int(status_holder[0].split()[0])
+
+    def host(self):
+        host = next((host for host in settings.ALLOWED_HOSTS if host and host != '*'), 'localhost')
+        return host.lstrip('.')
+
+    def print_result(self, name, result):
+        self.stdout.write(
+            f'{name:<32} {result["requests_per_second"]:>8} req/s  '
+            f'p50 {result["p50_ms"]:>8} ms  p95 {result["p95_ms"]:>8} ms  p99 {result["p99_ms"]:>8} ms  '
+            f'{result["queries_per_request"]:>6} queries  status {result["statuses"]}'
+        )
+
+    def compare(self, baseline, report, threshold):
+        self.stdout.write(f'\nCompared with baseline ({baseline.get("vendor")}):')
+        regressions = 0
+        for name, result in report['results'].items():
+            previous = baseline['results'].get(name)
+            if previous is None:
+                self.stdout.write(f'{name:<32} new scenario')
+                continue
+            change = percent_change(previous['p50_ms'], result['p50_ms'])
+            line = (
+                f'{name:<32} p50 {previous["p50_ms"]} -> {result["p50_ms"]} ms ({change:+.1f}%)  '
+                f'queries {previous["queries_per_request"]} -> {result["queries_per_request"]}'
+            )
+            if change > threshold or result['queries_per_request'] > previous['queries_per_request']:
+                regressions += 1
+                self.stdout.write(self.style.ERROR(line))
+            else:
+                self.stdout.write(line)
+
+        if regressions:
+            self.stdout.write(self.style.ERROR(f'{regressions} scenario(s) regressed.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('No regressions.'))
+
+
+def percentile(sorted_values, percent):
+    index = min(len(sorted_values) - 1, round(percent / 100 * (len(sorted_values) - 1)))
+    return sorted_values[index]
+
+
+def percent_change(before, after):
+    return (after - before) / before * 100 if before else 0
@@ -0,0 +1,123 @@
+import time
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import BytesIO
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from api.parsers import FastJSONParser
+from api.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    help = 'Compare the stdlib and fast JSON renderer/parser on representative API payloads.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chapters', type=int, default=1500, help='Chapters in the exam payloads.')
+        parser.add_argument('--homeworks', type=int, default=1000, help='Rows in the homework payload.')
+        parser.add_argument('--repeat', type=int, default=50)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stderr.write(self.style.WARNING('orjson is not installed; both sides use the stdlib.'))
+
+        exam = self.exam_payload(options['chapters'])
+        homeworks = self.homework_payload(options['homeworks'])
+        exam_create = self.exam_create_payload(options['chapters'])
+
+        for name, payload in (('exam detail', exam), ('homework list', homeworks)):
+            stdlib = JSONRenderer().render(payload)
+            fast = FastJSONRenderer().render(payload)
+            if stdlib != fast:
+                raise CommandError(f'Rendered {name} differs between the renderers.')
+            self.report(
+                f'render {name} ({len(stdlib) // 1024} KiB)',
+                self.time(lambda: JSONRenderer().render(payload), options['repeat']),
+                self.time(lambda: FastJSONRenderer().render(payload), options['repeat']),
+            )
+
+        body = JSONRenderer().render(exam_create)
+        self.report(
+            f'parse exam create ({len(body) // 1024} KiB)',
+            self.time(lambda: JSONParser().parse(BytesIO(body)), options['repeat']),
+            self.time(lambda: FastJSONParser().parse(BytesIO(body)), options['repeat']),
+        )
+
+    def time(self, func, repeat):
+        func()
+        start = time.perf_counter()
+        for _ in range(repeat):
+            func()
+        return (time.perf_counter() - start) / repeat * 1000
+
+    def report(self, name, stdlib_ms, fast_ms):
+        self.stdout.write(
+            f'{name:<36} stdlib {stdlib_ms:8.3f} ms  fast {fast_ms:8.3f} ms  {stdlib_ms / fast_ms:5.1f}x'
+        )
+
+    def exam_payload(self, chapters):
+        per_subject = chapters // 10
+        return {
+            'status': 200,
+            'message': 'Exam retrieved successfully.',
+            'data': {
+                'id': 1,
+                'title': 'Entrance Exam',
+                'progress': 42,
+                'subjects': [
+                    {
+                        'id': subject,
+                        'name': f'Subject {subject}',
+                        'progress': 40,
+                        'chapters': [
+                            {
+                                'id': subject * per_subject + number,
+                                'title': f'Chapter {number}: Problem Solving',
+                                'chapter_number': number,
+                                'is_completed': number % 3 == 0,
+                            }
+                            for number in range(1, per_subject + 1)
+                        ],
+                    }
+                    for subject in range(10)
+                ],
+            },
+        }
+
+    def homework_payload(self, count):
+        created_at = datetime(2025, 1, 1, 8, 30, 15, 123456, tzinfo=dt_timezone.utc)
+        return {
+            'status': 200,
+            'message': 'Homeworks fetched successfully.',
+            'data': [
+                {
+                    'id': index,
+                    'title': f'Worksheet {index}',
+                    'subject': 'Mathematics',
+                    'is_completed': index % 2 == 0,
+                    'is_deleted': False,
+                    'created_at': created_at + timedelta(hours=index),
+                    'due_date': date(2025, 1, 1) + timedelta(days=index % 365),
+                    'score': Decimal('9.5'),
+                }
+                for index in range(count)
+            ],
+        }
+
+    def exam_create_payload(self, chapters):
+        per_subject = chapters // 10
+        return {
+            'title': 'Entrance Exam',
+            'subjects': [
+                {
+                    'name': f'Subject {subject}',
+                    'chapters': [
+                        {'title': f'Chapter {number}: Problem Solving', 'chapter_number': number}
+                        for number in range(1, per_subject + 1)
+                    ],
+                }
+                for subject in range(10)
+            ],
+        }
@@ -0,0 +1,95 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.utils import timezone
+
+from exams.models import Exam, Chapter, ExamChapter
+from homeworks.models import Homework, Reminder
+from homeworks.reminders import get_due_homework
+from sync.models import Tombstone
+from timetable.models import Timetable, Period
+
+
+class Command(BaseCommand):
+    help = (
+        'EXPLAIN the hot API queries against seeded data (see seed_data) and check that each '
+        'one is served by an index on its expected leading columns.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--user', default='bench_user_0', help='Seeded user to build the queries for.')
+        parser.add_argument('--plans', action='store_true', help='Print every query plan.')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options['user'])
+        except User.DoesNotExist:
+            raise CommandError(f'User "{options["user"]}" does not exist. Run seed_data first.')
+
+        exam = Exam.objects.filter(user=user).order_by('id').first()
+        timetable = Timetable.objects.filter(user=user).order_by('id').first()
+        if exam is None or timetable is None:
+            raise CommandError(f'User "{user.username}" has no seeded exams or timetable.')
+        subject_id = exam.subjects.values_list('id', flat=True).first()
+        since = timezone.now()
+
+        checks = [
+            # Each check: name, queryset, leading columns of an index that should serve it.
+            ('exam list', Exam.objects.filter(user=user).order_by('-id'), ['user_id']),
+            ('exam detail', exam.exam_chapters.values_list(
+                'chapter__subject_id', 'chapter__subject__name', 'chapter_id',
+                'chapter__title', 'chapter__chapter_number', 'is_completed',
+            ), ['exam_id']),
+            ('exam chapter page', Chapter.objects.filter(
+                subject_id=subject_id, exam_chapters__exam=exam, chapter_number__gte=1
+            ).order_by('chapter_number', 'id').values_list('id', 'exam_chapters__is_completed')[:50],
+             ['subject_id', 'chapter_number', 'id']),
+            ('exam progress', exam.exam_chapters.filter(is_completed=True).values_list('is_completed'),
+             ['exam_id', 'is_completed']),
+            ('completion changes', ExamChapter.objects.filter(updated_at__gt=since).values_list('chapter_id'),
+             ['updated_at']),
+            ('chapter catalog', Chapter.objects.filter(subject_id=subject_id), ['subject_id']),
+            ('homework list', Homework.objects.filter(user=user, is_deleted=False).order_by('created_at'),
+             ['user_id', 'created_at']),
+            ('timetable detail', timetable.periods.values_list('day_id', 'day__name', 'order', 'subject__name'),
+             ['timetable_id', 'day_id']),
+            ('reminder scan', get_due_homework('due_today', since.date()).filter(id__gt=0)
+             .order_by('id').values_list('id', 'user_id'), ['due_date', 'id']),
+            ('reminder inbox', Reminder.objects.filter(user=user).order_by('-id'), ['user_id', 'id']),
+            ('sync homework', Homework.objects.filter(user=user, updated_at__gt=since), ['user_id', 'updated_at']),
+            ('sync periods', Period.objects.filter(timetable=timetable, updated_at__gt=since),
+             ['timetable_id', 'updated_at']),
+            ('sync tombstones', Tombstone.objects.filter(user=user, deleted_at__gt=since), ['user_id', 'deleted_at']),
+        ]
+
+        failures = 0
+        for name, queryset, columns in checks:
+            plan = queryset.explain()
+            indexes = self.indexes_on(queryset.model, columns)
+            used = [index for index in indexes if index in plan]
+            if used:
+                self.stdout.write(f'{name:<20} ok      {", ".join(used)}')
+            else:
+                failures += 1
+                self.stdout.write(self.style.ERROR(
+                    f'{name:<20} no index on ({", ".join(columns)}) used; candidates: {", ".join(indexes) or "none"}'
+                ))
+            if options['plans'] or not used:
+                self.stdout.write(self.indent(plan))
+
+        if failures:
+            raise CommandError(f'{failures} query plan(s) do not use their index.')
+        self.stdout.write(self.style.SUCCESS('All query plans use their indexes.'))
+
+    def indexes_on(self, model, columns):
+        """Names of the indexes on the model's table whose columns start with columns"""
+        connection = connections[model.objects.db]
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        return sorted(
+            name for name, constraint in constraints.items()
+            if constraint['index'] and constraint['columns'][:len(columns)] == columns
+        )
+
+    def indent(self, plan):
+        return '\n'.join(f'    {line}' for line in plan.splitlines())
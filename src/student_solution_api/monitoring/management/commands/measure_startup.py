@@ -0,0 +1,70 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+PROFILES = [
+    'student_solution_api.settings',
+    'student_solution_api.settings_api',
+    'student_solution_api.settings_admin',
+]
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure cold import of wsgi.application and asgi.application, the first request and '
+        'per-request middleware overhead for each settings profile, each in fresh interpreters.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--profiles', nargs='+', default=PROFILES, help='Settings modules to compare.')
+        parser.add_argument('--repeat', type=int, default=5, help='Fresh processes per entry point; medians are shown.')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per middleware timing run.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f'{"profile":<38} {"apps":>4} {"mw":>3} {"modules":>7} {"wsgi ms":>8} {"asgi ms":>8} '
+            f'{"1st req ms":>10} {"mw us/req":>9}'
+        )
+        for profile in options['profiles']:
+            wsgi = [
+                self.probe(profile, 'student_solution_api.wsgi', '--first-request', '--requests', options['requests'])
+                for _ in range(options['repeat'])
+            ]
+            asgi = [self.probe(profile, 'student_solution_api.asgi') for _ in range(options['repeat'])]
+            apps = self.probe_apps(profile)
+
+            def median(runs, key):
+                return statistics.median(run[key] for run in runs)
+
+            self.stdout.write(
+                f'{profile:<38} {apps:>4} {wsgi[0]["middleware"]:>3} {wsgi[0]["modules"]:>7} '
+                f'{median(wsgi, "import_ms"):>8.1f} {median(asgi, "import_ms"):>8.1f} '
+                f'{median(wsgi, "first_request_ms"):>10.1f} {median(wsgi, "middleware_us"):>9.1f}'
+            )
+
+    def run(self, profile, args):
+        result = subprocess.run(
+            [sys.executable, *map(str, args)],
+            cwd=settings.BASE_DIR,
+            env={**os.environ, 'DJANGO_SETTINGS_MODULE': profile},
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode:
+            raise CommandError(f'{profile}: {result.stderr.strip().splitlines()[-1:]}')
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def probe(self, profile, module, *args):
+        return self.run(profile, ['-m', 'monitoring.startup_probe', module, *args])
+
+    def probe_apps(self, profile):
+        return self.run(profile, [
+            '-c', 'import django, json; from django.apps import apps; django.setup(); '
+                  'print(json.dumps(len(apps.get_app_configs())))',
+        ])
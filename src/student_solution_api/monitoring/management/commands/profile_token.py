@@ -0,0 +1,22 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from monitoring.profiling import PROFILE_PARAM, make_token
+
+
+class Command(BaseCommand):
+    help = 'Print a profiling token for a staff user (see monitoring.profiling).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username')
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(username=options['username']).first()
+        if user is None:
+            raise CommandError(f"No user named {options['username']!r}.")
+        if not user.is_staff:
+            raise CommandError('Profiling is limited to staff users.')
+
+        token = make_token(user)
+        self.stdout.write(token)
+        self.stderr.write(f'Send it as the X-Profile header or the {PROFILE_PARAM} query parameter.')
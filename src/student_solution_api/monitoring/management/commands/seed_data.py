@@ -0,0 +1,158 @@
+import random
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from exams.models import Exam, Chapter, ExamChapter
+from homeworks.models import Homework
+from timetable.models import Subject, Day, Timetable, Period
+
+
+SUBJECTS = [
+    'Mathematics', 'Physics', 'Chemistry', 'Biology', 'English',
+    'History', 'Geography', 'Computer Science', 'Economics', 'Literature',
+]
+
+TOPICS = [
+    'Introduction', 'Foundations', 'Applications', 'Problem Solving', 'Review',
+    'Advanced Topics', 'Case Studies', 'Practice Set', 'Theory', 'Experiments',
+]
+
+HOMEWORK_TASKS = [
+    'Worksheet', 'Essay', 'Exercises', 'Reading', 'Lab report', 'Revision notes', 'Project',
+]
+
+EXAM_TITLES = ['Unit Test', 'Midterm', 'Final Exam', 'Mock Test', 'Entrance Exam']
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = 'Seed users with timetables, homework histories and large exams for benchmarking.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=10)
+        parser.add_argument('--prefix', default='bench_user_', help='Username prefix of seeded users.')
+        parser.add_argument('--password', default='bench-password')
+        parser.add_argument('--homeworks', type=int, default=200, help='Homework rows per user.')
+        parser.add_argument('--exams', type=int, default=3, help='Exams per user.')
+        parser.add_argument('--exam-chapters', type=int, default=300, help='ExamChapter rows per exam.')
+        parser.add_argument('--chapters-per-subject', type=int, default=150)
+        parser.add_argument('--periods-per-day', type=int, default=6)
+        parser.add_argument('--seed', type=int, default=42)
+        parser.add_argument('--reset', action='store_true', help='Delete previously seeded users first.')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        prefix = options['prefix']
+
+        with transaction.atomic():
+            if options['reset']:
+                deleted, _ = User.objects.filter(username__startswith=prefix).delete()
+                self.stdout.write(f'Deleted {deleted} rows of previously seeded data.')
+
+            days = self.seed_days()
+            subjects = self.seed_subjects()
+            chapters = self.seed_chapters(subjects, options['chapters_per_subject'])
+            users = self.seed_users(options['users'], prefix, options['password'])
+
+            for user in users:
+                self.seed_timetable(user, days, subjects, options['periods_per_day'])
+                self.seed_homeworks(user, subjects, options['homeworks'])
+                self.seed_exams(user, subjects, chapters, options['exams'], options['exam_chapters'])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Seeded {len(users)} users ({prefix}*) with password "{options["password"]}".'
+        ))
+
+    def seed_days(self):
+        for name, _ in Day.WEEKDAYS:
+            Day.objects.get_or_create(name=name)
+        return list(Day.objects.order_by('id'))
+
+    def seed_subjects(self):
+        return [Subject.objects.get_or_create(name=name)[0] for name in SUBJECTS]
+
+    def seed_chapters(self, subjects, per_subject):
+        Chapter.objects.bulk_create(
+            [
+                Chapter(
+                    title=f'{TOPICS[number % len(TOPICS)]} {number}',
+                    chapter_number=number,
+                    subject=subject,
+                )
+                for subject in subjects
+                for number in range(1, per_subject + 1)
+            ],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        chapters = {subject.id: [] for subject in subjects}
+        for chapter_id, subject_id in (
+            Chapter.objects.filter(subject__in=subjects)
+            .order_by('subject_id', 'chapter_number')
+            .values_list('id', 'subject_id')
+        ):
+            chapters[subject_id].append(chapter_id)
+        return chapters
+
+    def seed_users(self, count, prefix, password):
+        existing = set(User.objects.filter(username__startswith=prefix).values_list('username', flat=True))
+        # Hash once; PBKDF2 per user would dominate the seeding time.
+        password_hash = make_password(password)
+        usernames = [f'{prefix}{index}' for index in range(count) if f'{prefix}{index}' not in existing]
+        User.objects.bulk_create(
+            [User(username=username, password=password_hash) for username in usernames],
+            batch_size=BATCH_SIZE,
+        )
+        return list(User.objects.filter(username__in=usernames).order_by('id'))
+
+    def seed_timetable(self, user, days, subjects, periods_per_day):
+        timetable = Timetable.objects.create(user=user, name=f'{user.username} timetable')
+        Period.objects.bulk_create([
+            Period(timetable=timetable, day=day, order=order, subject=self.random.choice(subjects))
+            for day in days[:6]
+            for order in range(1, periods_per_day + 1)
+        ])
+
+    def seed_homeworks(self, user, subjects, count):
+        today = timezone.localdate()
+        homeworks = []
+        for _ in range(count):
+            due_date = today + timedelta(days=self.random.randint(-365, 30))
+            subject = self.random.choice(subjects + [None])
+            homeworks.append(Homework(
+                title=f'{self.random.choice(HOMEWORK_TASKS)} - {subject.name if subject else "General"}',
+                subject=subject,
+                due_date=due_date,
+                is_completed=due_date < today and self.random.random() < 0.85,
+                is_deleted=self.random.random() < 0.05,
+                user=user,
+            ))
+        Homework.objects.bulk_create(homeworks, batch_size=BATCH_SIZE)
+
+    def seed_exams(self, user, subjects, chapters, count, exam_chapters):
+        for index in range(count):
+            exam_subjects = self.random.sample(subjects, k=min(5, len(subjects)))
+            exam = Exam.objects.create(user=user, title=f'{EXAM_TITLES[index % len(EXAM_TITLES)]} {index + 1}')
+            exam.subjects.set(exam_subjects)
+
+            # Take the first chapters of each subject, as a syllabus would.
+            per_subject = -(-exam_chapters // len(exam_subjects))
+            chapter_ids = [
+                chapter_id
+                for subject in exam_subjects
+                for chapter_id in chapters[subject.id][:per_subject]
+            ][:exam_chapters]
+            completed_share = self.random.random()
+            ExamChapter.objects.bulk_create(
+                [
+                    ExamChapter(exam=exam, chapter_id=chapter_id, is_completed=self.random.random() < completed_share)
+                    for chapter_id in chapter_ids
+                ],
+                batch_size=BATCH_SIZE,
+            )
@@ -0,0 +1,112 @@
+"""
+In-process request metrics, exported in the Prometheus text format.
+
+Every worker process keeps its own registry; Prometheus scrapes each worker
+and aggregates, and p50/p99 come from histogram_quantile() over the buckets.
+"""
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One slot per bucket plus the implicit +Inf bucket.
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self):
+        total = 0
+        for upper_bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            total += count
+            yield upper_bound, total
+
+    def quantile(self, q):
+        """Estimate a quantile by linear interpolation inside its bucket."""
+        if not self.count:
+            return 0
+        rank = q * self.count
+        lower_bound, seen = 0, 0
+        for upper_bound, count in zip(self.buckets, self.counts):
+            if seen + count >= rank:
+                if not count:
+                    return upper_bound
+                return lower_bound + (upper_bound - lower_bound) * (rank - seen) / count
+            lower_bound, seen = upper_bound, seen + count
+        return self.buckets[-1]
+
+
+HISTOGRAMS = {
+    'http_request_duration_seconds': ('Wall time per request.', LATENCY_BUCKETS),
+    'http_request_db_duration_seconds': ('Time spent in database queries per request.', LATENCY_BUCKETS),
+    'http_request_queries': ('Database queries per request.', QUERY_COUNT_BUCKETS),
+    'http_response_size_bytes': ('Response body size.', SIZE_BUCKETS),
+}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.histograms = {
+                name: defaultdict(lambda buckets=buckets: Histogram(buckets))
+                for name, (_, buckets) in HISTOGRAMS.items()
+            }
+            self.responses = defaultdict(int)
+
+    def record(self, view, method, status, duration, db_duration, queries, size):
+        labels = (view, method)
+        with self.lock:
+            self.histograms['http_request_duration_seconds'][labels].observe(duration)
+            self.histograms['http_request_db_duration_seconds'][labels].observe(db_duration)
+            self.histograms['http_request_queries'][labels].observe(queries)
+            if size is not None:
+                self.histograms['http_response_size_bytes'][labels].observe(size)
+            self.responses[(view, method, str(status))] += 1
+
+    def histogram(self, name, view, method):
+        with self.lock:
+            return self.histograms[name].get((view, method))
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, (help_text, _) in HISTOGRAMS.items():
+                lines.append(f'# HELP {name} {help_text}')
+                lines.append(f'# TYPE {name} histogram')
+                for (view, method), histogram in sorted(self.histograms[name].items()):
+                    labels = f'view="{_escape(view)}",method="{method}"'
+                    for upper_bound, count in histogram.cumulative_counts():
+                        lines.append(f'{name}_bucket{{{labels},le="{upper_bound}"}} {count}')
+                    lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{name}_count{{{labels}}} {histogram.count}')
+
+            lines.append('# HELP http_responses_total Responses by view, method and status code.')
+            lines.append('# TYPE http_responses_total counter')
+            for (view, method, status), count in sorted(self.responses.items()):
+                labels = f'view="{_escape(view)}",method="{method}",status="{status}"'
+                lines.append(f'http_responses_total{{{labels}}} {count}')
+
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+registry = MetricsRegistry()
@@ -0,0 +1,90 @@
+import time
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+from .metrics import registry
+from .profiling import get_token_user_id, profile_request, save_report
+
+
+class QueryTimer:
+    """Database execute wrapper that counts queries and sums their time."""
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.duration += time.perf_counter() - start
+            self.count += 1
+
+
+@contextmanager
+def count_queries():
+    """Count and time the queries of the block on every connection; yields the QueryTimer."""
+    query_timer = QueryTimer()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(query_timer))
+        yield query_timer
+
+
+class RequestMetricsMiddleware:
+    """
+    Record wall time, DB time, query count and response size per view.
+
+    Requests are labelled by resolved view name and method, e.g.
+    ("exams:manage_exam", "PATCH"), and the timings are also sent back to
+    the client in a Server-Timing header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        start = time.perf_counter()
+        with count_queries() as query_timer:
+            response = self.get_response(request)
+        duration = time.perf_counter() - start
+
+        resolver_match = getattr(request, 'resolver_match', None)
+        view = resolver_match.view_name if resolver_match else 'unresolved'
+        size = None if response.streaming else len(response.content)
+
+        registry.record(
+            view, request.method, response.status_code,
+            duration, query_timer.duration, query_timer.count, size,
+        )
+
+        response['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, '
+            f'db;dur={query_timer.duration * 1000:.1f};desc="{query_timer.count} queries"'
+        )
+        return response
+
+
+class ProfilingMiddleware:
+    """
+    Profile requests carrying a staff profiling token (see
+    monitoring.profiling) and store the report. Goes first in MIDDLEWARE,
+    so the report covers the rest of the stack too; the report id is sent
+    back in an X-Profile-Report header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        user_id = get_token_user_id(request)
+        if user_id is None:
+            return self.get_response(request)
+
+        response, data = profile_request(self.get_response, request)
+        report = save_report(request, user_id, data)
+        if report is not None:
+            response['X-Profile-Report'] = str(report.pk)
+        return response
@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import models
+
+
+class ProfileReport(models.Model):
+    """One staff-triggered profiled request (see monitoring.profiling)"""
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, related_name='+')
+    method = models.CharField(max_length=10)
+    path = models.CharField(max_length=500)
+    status_code = models.PositiveSmallIntegerField()
+    duration_ms = models.FloatField()
+    query_count = models.PositiveIntegerField()
+    query_ms = models.FloatField()
+    duplicate_count = models.PositiveIntegerField(help_text='Queries repeating an earlier one with the same parameters.')
+    # [{"function", "calls", "own_ms", "cumulative_ms"}], by cumulative time
+    functions = models.JSONField(default=list)
+    # [{"sql", "params", "ms"}], in execution order
+    queries = models.JSONField(default=list)
+    # [{"sql", "count", "ms", "identical"}]: statements run more than once
+    repeated_queries = models.JSONField(default=list)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['created_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.method} {self.path} ({self.duration_ms:.0f} ms)"
@@ -0,0 +1,136 @@
+"""
+On-demand profiling of single requests, for staff.
+
+A request carrying a profiling token, in the X-Profile header or the
+_profile query parameter, runs under cProfile with every SQL statement and
+its time recorded. The token is a signed, expiring staff user id (see the
+profile_token command); the report is only kept if the request was made
+by that user and they are still staff. Reports are ProfileReport rows,
+browsable in the admin. Requests without a token pay one dict lookup and
+one substring test.
+"""
+import cProfile
+import pstats
+import time
+from collections import defaultdict
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core import signing
+from django.db import connections
+
+from .models import ProfileReport
+
+
+PROFILE_HEADER = 'HTTP_X_PROFILE'
+PROFILE_PARAM = '_profile'
+
+TOKEN_SALT = 'monitoring.profiling'
+
+TOP_FUNCTIONS = 40
+
+MAX_QUERIES = 500
+
+
+def make_token(user):
+    return signing.TimestampSigner(salt=TOKEN_SALT).sign(str(user.pk))
+
+
+def get_token_user_id(request):
+    """Staff user id from the request's profiling token; None without a valid one."""
+    token = request.META.get(PROFILE_HEADER)
+    if token is None:
+        if f'{PROFILE_PARAM}=' not in request.META.get('QUERY_STRING', ''):
+            return None
+        token = request.GET.get(PROFILE_PARAM)
+    try:
+        return int(signing.TimestampSigner(salt=TOKEN_SALT).unsign(token, max_age=settings.PROFILING_TOKEN_MAX_AGE))
+    except (signing.BadSignature, TypeError, ValueError):
+        return None
+
+
+class QueryRecorder:
+    """Database execute wrapper keeping each statement, its parameters and time."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, repr(params), (time.perf_counter() - start) * 1000))
+
+
+def profile_request(get_response, request):
+    """Run the request under cProfile and the query recorder. Returns (response, report data)."""
+    recorder = QueryRecorder()
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+    duration_ms = (time.perf_counter() - start) * 1000
+
+    repeated = get_repeated_queries(recorder.queries)
+    return response, {
+        'method': request.method,
+        'path': request.get_full_path()[:500],
+        'status_code': response.status_code,
+        'duration_ms': duration_ms,
+        'query_count': len(recorder.queries),
+        'query_ms': sum(ms for _, _, ms in recorder.queries),
+        'duplicate_count': sum(entry['identical'] - 1 for entry in repeated if entry['identical'] > 1),
+        'functions': get_top_functions(profiler),
+        'queries': [{'sql': sql, 'params': params, 'ms': ms} for sql, params, ms in recorder.queries[:MAX_QUERIES]],
+        'repeated_queries': repeated,
+    }
+
+
+def get_top_functions(profiler):
+    stats = pstats.Stats(profiler).stats
+    functions = [
+        {
+            'function': f'{filename}:{line}({name})',
+            'calls': calls,
+            'own_ms': own * 1000,
+            'cumulative_ms': cumulative * 1000,
+        }
+        for (filename, line, name), (_, calls, own, cumulative, _) in stats.items()
+    ]
+    functions.sort(key=lambda function: function['cumulative_ms'], reverse=True)
+    return functions[:TOP_FUNCTIONS]
+
+
+def get_repeated_queries(queries):
+    """
+    Statements run more than once, most frequent first. "identical" counts
+    the most repeated parameter set: above 1 is a plain duplicate, while a
+    high count with different parameters is usually an N+1 loop.
+    """
+    by_sql = defaultdict(lambda: {'count': 0, 'ms': 0, 'params': defaultdict(int)})
+    for sql, params, ms in queries:
+        entry = by_sql[sql]
+        entry['count'] += 1
+        entry['ms'] += ms
+        entry['params'][params] += 1
+    repeated = [
+        {'sql': sql, 'count': entry['count'], 'ms': entry['ms'], 'identical': max(entry['params'].values())}
+        for sql, entry in by_sql.items() if entry['count'] > 1
+    ]
+    repeated.sort(key=lambda entry: entry['count'], reverse=True)
+    return repeated
+
+
+def save_report(request, user_id, data):
+    """Store the report if the request was made by the token's user, still staff. Returns it or None."""
+    user = getattr(request, 'user', None)
+    if user is None or not user.is_authenticated or user.pk != user_id or not user.is_staff:
+        return None
+    return ProfileReport.objects.create(user_id=user_id, **data)
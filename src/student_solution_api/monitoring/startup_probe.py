@@ -0,0 +1,111 @@
+"""
+Cold-start probe run in a fresh interpreter by the measure_startup command:
+
+    python -m monitoring.startup_probe student_solution_api.wsgi --first-request --requests 2000
+
+Times the import of the WSGI/ASGI module, which loads the settings and the
+app registry, and optionally the first request through the WSGI handler,
+which loads the URLconf and every view module, and the per-request cost of
+the middleware stack around a view that does nothing. Prints one JSON
+object. Keep the imports here to the standard library until the timed
+import has run.
+"""
+import argparse
+import importlib
+import io
+import json
+import sys
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('module')
+    parser.add_argument('--first-request', action='store_true', help='Only for the WSGI module.')
+    parser.add_argument('--requests', type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    module = importlib.import_module(args.module)
+    result = {'import_ms': (time.perf_counter() - start) * 1000, 'modules': len(sys.modules)}
+
+    if args.first_request:
+        result['first_request_ms'] = measure_first_request(module.application)
+        result['modules'] = len(sys.modules)
+    if args.requests:
+        result.update(measure_middleware(args.requests))
+    print(json.dumps(result))
+
+
+def measure_first_request(application):
+    from django.conf import settings
+    from django.core.handlers.wsgi import WSGIRequest
+
+    host = settings.ALLOWED_HOSTS[0].lstrip('.') if settings.ALLOWED_HOSTS else 'localhost'
+    # Unmatched, so no view or database work: the URLconf still loads in full.
+    request = WSGIRequest({
+        'REQUEST_METHOD': 'GET',
+        'PATH_INFO': '/startup-probe/',
+        'HTTP_HOST': 'localhost' if host == '*' else host,
+        'wsgi.input': io.BytesIO(),
+        'wsgi.url_scheme': 'http',
+    })
+    start = time.perf_counter()
+    application.get_response(request)
+    return (time.perf_counter() - start) * 1000
+
+
+def measure_middleware(requests):
+    from django.conf import settings
+    from django.core.handlers.base import BaseHandler
+    from django.http import HttpResponse
+    from django.test import RequestFactory, override_settings
+    from django.urls import ResolverMatch
+    from django.views.decorators.csrf import csrf_exempt
+    from rest_framework_simplejwt.tokens import AccessToken
+
+    @csrf_exempt
+    def noop_view(request):
+        return HttpResponse(b'{}', content_type='application/json')
+
+    class NoopHandler(BaseHandler):
+        """Runs the configured middleware around noop_view, whatever the path."""
+
+        def resolve_request(self, request):
+            match = ResolverMatch(noop_view, (), {}, url_name='noop')
+            request.resolver_match = match
+            return match
+
+    handler = NoopHandler()
+    handler.load_middleware()
+    with override_settings(MIDDLEWARE=[]):
+        bare = NoopHandler()
+        bare.load_middleware()
+
+    token = AccessToken()
+    token['user_id'] = 1
+    factory = RequestFactory()
+
+    def per_request(handler):
+        batch = [
+            factory.get('/api/v1/exams/view/', HTTP_AUTHORIZATION=f'Bearer {token}')
+            for _ in range(requests)
+        ]
+        handler.get_response(factory.get('/'))
+        start = time.perf_counter()
+        for request in batch:
+            handler.get_response(request)
+        return (time.perf_counter() - start) / requests * 1_000_000
+
+    # Best of three runs keeps scheduler noise out of the difference.
+    with_middleware = min(per_request(handler) for _ in range(3))
+    without_middleware = min(per_request(bare) for _ in range(3))
+    return {
+        'middleware': len(settings.MIDDLEWARE),
+        'middleware_us': max(with_middleware - without_middleware, 0),
+        'request_us': with_middleware,
+    }
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,138 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from exams.models import Exam
+from monitoring.metrics import Histogram, registry
+from monitoring.models import ProfileReport
+from monitoring.profiling import make_token
+
+
+class RequestMetricsTests(APITestCase):
+    def setUp(self):
+        registry.reset()
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.exam = Exam.objects.create(title='Finals', user=self.user)
+        self.client.force_authenticate(self.user)
+
+    def test_records_metrics_per_view(self):
+        response = self.client.get(f'/api/v1/exams/manage/{self.exam.id}/')
+
+        self.assertIn('app;dur=', response['Server-Timing'])
+        self.assertIn('queries"', response['Server-Timing'])
+        histogram = registry.histogram('http_request_queries', 'exams:manage_exam', 'GET')
+        self.assertEqual(histogram.count, 1)
+        self.assertGreater(histogram.sum, 0)
+
+    def test_metrics_endpoint_is_staff_only(self):
+        self.client.get('/api/v1/exams/view/')
+        response = self.client.get('/api/v1/monitoring/metrics/')
+        self.assertEqual(response.status_code, 403)
+
+        self.user.is_staff = True
+        self.user.save()
+        response = self.client.get('/api/v1/monitoring/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'http_request_duration_seconds_count{view="exams:view_exams",method="GET"} 1',
+            response.content.decode(),
+        )
+
+
+class HistogramTests(SimpleTestCase):
+    def test_quantile_interpolates_within_bucket(self):
+        histogram = Histogram((1, 2, 4))
+        for value in (0.5, 1.5, 1.5, 3):
+            histogram.observe(value)
+
+        self.assertEqual(histogram.quantile(0.5), 1.5)
+        self.assertEqual(list(histogram.cumulative_counts())[-1], ('+Inf', 4))
+
+
+class ExplainQueriesTests(TestCase):
+    def test_hot_queries_use_their_indexes(self):
+        call_command(
+            'seed_data', users=1, homeworks=50, exams=1, exam_chapters=20, chapters_per_subject=10,
+            stdout=StringIO(),
+        )
+        out = StringIO()
+        call_command('explain_queries', stdout=out)
+        self.assertIn('All query plans use their indexes.', out.getvalue())
+
+
+class MeasureStartupTests(SimpleTestCase):
+    def test_profiles(self):
+        out = StringIO()
+        call_command(
+            'measure_startup', '--repeat', '1', '--requests', '10', '--profiles',
+            'student_solution_api.settings', 'student_solution_api.settings_api', stdout=out,
+        )
+        rows = {line.split()[0]: line.split()[1:] for line in out.getvalue().splitlines()[1:]}
+        full, api = rows['student_solution_api.settings'], rows['student_solution_api.settings_api']
+        # Fewer apps, middleware and loaded modules
+        for column in range(3):
+            self.assertLess(int(api[column]), int(full[column]))
+
+
+class ProfilingTests(APITestCase):
+    def setUp(self):
+        self.staff = User.objects.create_user(username='admin', password='secret', is_staff=True)
+        self.student = User.objects.create_user(username='student', password='secret')
+        for title in ('Finals', 'Mocks'):
+            Exam.objects.create(title=title, user=self.staff)
+
+    def test_staff_token_stores_report(self):
+        self.client.force_authenticate(self.staff)
+        response = self.client.get('/api/v1/exams/view/', HTTP_X_PROFILE=make_token(self.staff))
+
+        self.assertEqual(response.status_code, 200)
+        report = ProfileReport.objects.get(pk=response['X-Profile-Report'])
+        self.assertEqual((report.user, report.method, report.path), (self.staff, 'GET', '/api/v1/exams/view/'))
+        self.assertEqual(report.query_count, len(report.queries))
+        self.assertGreater(report.query_count, 0)
+        self.assertTrue(report.functions)
+
+    def test_query_parameter(self):
+        self.client.force_authenticate(self.staff)
+        response = self.client.get('/api/v1/exams/view/', {'_profile': make_token(self.staff)})
+        self.assertTrue(ProfileReport.objects.filter(pk=response['X-Profile-Report']).exists())
+
+    def test_ignored_without_valid_staff_token(self):
+        self.client.force_authenticate(self.student)
+        self.client.get('/api/v1/exams/view/', HTTP_X_PROFILE=make_token(self.student))
+        self.client.get('/api/v1/exams/view/', HTTP_X_PROFILE=make_token(self.staff))
+
+        self.client.force_authenticate(self.staff)
+        response = self.client.get('/api/v1/exams/view/', HTTP_X_PROFILE='forged')
+        self.assertNotIn('X-Profile-Report', response)
+        self.assertFalse(ProfileReport.objects.exists())
+
+    def test_no_queries_added_without_token(self):
+        self.client.force_authenticate(self.staff)
+        self.client.get('/api/v1/exams/view/')
+        with CaptureQueriesContext(connection) as plain:
+            self.client.get('/api/v1/exams/view/')
+        with CaptureQueriesContext(connection) as profiled:
+            self.client.get('/api/v1/exams/view/', HTTP_X_PROFILE=make_token(self.staff))
+        # The profiled request only adds the report insert.
+        self.assertEqual(len(profiled), len(plain) + 1)
+
+    def test_repeated_queries(self):
+        self.client.force_authenticate(self.staff)
+        self.client.get('/api/v1/exams/view/', HTTP_X_PROFILE=make_token(self.staff))
+        report = ProfileReport.objects.get()
+        for entry in report.repeated_queries:
+            self.assertGreater(entry['count'], 1)
+        self.assertEqual(report.duplicate_count, sum(entry['identical'] - 1 for entry in report.repeated_queries))
+
+    def test_profile_token_command(self):
+        out = StringIO()
+        call_command('profile_token', 'admin', stdout=out, stderr=StringIO())
+        self.assertTrue(out.getvalue().strip().startswith(f'{self.staff.pk}:'))
+        with self.assertRaises(CommandError):
+            call_command('profile_token', 'student', stdout=StringIO(), stderr=StringIO())
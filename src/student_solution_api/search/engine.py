@@ -0,0 +1,146 @@
+"""
+Ranked search over a user's homework, exams and the chapters in their exams.
+
+Every query term is matched as a word prefix, all terms must match. Each
+kind is searched on its own, best matches first, and the results are merged
+by rank:
+
+- PostgreSQL: to_tsvector('simple', title) @@ prefix tsquery, or a substring
+  match of the whole query served by the trigram index; ranked by ts_rank
+  plus trigram similarity.
+- SQLite: the FTS5 tables from search.indexes, ranked by bm25.
+- Anything else (or SQLite without FTS5): unranked icontains.
+"""
+import re
+
+from django.db import connections, router
+
+from exams.models import Exam, Chapter, ExamChapter
+from homeworks.models import Homework
+from .indexes import fts5_available, fts_table
+
+
+MAX_TERMS = 8
+
+TERM_PATTERN = re.compile(r'\w+')
+
+
+def get_terms(query):
+    return TERM_PATTERN.findall(query.lower())[:MAX_TERMS]
+
+
+_fts5 = {}
+
+
+def has_fts5(db, connection):
+    if db not in _fts5:
+        _fts5[db] = fts5_available(connection)
+    return _fts5[db]
+
+
+def search(user_id, query, limit):
+    """Up to limit results, best first, as dicts with type, id, title, exam_id and rank."""
+    terms = get_terms(query)
+    if not terms:
+        return []
+
+    db = router.db_for_read(Homework)
+    connection = connections[db]
+    if connection.vendor == 'postgresql':
+        rows = postgres_search(connection, user_id, query, terms, limit)
+    elif connection.vendor == 'sqlite' and has_fts5(db, connection):
+        rows = sqlite_search(connection, user_id, terms, limit)
+    else:
+        rows = fallback_search(db, user_id, terms, limit)
+
+    rows.sort(key=lambda row: (-row[4], row[0], -row[1]))
+    return [
+        {'type': kind, 'id': object_id, 'title': title, 'exam_id': exam_id, 'rank': round(rank, 4)}
+        for kind, object_id, title, exam_id, rank in rows[:limit]
+    ]
+
+
+def kind_queries(source):
+    """(kind, model, exam id column, FROM clause, user filter); source(model) is the FROM item aliased "t"."""
+    exam, exam_chapter = Exam._meta.db_table, ExamChapter._meta.db_table
+    return [
+        ('homework', Homework, 'NULL', source(Homework), 't.user_id = %s AND NOT t.is_deleted'),
+        ('exam', Exam, 'NULL', source(Exam), 't.user_id = %s'),
+        (
+            'chapter',
+            Chapter,
+            'e.id',
+            f'{source(Chapter)} JOIN {exam_chapter} ec ON ec.chapter_id = t.id JOIN {exam} e ON e.id = ec.exam_id',
+            'e.user_id = %s',
+        ),
+    ]
+
+
+def run_queries(connection, queries, match, rank, rank_params, match_params, user_id, limit):
+    """Run each kind's query; "{fts}" in match and rank is replaced by the kind's FTS table."""
+    rows = []
+    with connection.cursor() as cursor:
+        for kind, model, exam_id, source, user_filter in queries:
+            fts = fts_table(model)
+            cursor.execute(
+                f"SELECT '{kind}', t.id, t.title, {exam_id}, {rank.format(fts=fts)} AS rank FROM {source} "
+                f'WHERE {user_filter} AND {match.format(fts=fts)} ORDER BY rank DESC, t.id DESC LIMIT %s',
+                [*rank_params, user_id, *match_params, limit],
+            )
+            rows.extend(cursor.fetchall())
+    return rows
+
+
+def postgres_search(connection, user_id, query, terms, limit):
+    tsquery = ' & '.join(f'{term}:*' for term in terms)
+    pattern = '%' + query.strip().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+    # Written to match the expression indexes of the search migration.
+    tsvector = "to_tsvector('simple', t.title)"
+    return run_queries(
+        connection,
+        kind_queries(lambda model: f'{model._meta.db_table} t'),
+        match=f"({tsvector} @@ to_tsquery('simple', %s) OR t.title ILIKE %s)",
+        rank=f"(ts_rank({tsvector}, to_tsquery('simple', %s)) + similarity(t.title, %s))",
+        rank_params=[tsquery, query],
+        match_params=[tsquery, pattern],
+        user_id=user_id,
+        limit=limit,
+    )
+
+
+def sqlite_search(connection, user_id, terms, limit):
+    def source(model):
+        fts = fts_table(model)
+        return f'{fts} JOIN {model._meta.db_table} t ON t.id = {fts}.rowid'
+
+    return run_queries(
+        connection,
+        kind_queries(source),
+        match='{fts} MATCH %s',
+        rank='-bm25({fts})',
+        rank_params=[],
+        match_params=[' '.join(f'"{term}"*' for term in terms)],
+        user_id=user_id,
+        limit=limit,
+    )
+
+
+def fallback_search(db, user_id, terms, limit):
+    def matching(queryset, field='title'):
+        for term in terms:
+            queryset = queryset.filter(**{f'{field}__icontains': term})
+        return queryset
+
+    homework = matching(Homework.objects.using(db).filter(user_id=user_id, is_deleted=False))
+    exams = matching(Exam.objects.using(db).filter(user_id=user_id))
+    chapters = matching(ExamChapter.objects.using(db).filter(exam__user_id=user_id), 'chapter__title')
+    return [
+        *(('homework', id, title, None, 0.0) for id, title in homework.order_by('-id').values_list('id', 'title')[:limit]),
+        *(('exam', id, title, None, 0.0) for id, title in exams.order_by('-id').values_list('id', 'title')[:limit]),
+        *(
+            ('chapter', id, title, exam_id, 0.0)
+            for id, title, exam_id in chapters.order_by('-chapter_id').values_list(
+                'chapter_id', 'chapter__title', 'exam_id'
+            )[:limit]
+        ),
+    ]
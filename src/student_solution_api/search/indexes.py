@@ -0,0 +1,65 @@
+"""
+Database-side search indexes over Homework.title, Exam.title and Chapter.title.
+
+PostgreSQL: GIN indexes on to_tsvector('simple', title) for word-prefix
+matches and on title gin_trgm_ops for substring matches, created by this
+app's migration (needs the pg_trgm extension).
+
+SQLite: FTS5 tables with the source table as external content, kept in sync
+by triggers. Django rebuilds a SQLite table (dropping its triggers) for many
+schema changes, so they are (re)installed after every migrate instead of in
+a migration, and the FTS tables are rebuilt whenever triggers were missing.
+"""
+from django.db import connections
+
+from exams.models import Exam, Chapter
+from homeworks.models import Homework
+
+
+SEARCH_MODELS = [Homework, Exam, Chapter]
+
+
+def fts_table(model):
+    return f'search_{model._meta.model_name}_fts'
+
+
+def fts5_available(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT sqlite_compileoption_used(%s)', ['ENABLE_FTS5'])
+        return bool(cursor.fetchone()[0])
+
+
+def install_fts(using='default', **kwargs):
+    """post_migrate handler creating the SQLite FTS5 tables and their triggers."""
+    connection = connections[using]
+    if connection.vendor != 'sqlite' or not fts5_available(connection):
+        return
+
+    with connection.cursor() as cursor:
+        existing = {
+            name for name, in cursor.execute("SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger')")
+        }
+        for model in SEARCH_MODELS:
+            source, fts = model._meta.db_table, fts_table(model)
+            if source not in existing:
+                continue
+            triggers = {
+                f'{fts}_insert': f'AFTER INSERT ON {source} BEGIN '
+                                 f'INSERT INTO {fts}(rowid, title) VALUES (new.id, new.title); END',
+                f'{fts}_delete': f'AFTER DELETE ON {source} BEGIN '
+                                 f"INSERT INTO {fts}({fts}, rowid, title) VALUES ('delete', old.id, old.title); END",
+                f'{fts}_update': f'AFTER UPDATE OF title ON {source} BEGIN '
+                                 f"INSERT INTO {fts}({fts}, rowid, title) VALUES ('delete', old.id, old.title); "
+                                 f'INSERT INTO {fts}(rowid, title) VALUES (new.id, new.title); END',
+            }
+            if fts in existing and existing.issuperset(triggers):
+                continue
+
+            cursor.execute(
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5('
+                f"title, content='{source}', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+            )
+            for name, body in triggers.items():
+                cursor.execute(f'CREATE TRIGGER IF NOT EXISTS {name} {body}')
+            cursor.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
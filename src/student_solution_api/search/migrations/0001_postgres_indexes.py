@@ -0,0 +1,38 @@
+from django.db import migrations
+
+
+TABLES = ['homeworks_homework', 'exams_exam', 'exams_chapter']
+
+
+def create_indexes(apps, schema_editor):
+    # SQLite gets FTS5 tables from search.indexes.install_fts instead.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table in TABLES:
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {table}_title_tsv ON {table} USING gin (to_tsvector('simple', title))"
+        )
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {table}_title_trgm ON {table} USING gin (title gin_trgm_ops)'
+        )
+
+
+def drop_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for table in TABLES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_title_tsv')
+        schema_editor.execute(f'DROP INDEX IF EXISTS {table}_title_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('exams', '0005_progress_history'),
+        ('homeworks', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_indexes, drop_indexes),
+    ]
@@ -0,0 +1,66 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from rest_framework.test import APITestCase
+
+from exams.models import Exam, Chapter, ExamChapter
+from homeworks.models import Homework
+from timetable.models import Subject
+
+
+class SearchTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.other = User.objects.create_user(username='other', password='secret')
+        subject = Subject.objects.create(name='Physics')
+        self.homework = Homework.objects.create(title='Optics worksheet', due_date=date(2030, 1, 1), user=self.user)
+        self.exam = Exam.objects.create(title='Physics finals', user=self.user)
+        self.chapter = Chapter.objects.create(title='Geometric optics', chapter_number=1, subject=subject)
+        ExamChapter.objects.create(exam=self.exam, chapter=self.chapter)
+        Chapter.objects.create(title='Wave optics', chapter_number=2, subject=subject)
+        Homework.objects.create(title='Optics essay', due_date=date(2030, 1, 1), user=self.other)
+        self.client.force_authenticate(self.user)
+
+    def search(self, **params):
+        response = self.client.get('/api/v1/search/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def hits(self, q):
+        return {(result['type'], result['id']) for result in self.search(q=q)['results']}
+
+    def test_searches_own_homework_exams_and_exam_chapters(self):
+        self.assertEqual(self.hits('optic'), {('homework', self.homework.id), ('chapter', self.chapter.id)})
+        self.assertEqual(self.hits('PHYS fin'), {('exam', self.exam.id)})
+        self.assertEqual(self.search(q='geometric')['results'][0]['exam_id'], self.exam.id)
+        self.assertEqual(self.hits('optics essay'), set())
+
+    def test_index_follows_writes(self):
+        self.homework.title = 'Lens diagrams'
+        self.homework.save()
+        Homework.objects.filter(title='Lens diagrams').update(is_deleted=True)
+        self.assertEqual(self.hits('optics'), {('chapter', self.chapter.id)})
+        self.assertEqual(self.hits('lens'), set())
+
+        Homework.objects.create(title='Lens diagrams again', due_date=date(2030, 1, 1), user=self.user)
+        self.chapter.delete()
+        self.assertEqual({kind for kind, _ in self.hits('lens')}, {'homework'})
+        self.assertEqual(self.hits('geometric'), set())
+
+    def test_pagination(self):
+        Homework.objects.bulk_create([
+            Homework(title=f'Optics set {number}', due_date=date(2030, 1, 1), user=self.user)
+            for number in range(5)
+        ])
+        first = self.search(q='optics', page_size=4)
+        second = self.search(q='optics', page=2, page_size=4)
+        self.assertTrue(first['has_more'])
+        self.assertFalse(second['has_more'])
+        self.assertEqual(len(first['results']) + len(second['results']), 7)
+        ranks = [result['rank'] for result in first['results'] + second['results']]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+
+    def test_invalid_query(self):
+        for params in ({}, {'q': 'optics', 'page_size': 51}, {'q': 'optics', 'page': 100}):
+            self.assertEqual(self.client.get('/api/v1/search/', params).status_code, 400)
+        self.assertEqual(self.search(q='--')['results'], [])
@@ -0,0 +1,67 @@
+"""
+Primary/replica database routing.
+
+Writes always go to the "default" (primary) database. Reads go to one of the
+aliases in settings.DATABASE_REPLICAS, but only while the current request has
+been marked replica-safe by ReplicaRoutingMiddleware. Everything outside a
+request (management commands, shell, migrations) reads from primary.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+_read_from_replica = ContextVar('read_from_replica', default=False)
+
+
+def read_from_replica(enabled):
+    """Mark the current context as replica-safe. Returns a token for reset."""
+    return _read_from_replica.set(enabled)
+
+
+def reset_read_from_replica(token):
+    _read_from_replica.reset(token)
+
+
+@contextmanager
+def read_from_primary():
+    """Read from primary inside the block, e.g. where replica lag would lose changes."""
+    token = _read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        _read_from_replica.reset(token)
+
+
+def _pin_key(user_id):
+    return f'db-pin:{user_id}'
+
+
+def pin_to_primary(user_id):
+    """Keep the user's reads on primary for DATABASE_REPLICA_PIN_SECONDS."""
+    cache.set(_pin_key(user_id), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned_to_primary(user_id):
+    return bool(cache.get(_pin_key(user_id)))
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        replicas = settings.DATABASE_REPLICAS
+        if replicas and _read_from_replica.get():
+            return random.choice(replicas)
+        return 'default'
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as primary.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == 'default'
@@ -0,0 +1,81 @@
+"""
+Set-based deletion of exams, timetables and user accounts.
+
+Model.delete() runs Django's collector, which loads every dependent row
+(each ExamChapter, Period and M2M through-row) into Python so it can send
+delete signals for it. Here dependent rows are removed with one
+DELETE ... WHERE statement per table, children first, inside a single
+transaction. The signal handlers' work (data versions, tombstones) is done
+once per deleted parent instead.
+"""
+from django.db import connection, transaction
+
+from exams.models import Exam, ExamChapter, ProgressEvent, DailyProgress
+from homeworks.models import Homework, Reminder
+from sync.models import DataVersion, Tombstone
+from sync.tombstones import record_deletion
+from sync.versions import bump_version
+from timetable.models import Timetable, Period
+
+
+def table(model):
+    return connection.ops.quote_name(model._meta.db_table)
+
+
+def delete_where(model, condition, params):
+    """
+    DELETE the model's rows matching an SQL condition in one statement.
+
+    For models with delete signals or dependent rows, whose QuerySet.delete()
+    would load every row through the collector. Models with neither are
+    deleted with QuerySet.delete(), which Django runs as a single DELETE
+    itself.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table(model)} WHERE {condition}', params)
+        return cursor.rowcount
+
+
+def delete_exam(exam):
+    with transaction.atomic():
+        ProgressEvent.objects.filter(exam_id=exam.pk).delete()
+        DailyProgress.objects.filter(exam_id=exam.pk).delete()
+        delete_where(ExamChapter, 'exam_id = %s', [exam.pk])
+        Exam.subjects.through.objects.filter(exam_id=exam.pk).delete()
+        delete_where(Exam, 'id = %s', [exam.pk])
+        # A sync client drops the exam's chapters with the exam.
+        bump_version(exam.user_id, DataVersion.EXAMS)
+        record_deletion(exam.user_id, Tombstone.EXAM, exam.pk)
+
+
+def delete_timetable(timetable):
+    with transaction.atomic():
+        delete_where(Period, 'timetable_id = %s', [timetable.pk])
+        delete_where(Timetable, 'id = %s', [timetable.pk])
+        bump_version(timetable.user_id, DataVersion.TIMETABLE)
+        record_deletion(timetable.user_id, Tombstone.TIMETABLE, timetable.pk)
+
+
+def purge_user(user):
+    """
+    Delete a user and everything they own. The large per-user tables are
+    emptied with set-based deletes first, so the collector run by
+    user.delete() only has the remaining small relations (sessions, admin
+    log, tokens) to load. No versions or tombstones are kept for a user
+    who no longer exists.
+    """
+    users_exams = f'exam_id IN (SELECT id FROM {table(Exam)} WHERE user_id = %s)'
+    users_timetables = f'timetable_id IN (SELECT id FROM {table(Timetable)} WHERE user_id = %s)'
+    with transaction.atomic():
+        ProgressEvent.objects.filter(exam__user_id=user.pk).delete()
+        DailyProgress.objects.filter(exam__user_id=user.pk).delete()
+        delete_where(ExamChapter, users_exams, [user.pk])
+        Exam.subjects.through.objects.filter(exam__user_id=user.pk).delete()
+        delete_where(Exam, 'user_id = %s', [user.pk])
+        delete_where(Period, users_timetables, [user.pk])
+        delete_where(Timetable, 'user_id = %s', [user.pk])
+        Reminder.objects.filter(user_id=user.pk).delete()
+        delete_where(Homework, 'user_id = %s', [user.pk])
+        Tombstone.objects.filter(user_id=user.pk).delete()
+        DataVersion.objects.filter(user_id=user.pk).delete()
+        user.delete()
@@ -0,0 +1,72 @@
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+
+from .db_routers import (
+    is_pinned_to_primary,
+    pin_to_primary,
+    read_from_replica,
+    reset_read_from_replica,
+)
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Send reads of safe requests to replicas, with read-your-writes stickiness.
+
+    A successful write pins its user to primary for a short window, so a GET
+    right after a PATCH never sees the replica's older state. The user is
+    identified before the view runs from the JWT (no DB hit) or the session.
+    Other credentials, such as Basic auth, would need a DB lookup to identify,
+    so those requests always read from primary.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.jwt_authentication = JWTAuthentication()
+
+    def __call__(self, request):
+        replica_safe = False
+        if settings.DATABASE_REPLICAS and request.method in SAFE_METHODS:
+            replica_safe = self.is_replica_safe(request)
+
+        token = read_from_replica(replica_safe)
+        try:
+            response = self.get_response(request)
+        finally:
+            reset_read_from_replica(token)
+
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            user = getattr(request, 'user', None)
+            # A purged account has no pk left to pin.
+            if user is not None and user.is_authenticated and user.pk is not None:
+                pin_to_primary(user.pk)
+
+        return response
+
+    def is_replica_safe(self, request):
+        header = self.jwt_authentication.get_header(request)
+        if header is not None:
+            raw_token = self.jwt_authentication.get_raw_token(header)
+            if raw_token is None:
+                # Not a JWT: the user can't be checked against its pin.
+                return False
+            try:
+                validated_token = self.jwt_authentication.get_validated_token(raw_token)
+                user_id = validated_token[jwt_settings.USER_ID_CLAIM]
+            except (InvalidToken, TokenError, KeyError):
+                # Rejected by the view before it reads anything.
+                return True
+            return not is_pinned_to_primary(user_id)
+
+        # No sessions under the API-only profile.
+        if hasattr(request, 'session') and settings.SESSION_COOKIE_NAME in request.COOKIES:
+            user_id = request.session.get(SESSION_KEY)
+            return user_id is None or not is_pinned_to_primary(user_id)
+
+        return True
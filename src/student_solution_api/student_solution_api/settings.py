@@ -1,4 +1,5 @@
 import os
+from datetime import timedelta
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -29,6 +30,14 @@ CORS_ALLOW_HEADERS = [
     "content-type",
     "authorization",
     "x-requested-with",
+    "if-none-match",
+    "x-profile",
+]
+
+CORS_EXPOSE_HEADERS = [
+    "etag",
+    "server-timing",
+    "x-profile-report",
 ]
 
 INSTALLED_APPS = [
@@ -46,9 +55,14 @@ INSTALLED_APPS = [
     'timetable',
     'homeworks',
     'exams',
+    'monitoring',
+    'sync',
+    'search',
 ]
 
 MIDDLEWARE = [
+    'monitoring.middleware.ProfilingMiddleware',
+    'monitoring.middleware.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -57,7 +71,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-
+    'student_solution_api.middleware.ReplicaRoutingMiddleware',
 ]
 
 ROOT_URLCONF = 'student_solution_api.urls'
@@ -65,7 +79,7 @@ ROOT_URLCONF = 'student_solution_api.urls'
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
-        'DIRS': [],
+        'DIRS': [BASE_DIR / 'templates'],
         'APP_DIRS': True,
         'OPTIONS': {
             'context_processors': [
@@ -80,16 +94,63 @@ TEMPLATES = [
 WSGI_APPLICATION = 'student_solution_api.wsgi.application'
 
 
-DATABASES = {
-    "default": {
-        'ENGINE': 'django.db.backends.postgresql',
-        'NAME': os.environ.get('DB_NAME'),
-        'USER': os.environ.get('DB_USER'),
-        'PASSWORD': os.environ.get('DB_PASSWORD'),
-        'HOST': os.environ.get('DB_HOST'),
-        'PORT': os.environ.get('DB_PORT'),
+if os.environ.get('DB_ENGINE') == 'sqlite':
+    # Local runs: two SQLite files stand in for primary and replica. Point
+    # DB_REPLICA_NAME at a copy of the primary file to simulate replica lag.
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+        },
+        'replica': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_REPLICA_NAME', BASE_DIR / 'db.sqlite3'),
+            'TEST': {'MIRROR': 'default'},
+        },
+    }
+else:
+    DATABASES = {
+        "default": {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME'),
+            'USER': os.environ.get('DB_USER'),
+            'PASSWORD': os.environ.get('DB_PASSWORD'),
+            'HOST': os.environ.get('DB_HOST'),
+            'PORT': os.environ.get('DB_PORT'),
+        }
+    }
+
+    # Comma separated replica hosts, e.g. DB_REPLICA_HOSTS=replica-1,replica-2
+    replica_hosts = [host for host in os.environ.get('DB_REPLICA_HOSTS', '').split(',') if host]
+    for index, host in enumerate(replica_hosts, start=1):
+        DATABASES[f'replica_{index}'] = {
+            **DATABASES['default'],
+            'HOST': host,
+            'TEST': {'MIRROR': 'default'},
+        }
+
+# Aliases GET requests may read from; writes always go to "default". The test
+# runner turns routing off unless a test enables it.
+DATABASE_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
+DATABASE_ROUTERS = ['student_solution_api.db_routers.PrimaryReplicaRouter']
+
+TEST_RUNNER = 'student_solution_api.test_runner.TestRunner'
+
+# Seconds a user's reads stay on primary after one of their writes.
+DATABASE_REPLICA_PIN_SECONDS = int(os.environ.get('DB_REPLICA_PIN_SECONDS', '5'))
+
+
+# Replica pins and other short-lived shared state. With several workers they
+# need a cache all of them see, e.g. REDIS_URL=redis://cache:6379/0; the
+# default is per process and only fits a single worker.
+if os.environ.get('REDIS_URL'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ['REDIS_URL'],
+        }
     }
-}
 
 
 AUTH_PASSWORD_VALIDATORS = [
@@ -131,9 +192,39 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
+        # Sub-requests of a batch, as the batch's user
+        'api.authentication.BatchAuthentication',
         'rest_framework.authentication.BasicAuthentication',
         'rest_framework.authentication.SessionAuthentication',
 
         'rest_framework_simplejwt.authentication.JWTAuthentication',
-    ]
+    ],
+    # orjson-backed when installed, stdlib json otherwise.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+    'DEFAULT_PARSER_CLASSES': [
+        'api.parsers.FastJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
+}
+
+
+# Sync cursors older than this need a full sync; tombstones are purged after it.
+SYNC_TOMBSTONE_RETENTION = timedelta(days=int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', '90')))
+
+# Homework reminder windows: name -> (first, last) days before the due date.
+HOMEWORK_REMINDER_WINDOWS = {
+    'due_today': (0, 0),
+    'due_tomorrow': (1, 1),
+    'due_this_week': (2, 7),
 }
+
+# Seconds between each worker's checks for changed subjects (see
+# timetable.typeahead); 0 turns the background checks off.
+SUBJECT_INDEX_REFRESH_SECONDS = int(os.environ.get('SUBJECT_INDEX_REFRESH_SECONDS', '1'))
+
+# Seconds a staff profiling token (see the profile_token command) stays valid.
+PROFILING_TOKEN_MAX_AGE = int(os.environ.get('PROFILING_TOKEN_MAX_AGE', '3600'))
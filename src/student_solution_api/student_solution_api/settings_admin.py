@@ -0,0 +1,14 @@
+"""
+Admin deployment profile, for workers serving only /admin/:
+DJANGO_SETTINGS_MODULE=student_solution_api.settings_admin
+
+Keeps every app (so migrate can run here) but routes only the admin, so the
+API views are never imported. The browser-facing admin needs no CORS.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import MIDDLEWARE
+
+
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware != 'corsheaders.middleware.CorsMiddleware']
+
+ROOT_URLCONF = 'student_solution_api.urls_admin'
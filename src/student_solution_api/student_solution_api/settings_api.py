@@ -0,0 +1,49 @@
+"""
+API-only profile, for workers serving /api/v1/ behind JWT authentication:
+DJANGO_SETTINGS_MODULE=student_solution_api.settings_api
+
+Leaves out the admin and what only it needs (sessions, messages, static
+files, templates, CSRF and clickjacking protection), so workers import less
+at startup and run fewer middleware per request. Those apps' tables are
+still migrated by the default or admin profile; measure the difference with
+the measure_startup command.
+"""
+from .settings import *  # noqa: F401,F403
+from .settings import INSTALLED_APPS, MIDDLEWARE, REST_FRAMEWORK
+
+
+ADMIN_ONLY_APPS = [
+    'django.contrib.admin',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    'django.contrib.staticfiles',
+]
+
+ADMIN_ONLY_MIDDLEWARE = [
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+INSTALLED_APPS = [app for app in INSTALLED_APPS if app not in ADMIN_ONLY_APPS]
+
+MIDDLEWARE = [middleware for middleware in MIDDLEWARE if middleware not in ADMIN_ONLY_MIDDLEWARE]
+
+ROOT_URLCONF = 'student_solution_api.urls_api'
+
+TEMPLATES = []
+
+REST_FRAMEWORK = {
+    **REST_FRAMEWORK,
+    'DEFAULT_AUTHENTICATION_CLASSES': [
+        # Sub-requests of a batch, as the batch's user
+        'api.authentication.BatchAuthentication',
+        'rest_framework_simplejwt.authentication.JWTAuthentication',
+    ],
+    # The browsable API needs templates.
+    'DEFAULT_RENDERER_CLASSES': [
+        'api.renderers.FastJSONRenderer',
+    ],
+}
@@ -0,0 +1,21 @@
+"""
+Test runner with replica routing and background refreshes off.
+
+Test cases run inside a transaction on "default" that replica connections
+and other threads cannot see, so reads stay on primary unless a test enables
+replicas with override_settings(DATABASE_REPLICAS=[...]), and the typeahead
+index is only refreshed when a test asks for it.
+"""
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self.primary_only = override_settings(DATABASE_REPLICAS=[], SUBJECT_INDEX_REFRESH_SECONDS=0)
+        self.primary_only.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self.primary_only.disable()
+        super().teardown_test_environment(**kwargs)
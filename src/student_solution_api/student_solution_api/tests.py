@@ -0,0 +1,74 @@
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+
+from exams.models import Exam, Chapter, ExamChapter
+from homeworks.models import Homework
+from sync.models import DataVersion, Tombstone
+from timetable.models import Subject, Day, Timetable, Period
+
+
+class DeletionTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.subject = Subject.objects.create(name='Physics')
+        self.day = Day.objects.create(name='monday')
+        self.client.force_authenticate(self.user)
+
+    def create_exam(self, chapters):
+        exam = Exam.objects.create(title='Finals', user=self.user)
+        exam.subjects.add(self.subject)
+        ExamChapter.objects.bulk_create([
+            ExamChapter(exam=exam, chapter=Chapter.objects.create(
+                title=f'Chapter {exam.id}-{number}', chapter_number=number, subject=self.subject
+            ))
+            for number in range(1, chapters + 1)
+        ])
+        return exam
+
+    def delete_exam_queries(self, chapters):
+        exam = self.create_exam(chapters)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.delete(f'/api/v1/exams/manage/{exam.id}/')
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_exam_delete_is_set_based(self):
+        self.assertEqual(self.delete_exam_queries(2), self.delete_exam_queries(50))
+        self.assertFalse(ExamChapter.objects.exists())
+        self.assertFalse(Exam.subjects.through.objects.exists())
+        self.assertEqual(Tombstone.objects.filter(resource=Tombstone.EXAM).count(), 2)
+        self.assertFalse(Tombstone.objects.filter(resource=Tombstone.EXAM_CHAPTER).exists())
+
+    def test_timetable_delete(self):
+        timetable = Timetable.objects.create(user=self.user, name='Term 1')
+        for order in range(1, 6):
+            Period.objects.create(timetable=timetable, day=self.day, order=order, subject=self.subject)
+        etag = self.client.get('/api/v1/timetable/manage/')['ETag']
+
+        response = self.client.delete('/api/v1/timetable/manage/')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(Period.objects.exists())
+        self.assertEqual(
+            list(Tombstone.objects.values_list('resource', 'object_id')), [(Tombstone.TIMETABLE, timetable.id)]
+        )
+        self.assertNotEqual(self.client.get('/api/v1/timetable/manage/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_purge_user(self):
+        other = User.objects.create_user(username='other', password='secret')
+        Homework.objects.create(title='Essay', due_date=date(2030, 1, 1), user=other)
+        self.create_exam(3)
+        timetable = Timetable.objects.create(user=self.user, name='Term 1')
+        Period.objects.create(timetable=timetable, day=self.day, order=1, subject=self.subject)
+        Homework.objects.create(title='Essay', due_date=date(2030, 1, 1), user=self.user)
+
+        response = self.client.delete('/api/v1/auth/manage/', {'purge': True}, format='json')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(User.objects.filter(username='student').exists())
+        for model in (Exam, ExamChapter, Timetable, Period, Tombstone):
+            self.assertFalse(model.objects.exists(), model)
+        self.assertEqual(list(Homework.objects.values_list('user_id', flat=True)), [other.id])
+        self.assertFalse(DataVersion.objects.exclude(user=other).exclude(user=None).exists())
@@ -1,16 +1,13 @@
-from django.contrib import admin
 from django.conf import settings
-from django.urls import include, path
 from django.conf.urls.static import static
 
+from .urls_admin import urlpatterns as admin_urlpatterns
+from .urls_api import urlpatterns as api_urlpatterns
 
-urlpatterns = [
-    path('admin/', admin.site.urls),
-    path('api/v1/auth/', include('api.v1.auth.urls', namespace='auth')),
-    path('api/v1/timetable/', include('api.v1.timetable.urls', namespace='timetable')),
-    path('api/v1/homeworks/', include('api.v1.homeworks.urls', namespace='homeworks')),
-    path('api/v1/exams/', include('api.v1.exams.urls', namespace='exams')),
-]
+
+# Both the admin and the API; the settings_api and settings_admin profiles
+# serve one each.
+urlpatterns = admin_urlpatterns + api_urlpatterns
 
 if settings.DEBUG:
-    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
+    urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
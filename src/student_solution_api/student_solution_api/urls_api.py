@@ -0,0 +1,14 @@
+from django.urls import include, path
+
+
+urlpatterns = [
+    path('api/v1/auth/', include('api.v1.auth.urls', namespace='auth')),
+    path('api/v1/timetable/', include('api.v1.timetable.urls', namespace='timetable')),
+    path('api/v1/homeworks/', include('api.v1.homeworks.urls', namespace='homeworks')),
+    path('api/v1/exams/', include('api.v1.exams.urls', namespace='exams')),
+    path('api/v1/batch/', include('api.v1.batch.urls', namespace='batch')),
+    path('api/v1/export/', include('api.v1.export.urls', namespace='export')),
+    path('api/v1/search/', include('api.v1.search.urls', namespace='search')),
+    path('api/v1/sync/', include('api.v1.sync.urls', namespace='sync')),
+    path('api/v1/monitoring/', include('api.v1.monitoring.urls', namespace='monitoring')),
+]
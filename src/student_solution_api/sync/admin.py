@@ -0,0 +1,22 @@
+from django.contrib import admin
+
+from student_solution_api.admin_tools import EstimatedCountPaginator
+from .models import DataVersion, Tombstone
+
+
+@admin.register(DataVersion)
+class DataVersionAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'resource', 'version']
+    list_filter = ['resource']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+
+
+@admin.register(Tombstone)
+class TombstoneAdmin(admin.ModelAdmin):
+    list_display = ['id', 'user', 'resource', 'object_id', 'deleted_at']
+    list_filter = ['resource']
+    list_select_related = ['user']
+    raw_id_fields = ['user']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
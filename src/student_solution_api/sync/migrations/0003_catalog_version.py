@@ -0,0 +1,30 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:32
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0002_tombstone'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='dataversion',
+            name='resource',
+            field=models.CharField(choices=[('exams', 'Exams'), ('homeworks', 'Homeworks'), ('timetable', 'Timetable'), ('catalog', 'Catalog')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='dataversion',
+            name='user',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='data_versions', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='dataversion',
+            constraint=models.UniqueConstraint(condition=models.Q(('user', None)), fields=('resource',), name='data_version_global'),
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import models
+from django.contrib.auth.models import User
+
+
+class DataVersion(models.Model):
+    """
+    Per-user counter bumped on every write to one of the user's resources.
+    The catalog counter has no user: it is bumped on every write to the
+    shared subjects and chapters, whose names the users' resources embed.
+    """
+    EXAMS = 'exams'
+    HOMEWORKS = 'homeworks'
+    TIMETABLE = 'timetable'
+    CATALOG = 'catalog'
+    RESOURCES = [
+        (EXAMS, 'Exams'),
+        (HOMEWORKS, 'Homeworks'),
+        (TIMETABLE, 'Timetable'),
+        (CATALOG, 'Catalog'),
+    ]
+
+    # Null for the catalog
+    user = models.ForeignKey(User, on_delete=models.CASCADE, null=True, blank=True, related_name='data_versions')
+    resource = models.CharField(max_length=20, choices=RESOURCES)
+    version = models.PositiveBigIntegerField(default=1)
+
+    class Meta:
+        unique_together = ('user', 'resource')
+        constraints = [
+            models.UniqueConstraint(fields=['resource'], condition=models.Q(user=None), name='data_version_global'),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} - {self.resource} v{self.version}"
+
+
+class Tombstone(models.Model):
+    """Hard-deleted row, kept so sync clients can drop their local copy"""
+    EXAM = 'exam'
+    EXAM_CHAPTER = 'exam_chapter'
+    HOMEWORK = 'homework'
+    TIMETABLE = 'timetable'
+    PERIOD = 'period'
+    RESOURCES = [
+        (EXAM, 'Exam'),
+        (EXAM_CHAPTER, 'Exam chapter'),
+        (HOMEWORK, 'Homework'),
+        (TIMETABLE, 'Timetable'),
+        (PERIOD, 'Period'),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='tombstones')
+    resource = models.CharField(max_length=20, choices=RESOURCES)
+    object_id = models.PositiveBigIntegerField()
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['user', 'deleted_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.resource} {self.object_id}"
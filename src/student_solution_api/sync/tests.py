@@ -0,0 +1,191 @@
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from exams.models import Exam, Chapter, ExamChapter
+from homeworks.models import Homework
+from sync.models import Tombstone
+from timetable.models import Subject, Day, Timetable, Period
+
+
+class ConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.exam = Exam.objects.create(title='Finals', user=self.user)
+        subject = Subject.objects.create(name='Physics')
+        self.chapter = Chapter.objects.create(title='Optics', chapter_number=1, subject=subject)
+        ExamChapter.objects.create(exam=self.exam, chapter=self.chapter)
+        self.homework = Homework.objects.create(title='Worksheet', due_date=date(2030, 1, 1), user=self.user)
+        self.timetable = Timetable.objects.create(user=self.user, name='Term 1')
+        self.period = Period.objects.create(
+            timetable=self.timetable, day=Day.objects.create(name='monday'), order=1, subject=subject
+        )
+        self.client.force_authenticate(self.user)
+
+    def assertNotModified(self, url, etag, queries=1):
+        # The version lookup, and the ownership check for one exam.
+        with self.assertNumQueries(queries):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+    def assertModified(self, url, etag):
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag']
+
+    def test_exam_detail(self):
+        url = f'/api/v1/exams/manage/{self.exam.id}/'
+        etag = self.client.get(url)['ETag']
+        self.assertNotModified(url, etag, queries=2)
+
+        # The user's current tag does not stand in for exams they do not have.
+        other = Exam.objects.create(title='Other', user=User.objects.create_user(username='other'))
+        for missing in (f'/api/v1/exams/manage/{other.id}/', f'/api/v1/exams/manage/{other.id + 1}/',
+                        f'{url}subjects/{self.chapter.subject_id + 1}/chapters/'):
+            self.assertEqual(self.client.get(missing, HTTP_IF_NONE_MATCH=etag).status_code, 404)
+
+        self.client.patch(url, {'chapter_id': self.chapter.id, 'is_completed': True}, format='json')
+        etag = self.assertModified(url, etag)
+
+        self.exam.subjects.add(Subject.objects.create(name='Chemistry'))
+        self.assertModified(url, etag)
+
+    def test_catalog_renames(self):
+        urls = ['/api/v1/exams/view/?expand=subjects', f'/api/v1/exams/manage/{self.exam.id}/',
+                '/api/v1/homeworks/manage/', '/api/v1/timetable/manage/']
+        etags = [self.client.get(url)['ETag'] for url in urls]
+        # Subjects and chapters are shared: renaming one changes no user's counters.
+        subject = self.chapter.subject
+        subject.name = 'Applied Physics'
+        subject.save()
+        etags = [self.assertModified(url, etag) for url, etag in zip(urls, etags)]
+
+        self.chapter.title = 'Geometric optics'
+        self.chapter.save()
+        self.assertModified(urls[1], etags[1])
+
+    def test_exam_list(self):
+        url = '/api/v1/exams/view/'
+        etag = self.client.get(url)['ETag']
+        self.assertNotModified(url, etag)
+
+        self.client.delete(f'/api/v1/exams/manage/{self.exam.id}/')
+        self.assertModified(url, etag)
+
+    def test_homeworks(self):
+        url = '/api/v1/homeworks/manage/'
+        etag = self.client.get(url)['ETag']
+        self.assertNotModified(url, etag)
+
+        self.client.put(url, {'id': self.homework.id}, format='json')
+        self.assertModified(url, etag)
+
+    def test_timetable(self):
+        url = '/api/v1/timetable/manage/'
+        etag = self.client.get(url)['ETag']
+        self.assertNotModified(url, etag)
+
+        self.period.delete()
+        self.assertModified(url, etag)
+
+    def test_other_users_writes_keep_etag(self):
+        url = '/api/v1/homeworks/manage/'
+        etag = self.client.get(url)['ETag']
+
+        other = User.objects.create_user(username='other', password='secret')
+        Homework.objects.create(title='Essay', due_date=date(2030, 1, 1), user=other)
+        self.assertNotModified(url, etag)
+
+    def test_deleting_user_removes_versions(self):
+        self.client.get('/api/v1/homeworks/manage/')
+        self.user.delete()
+        self.assertFalse(User.objects.filter(username='student').exists())
+
+
+class SyncTests(APITestCase):
+    url = '/api/v1/sync/'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='secret')
+        self.subject = Subject.objects.create(name='Physics')
+        self.exam = Exam.objects.create(title='Finals', user=self.user)
+        self.exam.subjects.add(self.subject)
+        self.chapter = Chapter.objects.create(title='Optics', chapter_number=1, subject=self.subject)
+        self.exam_chapter = ExamChapter.objects.create(exam=self.exam, chapter=self.chapter)
+        self.homework = Homework.objects.create(title='Worksheet', due_date=date(2030, 1, 1), user=self.user)
+        self.timetable = Timetable.objects.create(user=self.user, name='Term 1')
+        self.period = Period.objects.create(
+            timetable=self.timetable, day=Day.objects.create(name='monday'), order=1, subject=self.subject
+        )
+        self.client.force_authenticate(self.user)
+
+    def sync(self, since=None):
+        response = self.client.get(self.url, {'since': since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.data['data']
+
+    def age_rows(self):
+        """Move every row and tombstone out of the cursor overlap window."""
+        past = timezone.now() - timedelta(minutes=10)
+        for model in (Exam, ExamChapter, Homework, Timetable, Period):
+            model.objects.update(updated_at=past)
+        Tombstone.objects.update(deleted_at=past)
+
+    def test_full_sync(self):
+        data = self.sync()
+        self.assertTrue(data['full'])
+        self.assertEqual(data['changes']['exams'][0]['subjects'], [{'id': self.subject.id, 'name': 'Physics'}])
+        self.assertEqual(data['changes']['exam_chapters'][0]['title'], 'Optics')
+        self.assertEqual(data['changes']['homeworks'][0]['id'], self.homework.id)
+        self.assertEqual(data['changes']['periods'][0]['subject_name'], 'Physics')
+
+    def test_quiet_sync_is_empty(self):
+        self.age_rows()
+        data = self.sync(self.sync()['cursor'])
+        self.assertFalse(data['full'])
+        self.assertTrue(all(rows == [] for rows in data['changes'].values()))
+        self.assertTrue(all(ids == [] for ids in data['deleted'].values()))
+
+    def test_changes_and_deletions_since_cursor(self):
+        self.age_rows()
+        cursor = self.sync()['cursor']
+
+        self.client.patch(
+            f'/api/v1/exams/manage/{self.exam.id}/',
+            {'chapter_id': self.chapter.id, 'is_completed': True},
+            format='json',
+        )
+        self.client.delete('/api/v1/homeworks/manage/', {'id': self.homework.id}, format='json')
+        period_id = self.period.id
+        self.period.delete()
+
+        data = self.sync(cursor)
+        self.assertEqual([row['id'] for row in data['changes']['exam_chapters']], [self.exam_chapter.id])
+        self.assertTrue(data['changes']['exam_chapters'][0]['is_completed'])
+        self.assertEqual(data['changes']['exams'], [])
+        self.assertEqual(data['deleted']['homeworks'], [self.homework.id])
+        self.assertEqual(data['deleted']['periods'], [period_id])
+
+    def test_exam_deletion_leaves_one_tombstone(self):
+        self.age_rows()
+        cursor = self.sync()['cursor']
+        exam_id = self.exam.id
+        self.client.delete(f'/api/v1/exams/manage/{exam_id}/')
+
+        data = self.sync(cursor)
+        self.assertEqual(data['deleted']['exams'], [exam_id])
+        self.assertEqual(data['deleted']['exam_chapters'], [])
+
+    def test_expired_cursor_gets_full_sync(self):
+        since = timezone.now() - settings.SYNC_TOMBSTONE_RETENTION - timedelta(days=1)
+        self.assertTrue(self.sync(since.isoformat())['full'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'since': 'yesterday'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,21 @@
+from django.conf import settings
+from django.utils import timezone
+
+from .models import Tombstone
+
+
+def record_deletion(user_id, resource, object_id):
+    Tombstone.objects.create(user_id=user_id, resource=resource, object_id=object_id)
+
+
+def record_deletions(user_id, resource, object_ids):
+    """Tombstones for rows removed with queryset or raw SQL deletes, which send no signals."""
+    Tombstone.objects.bulk_create([
+        Tombstone(user_id=user_id, resource=resource, object_id=object_id)
+        for object_id in object_ids
+    ])
+
+
+def tombstone_horizon():
+    """Tombstones older than this are purged; older sync cursors need a full sync."""
+    return timezone.now() - settings.SYNC_TOMBSTONE_RETENTION
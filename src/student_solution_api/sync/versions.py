@@ -0,0 +1,38 @@
+"""
+Per-user data versions for conditional GETs.
+
+Model signals in the exams, homeworks and timetable apps bump the owning
+user's counter on every save or delete, and the catalog counter on every
+save or delete of a subject or chapter. Code that writes with queryset
+update()/bulk_create() or raw SQL skips those signals and must call
+bump_version() itself, set updated_at, and record tombstones for deleted
+rows (see sync.tombstones).
+"""
+from django.db.models import F, Model, Q
+
+from .models import DataVersion
+
+
+def get_versions(user_id, resources):
+    """Current version per resource, the catalog's among them; 0 for resources never written."""
+    versions = dict.fromkeys(resources, 0)
+    rows = Q(user_id=user_id, resource__in=[resource for resource in resources if resource != DataVersion.CATALOG])
+    if DataVersion.CATALOG in resources:
+        rows |= Q(user=None, resource=DataVersion.CATALOG)
+    versions.update(DataVersion.objects.filter(rows).values_list('resource', 'version'))
+    return versions
+
+
+def bump_version(user_id, resource):
+    """Bump the user's counter for resource; user_id None for the catalog."""
+    updated = DataVersion.objects.filter(user_id=user_id, resource=resource).update(version=F('version') + 1)
+    if not updated:
+        _, created = DataVersion.objects.get_or_create(user_id=user_id, resource=resource)
+        if not created:
+            DataVersion.objects.filter(user_id=user_id, resource=resource).update(version=F('version') + 1)
+
+
+def deleted_via(origin, *models):
+    """Whether a post_delete signal's origin is an instance or queryset of one of models."""
+    origin_model = origin.__class__ if isinstance(origin, Model) else getattr(origin, 'model', None)
+    return origin_model in models
@@ -1,4 +1,5 @@
 from django.contrib import admin
+from student_solution_api.admin_tools import EstimatedCountPaginator, IdRangeListFilter
 from .models import Subject, Day, Period, Timetable
 
 
@@ -18,12 +19,22 @@ class DayAdmin(admin.ModelAdmin):
 @admin.register(Period)
 class PeriodAdmin(admin.ModelAdmin):
     list_display = ['id', 'timetable', 'day', 'order', 'subject']
-    list_filter = ['day', 'timetable']
+    list_filter = ['day', ('timetable', IdRangeListFilter)]
+    # Timetable.__str__ shows the username
+    list_select_related = ['timetable__user', 'day', 'subject']
     search_fields = ['subject__name']
-    ordering = ['timetable', 'day__id', 'order']
+    autocomplete_fields = ['timetable', 'subject']
+    # Same columns as the (timetable, day, order) unique index
+    ordering = ['timetable_id', 'day_id', 'order']
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(Timetable)
 class TimetableAdmin(admin.ModelAdmin):
     list_display = ['id', 'name', 'user']
+    list_filter = [('user', IdRangeListFilter)]
+    list_select_related = ['user']
+    search_fields = ['name', 'user__username']
+    autocomplete_fields = ['user']
     ordering = ['name']
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:04
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetable', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='period',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='timetable',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddIndex(
+            model_name='period',
+            index=models.Index(fields=['timetable', 'updated_at'], name='timetable_p_timetab_3395b5_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='timetable',
+            index=models.Index(fields=['user', 'updated_at'], name='timetable_t_user_id_80e570_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-19 13:12
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetable', '0002_updated_at'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='period',
+            options={'ordering': ['day_id', 'order']},
+        ),
+    ]
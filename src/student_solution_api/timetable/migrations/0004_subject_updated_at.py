@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-19 14:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('timetable', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subject',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+    ]
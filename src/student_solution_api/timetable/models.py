@@ -3,6 +3,7 @@ from django.contrib.auth.models import User
 
 class Subject(models.Model):
     name = models.CharField(max_length=100, unique=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
     
     def __str__(self):
         return self.name
@@ -32,22 +33,31 @@ class Day(models.Model):
 class Timetable(models.Model):
     name = models.CharField(max_length=200)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='timetables')
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.user.username} - {self.name}"
     
     class Meta:
         ordering = ['name']
+        indexes = [
+            models.Index(fields=['user', 'updated_at']),
+        ]
 
 class Period(models.Model):
     timetable = models.ForeignKey(Timetable, on_delete=models.CASCADE, related_name='periods')
     day = models.ForeignKey(Day, on_delete=models.CASCADE)
     order = models.IntegerField()
     subject = models.ForeignKey(Subject, on_delete=models.CASCADE)
+    updated_at = models.DateTimeField(auto_now=True)
     
     def __str__(self):
         return f"{self.timetable.name} - {self.day.name} - Period {self.order}: {self.subject.name}"
     
     class Meta:
-        ordering = ['day__id', 'order']
-        unique_together = ['timetable', 'day', 'order']
\ No newline at end of file
+        # Served by the (timetable, day, order) unique index, without joining Day
+        ordering = ['day_id', 'order']
+        unique_together = ['timetable', 'day', 'order']
+        indexes = [
+            models.Index(fields=['timetable', 'updated_at']),
+        ]
\ No newline at end of file
@@ -0,0 +1,43 @@
+from django.contrib.auth.models import User
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from sync.models import DataVersion, Tombstone
+from sync.tombstones import record_deletion
+from sync.versions import bump_version, deleted_via
+from .models import Subject, Timetable, Period
+from .typeahead import invalidate_subject_index
+
+
+@receiver(post_save, sender=Timetable)
+def timetable_saved(sender, instance, **kwargs):
+    bump_version(instance.user_id, DataVersion.TIMETABLE)
+
+
+@receiver(post_delete, sender=Timetable)
+def timetable_deleted(sender, instance, origin=None, **kwargs):
+    if not deleted_via(origin, User):
+        bump_version(instance.user_id, DataVersion.TIMETABLE)
+        record_deletion(instance.user_id, Tombstone.TIMETABLE, instance.pk)
+
+
+@receiver(post_save, sender=Period)
+def period_saved(sender, instance, **kwargs):
+    bump_version(instance.timetable.user_id, DataVersion.TIMETABLE)
+
+
+@receiver(post_delete, sender=Period)
+def period_deleted(sender, instance, origin=None, **kwargs):
+    # Cascades from timetables are covered by timetable_deleted.
+    if not deleted_via(origin, Timetable, User):
+        user_id = instance.timetable.user_id
+        bump_version(user_id, DataVersion.TIMETABLE)
+        record_deletion(user_id, Tombstone.PERIOD, instance.pk)
+
+
+@receiver(post_save, sender=Subject)
+@receiver(post_delete, sender=Subject)
+def subject_changed(sender, **kwargs):
+    # Exams, homework and timetables embed subject names.
+    bump_version(None, DataVersion.CATALOG)
+    invalidate_subject_index()
@@ -1,3 +1,129 @@
-from django.test import TestCase
+import threading
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from api.v1.timetable.serializers import TimetableManageSerializer
+from timetable.models import Subject, Day, Timetable, Period
+from timetable.typeahead import SubjectIndex, SubjectIndexHolder, subject_index
+
+
+def legacy_timetable_representation(timetable):
+    """The timetable as TimetableManageSerializer built it from model instances"""
+    days_dict = {}
+    for period in timetable.periods.select_related('day', 'subject'):
+        day_data = days_dict.setdefault(period.day.pk, {
+            'id': period.day.pk,
+            'name': period.day.get_name_display(),
+            'periods': []
+        })
+        day_data['periods'].append({'order': period.order, 'subject': period.subject.name})
+    for day_data in days_dict.values():
+        day_data['periods'].sort(key=lambda x: x['order'])
+    return {
+        'id': timetable.id,
+        'name': timetable.name,
+        'days': sorted(days_dict.values(), key=lambda x: x['id'])
+    }
+
+
+class TimetableSerializerTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='student', password='secret')
+        self.timetable = Timetable.objects.create(user=user, name='Term 1')
+        subjects = [Subject.objects.create(name=name) for name in ('Physics', 'Chemistry', 'Biology')]
+        for name, _ in reversed(Day.WEEKDAYS[:5]):
+            day = Day.objects.create(name=name)
+            for order in range(6, 0, -1):
+                Period.objects.create(timetable=self.timetable, day=day, order=order, subject=subjects[order % 3])
+
+    def test_representation_matches_instance_path(self):
+        renderer = JSONRenderer()
+        self.assertEqual(
+            renderer.render(TimetableManageSerializer(self.timetable).data),
+            renderer.render(legacy_timetable_representation(self.timetable)),
+        )
+
+    def test_representation_is_one_query(self):
+        with self.assertNumQueries(1):
+            TimetableManageSerializer(self.timetable).data
+
+    def test_sparse_fields(self):
+        with self.assertNumQueries(0):
+            data = TimetableManageSerializer(self.timetable, fields=['id', 'name']).data
+        self.assertEqual(data, {'id': self.timetable.id, 'name': 'Term 1'})
+
+        self.client.force_login(self.timetable.user)
+        response = self.client.get('/api/v1/timetable/manage/', {'fields': 'name'})
+        self.assertEqual(response.json(), {'name': 'Term 1'})
+        response = self.client.get('/api/v1/timetable/manage/', {'expand': 'days'})
+        self.assertEqual(response.status_code, 400)
+
+
+class SubjectTypeaheadTests(APITestCase):
+    def setUp(self):
+        subject_index.reset()
+        for name in ('Mathematics', 'Computer Science', 'Social Studies', 'Maths Extension'):
+            Subject.objects.create(name=name)
+        user = User.objects.create_user(username='student', password='secret')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {AccessToken.for_user(user)}')
+
+    def names(self, q, **params):
+        response = self.client.get('/api/v1/timetable/subjects/', {'q': q, **params})
+        self.assertEqual(response.status_code, 200)
+        return [subject['name'] for subject in response.data]
+
+    def test_prefix_lookup(self):
+        self.assertEqual(self.names('MATH'), ['Mathematics', 'Maths Extension'])
+        self.assertEqual(self.names('s'), ['Social Studies', 'Computer Science'])
+        self.assertEqual(self.names('', limit=2), ['Computer Science', 'Mathematics'])
+        self.assertEqual(self.names('x'), [])
+        response = self.client.get('/api/v1/timetable/subjects/', {'q': 'm', 'limit': 0})
+        self.assertEqual(response.status_code, 400)
+
+    def test_keystrokes_do_not_query_the_database(self):
+        self.names('m')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.names('com'), ['Computer Science'])
+
+    @override_settings(SUBJECT_INDEX_REFRESH_SECONDS=0.01)
+    def test_refreshes_run_in_the_background(self):
+        holder = SubjectIndexHolder()
+        holder.index = SubjectIndex([(1, 'Mathematics')], 'v1')
+        refreshed = threading.Event()
+
+        def refresh():
+            refreshed.set()
+            # Ends the refresher thread.
+            raise SystemExit
+
+        with mock.patch.object(holder, 'refresh', refresh), self.assertNumQueries(0):
+            self.assertEqual(holder.get().lookup('ma', 5), [{'id': 1, 'name': 'Mathematics'}])
+            self.assertTrue(refreshed.wait(5))
+
+    def test_subject_writes_refresh_the_index(self):
+        self.assertEqual(self.names('bio'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            Subject.objects.create(name='Biology')
+        self.assertEqual(self.names('bio'), ['Biology'])
+
+    def test_other_workers_writes_refresh_the_index(self):
+        self.assertEqual(self.names('bio'), [])
+        # Writes from another worker run no callbacks here; the index notices
+        # them at its next background refresh.
+        biology = Subject.objects.create(name='Biology')
+        subject_index.refresh()
+        self.assertEqual(self.names('bio'), ['Biology'])
+
+        Subject.objects.filter(pk=biology.pk).update(name='Botany', updated_at=timezone.now())
+        subject_index.refresh()
+        self.assertEqual(self.names('bo'), ['Botany'])
+
+        biology.delete()
+        subject_index.refresh()
+        self.assertEqual(self.names('bo'), [])
@@ -0,0 +1,129 @@
+"""
+In-process prefix index over the shared subject catalog, for typeahead.
+
+Each worker keeps a sorted list of case-folded subject names (plus one entry
+per later word, so "sci" finds "Computer Science") and answers lookups with
+bisect, without touching the database.
+
+The index is versioned by the subject count and latest updated_at on
+primary. A background thread per worker compares that with its index's every
+SUBJECT_INDEX_REFRESH_SECONDS and rebuilds when it changed, so writes by any
+worker are picked up without a shared cache, and lookups only read memory
+once a worker's first one has loaded the index. The writing worker refreshes
+as soon as the write commits. Code that writes subjects with queryset
+update() must set updated_at itself.
+"""
+import logging
+import os
+import re
+import threading
+import time
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Max
+
+from student_solution_api.db_routers import read_from_primary
+from .models import Subject
+
+
+logger = logging.getLogger(__name__)
+
+WORD_START = re.compile(r'\b\w')
+
+
+def fold(text):
+    return ' '.join(text.casefold().split())
+
+
+class SubjectIndex:
+    def __init__(self, subjects, version):
+        """subjects: (id, name) pairs."""
+        self.version = version
+        names, words = [], []
+        for subject_id, name in subjects:
+            folded = fold(name)
+            names.append((folded, subject_id, name))
+            words.extend(
+                (folded[match.start():], subject_id, name)
+                for match in WORD_START.finditer(folded) if match.start()
+            )
+        self.names, self.words = sorted(names), sorted(words)
+        self.name_keys = [key for key, _, _ in self.names]
+        self.word_keys = [key for key, _, _ in self.words]
+
+    def __len__(self):
+        return len(self.names)
+
+    def lookup(self, prefix, limit):
+        """Subjects whose name, then one of whose later words, starts with prefix."""
+        prefix = fold(prefix)
+        results, seen = [], set()
+        for keys, entries in ((self.name_keys, self.names), (self.word_keys, self.words)):
+            index = bisect_left(keys, prefix)
+            while index < len(keys) and len(results) < limit and keys[index].startswith(prefix):
+                _, subject_id, name = entries[index]
+                if subject_id not in seen:
+                    seen.add(subject_id)
+                    results.append({'id': subject_id, 'name': name})
+                index += 1
+        return results
+
+
+class SubjectIndexHolder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.index = None
+        # Threads do not survive a fork: each worker process starts its own.
+        self.refresher_pid = None
+
+    def reset(self):
+        self.index = None
+
+    def get(self):
+        """The current index, from memory; a worker's first lookup loads it."""
+        if self.index is None:
+            self.refresh()
+        self.start_refresher()
+        return self.index
+
+    def refresh(self):
+        """Rebuild the index if the subjects changed since it was loaded."""
+        with self.lock, read_from_primary():
+            version = current_version()
+            if self.index is None or self.index.version != version:
+                # Version first: a write landing during the load moves it again.
+                self.index = SubjectIndex(Subject.objects.values_list('id', 'name'), version)
+
+    def start_refresher(self):
+        if not settings.SUBJECT_INDEX_REFRESH_SECONDS or self.refresher_pid == os.getpid():
+            return
+        with self.lock:
+            if self.refresher_pid != os.getpid():
+                self.refresher_pid = os.getpid()
+                threading.Thread(target=self.refresh_forever, name='subject-index-refresher', daemon=True).start()
+
+    def refresh_forever(self):
+        while True:
+            time.sleep(settings.SUBJECT_INDEX_REFRESH_SECONDS)
+            try:
+                self.refresh()
+            except Exception:
+                logger.exception('Refreshing the subject index failed')
+                # Reconnect on the next try.
+                connection.close()
+
+
+def current_version():
+    # Deletes lower the count; creates and renames move the latest updated_at.
+    version = Subject.objects.aggregate(count=Count('id'), updated_at=Max('updated_at'))
+    return version['count'], version['updated_at']
+
+
+def invalidate_subject_index():
+    """Refresh this worker's index once the current transaction commits; others follow within the interval."""
+    transaction.on_commit(subject_index.refresh)
+
+
+subject_index = SubjectIndexHolder()